@@ -12,34 +12,56 @@ Key Responsibilities:
 - Signal/slot connections between components
 - File dialog management for loading media
 - Network device discovery via UPnP
+- Local media library browsing, kept current by a background watcher
 - Preview generation during timeline scrubbing
 - Playback state synchronization across UI components
 
 Dependencies:
 - PyQt6: GUI framework (QMainWindow, QSettings, QMediaPlayer, QAction)
 - upnpy: UPnP device discovery and control
-- Custom modules: MyMediaPlayer, MyMediaControls, MyCentralWidget, MyPlaylist, MyPreview, MyNetworkTree
-- Utilities: PreviewPosition, checkDuration from processTools
+- Custom modules: MyMediaPlayer, MyMediaControls, MyCentralWidget, MyPlaylist, MyPreview, MyNetworkTree, MyLibrary, MyScrubOverlay (via MyMediaPlayer)
+- Utilities: PreviewWorker, ReelExtractor, BatchProber from processTools
+- Utilities: IndexBuilder from mediaIndex (keyframe index for preview seeking)
+- Utilities: PreviewCache from previewCache (LRU cache of hover previews)
+- Utilities: exportSprites, sidecarPath from spriteSheet (WebVTT thumbnail tracks)
+- Utilities: ProxyBuilder from scrubProxy (scrubbing proxies)
+- Utilities: CapturePool from capturePool (open captures reused across files)
+- Utilities: MediaLibrary, LibraryWatcher from mediaLibrary (library index)
 """
 
 import upnpy
 import os
+import time
 from PyQt6.QtWidgets import QMainWindow
 from PyQt6.QtWidgets import QApplication
 from PyQt6.QtWidgets import QFileDialog
 from PyQt6.QtCore import QSettings
 from PyQt6.QtMultimedia import QMediaPlayer
 from PyQt6.QtGui import QAction
+from PyQt6.QtGui import QImage
 from PyQt6.QtCore import Qt
 from PyQt6.QtCore import QTimer
+from PyQt6.QtCore import QThread
 from MyMediaPlayer import MyMediaPlayer
 from MyMediaControls import MyMediaControls
 from MyCentralWidget import MyCentralWidget
 from MyPlaylist import MyPlaylist
 from MyPreview import MyPreview
 from MyNetworkTree import MyNetworkTree
-from processTools import PreviewPosition
-from processTools import checkDuration
+from MyLibrary import MyLibrary
+from MyThumbnailDisplay import MyThumbnailDisplay
+from processTools import PreviewWorker
+from processTools import ThumbnailRing
+from processTools import ReelExtractor
+from spriteSheet import exportSprites
+from spriteSheet import sidecarPath
+from scrubProxy import ProxyBuilder
+from processTools import BatchProber
+from capturePool import CapturePool
+from mediaIndex import IndexBuilder
+from mediaLibrary import MediaLibrary
+from mediaLibrary import LibraryWatcher
+from previewCache import PreviewCache
 from PyQt6.QtCore import pyqtSlot
 
 
@@ -50,6 +72,8 @@ class MyVideoPlayer(QMainWindow):
     """
     This class is used to create a video player using PyQt6.
     """
+    # a seek lands once the player reports a position this close to it (ms)
+    scrubLandingMs = 250
 
 # |-----------------------------------------------------------------------------|
 # Constructor :-
@@ -65,8 +89,35 @@ class MyVideoPlayer(QMainWindow):
             "MyVideoPlayerCode", "MyVideoPlayer")
         self.playlist = MyPlaylist()
         self.networktree = MyNetworkTree()
+        self.library = MyLibrary()
+        # index of the library folders, None if it cannot be opened
+        self.__mediaLibrary = MediaLibrary.shared()
+        # rescans the library, then applies file system events to it
+        self.__libraryWatcher = None
         self.preview = MyPreview()
-        self.__previewExtract = None
+        self.__previewFile = None
+        self.__hoverDisplay = None
+        # extractor of the coarse preview thumbnails of the current file
+        self.__coarseExtract = None
+        # background job writing the scrubbing proxy of the current file
+        self.__proxyBuilder = None
+        # probes still running (one per batch opened), results by path
+        self.__probers = []
+        self.__mediaInfo = {}
+        # live scrub: resume playback after the drag, seek landing pending
+        self.__scrubResume = False
+        self.__scrubLanding = False
+        # position the release of a drag seeked to
+        self.__scrubTarget = 0
+        # request time of each hover preview, measures the preview latency
+        self.__previewAsked = {}
+        # cached previews may lease the worker's thumbnail buffers
+        self.__previewCache = PreviewCache(leases=ThumbnailRing)
+        # hover previews are decoded on a dedicated thread
+        self.__previewWorker = PreviewWorker(self.__previewCache)
+        self.__previewThread = QThread(self)
+        self.__previewWorker.moveToThread(self.__previewThread)
+        self.__previewThread.start()
         self.__fileNames = []
         self.playlist.hide()
         self.networktree.hide()
@@ -106,6 +157,29 @@ class MyVideoPlayer(QMainWindow):
             self.mediaPlayer.adjustVolume(max(self.mediaPlayer.volume - 10, 0))
         return super().keyPressEvent(event)
 
+    def closeEvent(self, event):
+        """
+        Stops the preview and extraction threads before the window goes away.
+        """
+        self.__previewWorker.cancel()
+        self.__previewThread.quit()
+        self.__previewThread.wait()
+        if self.__coarseExtract is not None:
+            self.__coarseExtract.stop()
+        if self.__proxyBuilder is not None:
+            self.__proxyBuilder.cancel()
+        for prober in self.__probers:
+            prober.stop()
+        if self.__libraryWatcher is not None:
+            self.__libraryWatcher.stop()
+        for thread, _ in list(self.__threads):
+            # finished -> quit is queued to this (now blocked) thread: quit
+            # here, the event loop exits as soon as the job returns
+            thread.quit()
+            thread.wait()
+        CapturePool.shared().clear()
+        return super().closeEvent(event)
+
     def toggleFullScreen(self):
         if self.mediaPlayer.isFullScreen():
             self.mediaPlayer.toggleFullScreen()
@@ -115,8 +189,8 @@ class MyVideoPlayer(QMainWindow):
                 Qt.WindowType.Widget)
             self.mediaControls.setStyleSheet("")
             self.mediaControls.show()
-            # Add back to layout
-            self.mainWidget.layout().addWidget(self.mediaControls)
+            # Add back to layout, above the reel
+            self.mainWidget.layout().insertWidget(1, self.mediaControls)
             # Remove event filter
             self.mediaPlayer.videoWidget().removeEventFilter(self)
             self.setCursor(Qt.CursorShape.ArrowCursor)
@@ -196,13 +270,16 @@ class MyVideoPlayer(QMainWindow):
         self.setCentralWidget(self.mainWidget)
         # Add my media player and controls
         self.mediaPlayer = MyMediaPlayer()
-        # self.reelDisplay = MyThumbnailDisplay(self.mainWidget)
+        self.reelDisplay = MyThumbnailDisplay(self.mainWidget)
+        # tiles without a reel thumbnail show the hover previews decoded
+        self.reelDisplay.setSource(self.__previewWorker.cached,
+                                   ThumbnailRing.release)
         self.mediaControls = MyMediaControls()
-        # add media player and controls to the layout
+        # add media player, controls and reel to the layout
         self.mainWidget.addWidget(self.mediaPlayer)
-        # self.mainWidget.addWidget(self.reelDisplay)
-        # self.reelDisplay.setMaximumHeight(100)
         self.mainWidget.addWidget(self.mediaControls)
+        self.mainWidget.addWidget(self.reelDisplay)
+        self.reelDisplay.setMaximumHeight(100)
         # adjust the size of the widgets
         self.mainWidget.adjustWidgetSizes()
 # |--------------End of __addMyMediaPlayerWidget--------------------------------|
@@ -222,15 +299,37 @@ class MyVideoPlayer(QMainWindow):
             self.mediaPlayer.mediaPlayer.pause)
         self.mediaControls.stopButton.clicked.connect(
             self.mediaPlayer.mediaPlayer.stop)
-        self.mediaControls.seekSlider.valueChanged.connect(
-            self.mediaPlayer.mediaPlayer.setPosition)
+        self.mediaControls.seekSlider.valueChanged.connect(self.__seekTo)
+        self.mediaControls.seekSlider.sliderPressed.connect(self.__startScrub)
+        self.mediaControls.seekSlider.sliderReleased.connect(self.__endScrub)
+        self.__previewWorker.scrubReady.connect(
+            self.__showScrubFrame, Qt.ConnectionType.QueuedConnection)
         self.mediaControls.volumeDial.valueChanged.connect(
             self.mediaPlayer.adjustVolume)
         self.mediaControls.seekSlider.showPreview.connect(self.previewDisplay)
+        self.__previewWorker.previewReady.connect(
+            self.__showPreview, Qt.ConnectionType.QueuedConnection)
+        # zoomed in reel tiles are decoded on demand by the preview worker
+        self.reelDisplay.tileRequested.connect(self.__requestTile)
+        self.__previewWorker.tileReady.connect(
+            self.__addTile, Qt.ConnectionType.QueuedConnection)
+        # direct: only records the motion, must not wait behind a decode
+        self.mediaControls.seekSlider.scrubMotion.connect(
+            self.__previewWorker.prefetch, Qt.ConnectionType.DirectConnection)
+        self.mediaControls.seekSlider.exitPreview.connect(
+            self.__previewWorker.stopPrefetch,
+            Qt.ConnectionType.DirectConnection)
+        # previews are only opened once they are wanted
+        self.mediaControls.seekSlider.enterPreview.connect(self.__openPreview)
         # self.mediaControls.seekSlider.enterPreview.connect(
         #     self.mediaPlayer.mediaPlayer.pause)
         # self.mediaControls.seekSlider.exitPreview.connect(
         #     self.mediaPlayer.mediaPlayer.play)
+        self.library.playMediaFile.connect(
+            lambda fileName: self.__queueFiles([fileName], play=True))
+        self.library.queueMediaFiles.connect(self.__queueFiles)
+        self.library.rootAdded.connect(self.__addLibraryRoot)
+        self.library.rootRemoved.connect(self.__removeLibraryRoot)
         self.mediaControls.prev.connect(self.playlist.setPrev)
         self.mediaControls.next.connect(self.playlist.setNext)
         self.playlist.mainWidget.itemSelectionChanged.connect(
@@ -241,10 +340,12 @@ class MyVideoPlayer(QMainWindow):
         # using only video player for now (audio player is not used)
         self.mediaPlayer.mediaPlayer.positionChanged.connect(
             self.mediaControls.updateSlider)
+        self.mediaPlayer.mediaPlayer.positionChanged.connect(
+            self.__scrubLanded)
         self.mediaPlayer.mediaPlayer.durationChanged.connect(
             self.mediaControls.seekSlider.setMaximum)
-        # self.mediaPlayer.mediaPlayer.positionChanged.connect(
-        #     self.reelDisplay.setPosition)
+        self.mediaPlayer.mediaPlayer.positionChanged.connect(
+            self.reelDisplay.setPosition)
         self.mediaPlayer.mediaPlayer.mediaStatusChanged.connect(
             self.__reflectMediaStatus)
         self.mediaPlayer.mediaPlayer.playbackStateChanged.connect(
@@ -310,6 +411,15 @@ class MyVideoPlayer(QMainWindow):
         networkAction.triggered.connect(self.showNetwork)
         menuBar.addAction(networkAction)
 
+        libraryAction = QAction("Library", self)
+        libraryAction.triggered.connect(self.showLibrary)
+        libraryAction.setEnabled(self.__mediaLibrary is not None)
+        menuBar.addAction(libraryAction)
+
+        exportAction = QAction("Export Thumbnails", self)
+        exportAction.triggered.connect(self.__exportThumbnails)
+        menuBar.addAction(exportAction)
+
         exitAction = QAction("Exit", self)
         exitAction.triggered.connect(self.close)
         menuBar.addAction(exitAction)
@@ -320,6 +430,14 @@ class MyVideoPlayer(QMainWindow):
         fullscreenAction.triggered.connect(self.toggleFullScreen)
         viewMenu.addAction(fullscreenAction)
 
+        proxyAction = QAction("Scrub Proxies", self)
+        proxyAction.setCheckable(True)
+        proxyAction.setChecked(
+            self.settings.value("scrub_proxy", False, type=bool))
+        proxyAction.toggled.connect(
+            lambda on: self.settings.setValue("scrub_proxy", on))
+        viewMenu.addAction(proxyAction)
+
         self.setMenuBar(menuBar)
 # |--------------------------End of __addMenuBar--------------------------------|
 
@@ -328,26 +446,228 @@ class MyVideoPlayer(QMainWindow):
 # |-----------------------------------------------------------------------------|
     @pyqtSlot(tuple)
     def previewDisplay(self, display):
-        if display and self.__previewExtract:
-            pp = int((display[2]/1000)*self.__fr)
-            qimg = self.__previewExtract.extract(pp)
-            if qimg:
-                # Center the preview above the cursor using global coordinates
-                preview_width = self.preview.width()
-                preview_height = self.preview.height()
-                x = display[0] - (preview_width // 2)
-                y = display[1] - preview_height - 10
-
-                self.preview.setGeometry(
-                    int(x), int(y),
-                    int(preview_width), int(preview_height))
-                s = display[2]/1000
-                t = f"{int(s//60)}:{int(s % 60):02d}"
-                self.preview.showImage(qimg, t)
-                self.preview.show()
+        """
+        Shows the preview of a hover position, or hides it for an empty tuple.
+
+        Cached previews are shown at once; others are requested from the
+        preview worker and shown by __showPreview when decoded. Meanwhile the
+        nearest thumbnail of the coarse set computed at open is shown.
+        """
+        if self.mediaControls.seekSlider.isSliderDown():
+            # Dragging: the video surface itself shows the frames
+            display = ()
+        if display and self.__previewFile:
+            self.__hoverDisplay = display
+            self.__previewAsked[display] = time.time()
+            qimg = self.__previewWorker.cached(display[2])
+            if qimg is not None:
+                self.__showPreview(qimg, display)
+            else:
+                self.__previewWorker.request(display)
+                # Nearest coarse thumbnail until the exact frame arrives
+                coarse = self.preview.nearestCoarse(display[2])
+                if coarse is not None:
+                    self.__placePreview(coarse, display)
         else:
+            self.__hoverDisplay = None
+            self.__previewAsked.clear()
+            self.__previewWorker.cancel()
             self.preview.hide()
-# |--------------------------End of showPlaylist--------------------------------|
+# |--------------------------End of previewDisplay------------------------------|
+
+# |-----------------------------------------------------------------------------|
+# __seekTo :-
+# |-----------------------------------------------------------------------------|
+    def __seekTo(self, position):
+        """
+        Seeks the player to a slider position, or, while the handle is
+        dragged, only asks for a scrub frame of it.
+        """
+        slider = self.mediaControls.seekSlider
+        if not (slider.isSliderDown() and self.__previewFile):
+            self.mediaPlayer.mediaPlayer.setPosition(position)
+            return
+        self.__previewWorker.scrub(
+            position, self.mediaPlayer.videoWidget().height())
+        seconds = int(position / 1000)
+        self.mediaControls.currentLabel.setText(
+            f"{seconds // 60}:{seconds % 60:02d}")
+# |--------------------------End of __seekTo------------------------------------|
+
+# |-----------------------------------------------------------------------------|
+# __startScrub :-
+# |-----------------------------------------------------------------------------|
+    def __startScrub(self):
+        """
+        Pauses playback while the slider handle is dragged.
+        """
+        player = self.mediaPlayer.mediaPlayer
+        self.__scrubResume = (player.playbackState()
+                              == QMediaPlayer.PlaybackState.PlayingState)
+        self.__scrubLanding = False
+        player.pause()
+# |--------------------------End of __startScrub--------------------------------|
+
+# |-----------------------------------------------------------------------------|
+# __endScrub :-
+# |-----------------------------------------------------------------------------|
+    def __endScrub(self):
+        """
+        Issues the one accurate seek of a drag where the handle was released.
+
+        The overlay keeps the last scrub frame until the player reports the
+        new position (or at most half a second).
+        """
+        self.__previewWorker.cancel()
+        player = self.mediaPlayer.mediaPlayer
+        self.__scrubTarget = self.mediaControls.seekSlider.value()
+        player.setPosition(self.__scrubTarget)
+        self.__scrubLanding = True
+        QTimer.singleShot(500, self.__clearScrub)
+        if self.__scrubResume:
+            player.play()
+# |--------------------------End of __endScrub----------------------------------|
+
+# |-----------------------------------------------------------------------------|
+# __showScrubFrame :-
+# |-----------------------------------------------------------------------------|
+    @pyqtSlot(QImage, float)
+    def __showScrubFrame(self, qimg, ms):
+        """
+        Paints a scrub frame over the video while the handle is dragged.
+        """
+        # Late frames of a drag that already ended are dropped
+        if self.mediaControls.seekSlider.isSliderDown():
+            self.mediaPlayer.scrubOverlay().showFrame(qimg)
+            if self.mediaPlayer.isFullScreen():
+                # Controls stay on top of the overlay
+                self.mediaControls.raise_()
+        # converted by the overlay: its buffer may be written again
+        ThumbnailRing.release(qimg)
+# |--------------------------End of __showScrubFrame----------------------------|
+
+# |-----------------------------------------------------------------------------|
+# __scrubLanded :-
+# |-----------------------------------------------------------------------------|
+    def __scrubLanded(self, position):
+        """
+        Hands the surface back to the player once its seek has landed.
+
+        Positions of before the seek (still queued, or reported while it
+        is pending) leave the scrub frame up.
+        """
+        if (self.__scrubLanding
+                and abs(position - self.__scrubTarget) <= self.scrubLandingMs):
+            self.__clearScrub()
+
+    def __clearScrub(self):
+        if self.mediaControls.seekSlider.isSliderDown():
+            # A new drag started meanwhile
+            return
+        self.__scrubLanding = False
+        self.mediaPlayer.scrubOverlay().clear()
+# |--------------------------End of __scrubLanded-------------------------------|
+
+# |-----------------------------------------------------------------------------|
+# __showPreview :-
+# |-----------------------------------------------------------------------------|
+    @pyqtSlot(QImage, tuple)
+    def __showPreview(self, qimg, display):
+        """
+        Displays a preview above the cursor position it was requested for.
+        """
+        # The cursor left the slider while decoding
+        if self.__hoverDisplay is None:
+            ThumbnailRing.release(qimg)
+            return
+        # Pace the slider's preview requests to what is actually achieved
+        asked = self.__previewAsked.pop(display, None)
+        if asked is not None:
+            self.mediaControls.seekSlider.reportLatency(time.time() - asked)
+        # Requests superseded before this one will not be answered
+        for old in [d for d, t in self.__previewAsked.items()
+                    if asked is None or t <= asked]:
+            del self.__previewAsked[old]
+        self.__placePreview(qimg, display)
+        # exact frames also fill the reel around the hovered time
+        self.reelDisplay.addThumbnail(qimg, display[2])
+        # shown and drawn into the reel: its buffer may be written again
+        ThumbnailRing.release(qimg)
+# |--------------------------End of __showPreview-------------------------------|
+
+# |-----------------------------------------------------------------------------|
+# __requestTile :-
+# |-----------------------------------------------------------------------------|
+    def __requestTile(self, ms):
+        """
+        Asks the preview worker for a reel tile no thumbnail covers yet.
+
+        At the fit level the coarse pass fills the reel; zoomed in tiles are
+        decoded on demand, and zooming in opens the previews of the file as
+        hovering the seek slider does.
+        """
+        if not self.__previewFile or not self.reelDisplay.zoomLevel():
+            return
+        self.__openPreview()
+        self.__previewWorker.requestTile(ms)
+
+    @pyqtSlot(QImage, float, str)
+    def __addTile(self, qimg, ms, fileName):
+        """
+        Adds a decoded tile thumbnail to the reel, unless the file changed.
+        """
+        if fileName == self.__previewFile:
+            self.reelDisplay.addThumbnail(qimg, ms)
+        # drawn into the reel atlas: its buffer may be written again
+        ThumbnailRing.release(qimg)
+# |--------------------------End of __requestTile-------------------------------|
+
+# |-----------------------------------------------------------------------------|
+# __placePreview :-
+# |-----------------------------------------------------------------------------|
+    def __placePreview(self, qimg, display):
+        """
+        Shows an image in the preview popup above a hover position.
+        """
+        # Center the preview above the cursor using global coordinates
+        preview_width = self.preview.width()
+        preview_height = self.preview.height()
+        x = display[0] - (preview_width // 2)
+        y = display[1] - preview_height - 10
+
+        self.preview.setGeometry(
+            int(x), int(y),
+            int(preview_width), int(preview_height))
+        s = display[2]/1000
+        t = f"{int(s//60)}:{int(s % 60):02d}"
+        self.preview.showImage(qimg, t)
+        self.preview.show()
+# |--------------------------End of __placePreview------------------------------|
+
+# |-----------------------------------------------------------------------------|
+# __exportThumbnails :-
+# |-----------------------------------------------------------------------------|
+    def __exportThumbnails(self):
+        """
+        Saves the reel and preview thumbnails of the current file as a WebVTT
+        thumbnail track with sprite sheets, by default next to the file where
+        it is picked up when the file is opened again (on any machine).
+        """
+        if not self.__previewFile or not os.path.isfile(self.__previewFile):
+            return
+        path, _ = QFileDialog.getSaveFileName(
+            self, "Export Thumbnails", sidecarPath(self.__previewFile),
+            "WebVTT Thumbnail Track (*.vtt)")
+        if not path:
+            return
+        thumbnails = (self.preview.coarseThumbnails()
+                      + self.__previewWorker.storedThumbnails())
+        try:
+            exportSprites(path, thumbnails,
+                          self.mediaControls.seekSlider.duration * 1000)
+        except OSError as ex:
+            print(f"Exception {ex}")
+# |--------------------------End of __exportThumbnails--------------------------|
 
 # |-----------------------------------------------------------------------------|
 # showPlaylist :-
@@ -356,6 +676,107 @@ class MyVideoPlayer(QMainWindow):
         self.playlist.show()
 # |--------------------------End of showPlaylist--------------------------------|
 
+# |-----------------------------------------------------------------------------|
+# showLibrary :-
+# |-----------------------------------------------------------------------------|
+    def showLibrary(self):
+        """
+        Shows the library browser, starting the library watcher the first
+        time: the index of earlier sessions is browsable at once while the
+        rescan runs.
+        """
+        if self.__libraryWatcher is None:
+            self.__watchLibrary()
+        self.library.show()
+# |--------------------------End of showLibrary---------------------------------|
+
+# |-----------------------------------------------------------------------------|
+# __libraryRoots :-
+# |-----------------------------------------------------------------------------|
+    def __libraryRoots(self):
+        """
+        Returns the library root folders configured.
+        """
+        return list(self.settings.value("library_roots", [], type=list))
+# |--------------------------End of __libraryRoots------------------------------|
+
+# |-----------------------------------------------------------------------------|
+# __watchLibrary :-
+# |-----------------------------------------------------------------------------|
+    def __watchLibrary(self):
+        """
+        (Re)starts the library watcher on the configured root folders.
+        """
+        if self.__libraryWatcher is not None:
+            self.__libraryWatcher.stop()
+            self.__libraryWatcher = None
+        roots = self.__libraryRoots()
+        for root in roots:
+            self.__mediaLibrary.addRoot(root)
+        self.library.setLibrary(self.__mediaLibrary)
+        if not roots:
+            return
+        watcher = LibraryWatcher(self.__mediaLibrary, roots)
+        thread = QThread(self)
+        watcher.moveToThread(thread)
+        watcher.folderChanged.connect(self.library.refreshFolder)
+        watcher.probed.connect(self.library.setItemInfo)
+        watcher.finished.connect(thread.quit)
+        watcher.finished.connect(watcher.deleteLater)
+        thread.finished.connect(thread.deleteLater)
+        thread.finished.connect(lambda: self.__threads.remove(
+            (thread, watcher)))
+        thread.started.connect(watcher.run)
+        # keep references until the thread is done
+        self.__threads.append((thread, watcher))
+        self.__libraryWatcher = watcher
+        thread.start()
+# |--------------------------End of __watchLibrary------------------------------|
+
+# |-----------------------------------------------------------------------------|
+# __addLibraryRoot :-
+# |-----------------------------------------------------------------------------|
+    def __addLibraryRoot(self, folder):
+        """
+        Adds a root folder to the library and indexes it.
+        """
+        folder = os.path.abspath(folder)
+        roots = self.__libraryRoots()
+        if folder not in roots:
+            self.settings.setValue("library_roots", roots + [folder])
+        self.__watchLibrary()
+# |--------------------------End of __addLibraryRoot----------------------------|
+
+# |-----------------------------------------------------------------------------|
+# __removeLibraryRoot :-
+# |-----------------------------------------------------------------------------|
+    def __removeLibraryRoot(self, folder):
+        """
+        Removes a root folder and its index from the library.
+        """
+        self.settings.setValue(
+            "library_roots", [r for r in self.__libraryRoots() if r != folder])
+        self.__mediaLibrary.removeRoot(folder)
+        self.__watchLibrary()
+# |--------------------------End of __removeLibraryRoot-------------------------|
+
+# |-----------------------------------------------------------------------------|
+# __queueFiles :-
+# |-----------------------------------------------------------------------------|
+    def __queueFiles(self, fileNames, play=False):
+        """
+        Appends media to the playlist, probing their durations; plays the
+        first one if asked to, or if nothing is playing yet.
+        """
+        for fn in fileNames:
+            self.playlist.addPLItem(fn)
+        self.__fileNames += fileNames
+        # library files are mostly probed already: served from the cache
+        self.__probeFiles(fileNames)
+        if play or self.__previewFile is None:
+            self.__playFile(fileNames[0])
+# |--------------------------End of __queueFiles--------------------------------|
+
 # |-----------------------------------------------------------------------------|
 # showNetwork :-
 # |-----------------------------------------------------------------------------|
@@ -386,43 +807,281 @@ class MyVideoPlayer(QMainWindow):
 # |-----------------------------------------------------------------------------|
 # __displayReelContent :-
 # |-----------------------------------------------------------------------------|
-    def __displayReelContent(self):
-        # self.__imageExtract = []
-        # count = 8
-        # self.reelDisplay.clearDisplay()
-        durationSec, self.__fc, self.__fr = checkDuration(self.__fileNames[0])
+    def __displayReelContent(self, fileName):
+        """
+        Shows the duration of a file, probing it in the background first if
+        needed: opening a network stream can take seconds. The reel is
+        filled by the coarse pass (see __extractCoarse).
+        """
+        if fileName in self.__mediaInfo:
+            self.__showDuration(self.__mediaInfo[fileName].duration)
+        else:
+            self.__probeFiles([fileName])
+# |------------------End of __displayReelContent--------------------------------|
+
+# |-----------------------------------------------------------------------------|
+# __showDuration :-
+# |-----------------------------------------------------------------------------|
+    def __showDuration(self, durationSec):
+        """
+        Shows the duration of the file playing on the seek slider and reel.
+        """
         durationSec = int(durationSec)
-        # self.reelDisplay.setDuration(durationSec)
         self.mediaControls.seekSlider.duration = durationSec
+        self.reelDisplay.setDuration(durationSec)
         self.mediaControls.durationLabel.setText(
             f"{durationSec // 60}:{durationSec % 60:02d}")
-        # for i in range(count):
-        #     self.__imageExtract.append(ExtractImages(
-        #         fPath=self.__fileName, split=count, pos=i))
-        #     self.__imageExtract[i].reelImage.connect(
-        #         self.reelDisplay.addImage)
-        #     self.__threads.append(QThread(self))
-        #     t = self.__threads[-1]
-        #     self.__imageExtract[i].moveToThread(t)
-        #     self.__imageExtract[i].finished.connect(t.quit)
-        #     self.__imageExtract[i].finished.connect(
-        #         self.__imageExtract[i].deleteLater)
-        #     t.finished.connect(t.deleteLater)
-        #     t.started.connect(self.__imageExtract[i].run)
-        #     t.start()
-# |------------------End of __displayReelContent--------------------------------|
+# |--------------------------End of __showDuration------------------------------|
 
 # |-----------------------------------------------------------------------------|
 # __playFile :-
 # |-----------------------------------------------------------------------------|
     def __playFile(self, fileName):
+        self.__closePreview(fileName)
+        if fileName in self.__mediaInfo:
+            self.__showDuration(self.__mediaInfo[fileName].duration)
         self.mediaPlayer.setMediaFile(fileName)
-        self.__previewExtract = PreviewPosition(fileName)
         self.playlist.setActiveItem(fileName)
         self.mediaControls.playMedia.emit()
 
 # |--------------------------End of __playFile----------------------------------|
 
+# |-----------------------------------------------------------------------------|
+# __closePreview :-
+# |-----------------------------------------------------------------------------|
+    def __closePreview(self, fileName):
+        """
+        Switches hover previews to a new file without opening anything yet:
+        many files are watched without scrubbing, and playback should not
+        compete with the preview extractor, coarse pass, keyframe index and
+        scrubbing proxy.
+        """
+        self.__previewFile = fileName
+        self.__previewWorker.close()
+        if self.__coarseExtract is not None:
+            self.__coarseExtract.stop()
+            self.__coarseExtract = None
+        if self.__proxyBuilder is not None:
+            self.__proxyBuilder.cancel()
+            self.__proxyBuilder = None
+            self.statusBar().clearMessage()
+        self.__clearCoarse()
+        self.reelDisplay.clearDisplay()
+# |--------------------------End of __closePreview------------------------------|
+
+# |-----------------------------------------------------------------------------|
+# __openPreview :-
+# |-----------------------------------------------------------------------------|
+    def __openPreview(self):
+        """
+        Opens the previews of the file playing, on the first time the cursor
+        enters the seek slider (opened by the preview worker).
+        """
+        fileName = self.__previewFile
+        if not fileName or self.__previewWorker.current() == fileName:
+            return
+        self.__previewWorker.open(fileName)
+        self.__extractCoarse(fileName)
+        self.__indexFile(fileName)
+        self.__buildProxy(fileName)
+# |--------------------------End of __openPreview-------------------------------|
+
+# |-----------------------------------------------------------------------------|
+# __extractCoarse :-
+# |-----------------------------------------------------------------------------|
+    def __extractCoarse(self, fileName):
+        """
+        Extracts ~100 evenly spaced thumbnails of a file in the reel
+        process pool, or takes them from its thumbnail track; the preview
+        shows the nearest one while decoding exact frames.
+        """
+        if self.__coarseExtract is not None:
+            self.__coarseExtract.stop()
+            self.__coarseExtract = None
+        self.__clearCoarse()
+        # Decodes the proxy of an earlier session when there is one, and
+        # nearest keyframes only where exact frames cost many times more
+        # (long GOPs, slow seeks)
+        extract = ReelExtractor(fileName)
+        thread = QThread(self)
+        extract.moveToThread(thread)
+        extract.reelImage.connect(self.__addCoarsePreview)
+        extract.finished.connect(thread.quit)
+        extract.finished.connect(extract.deleteLater)
+        thread.finished.connect(thread.deleteLater)
+        thread.finished.connect(lambda: self.__threads.remove(
+            (thread, extract)))
+        thread.started.connect(extract.run)
+        # keep references until the thread is done
+        self.__threads.append((thread, extract))
+        self.__coarseExtract = extract
+        thread.start()
+# |--------------------------End of __extractCoarse-----------------------------|
+
+# |-----------------------------------------------------------------------------|
+# __addCoarsePreview :-
+# |-----------------------------------------------------------------------------|
+    @pyqtSlot(QImage, int)
+    def __addCoarsePreview(self, qimg, pos):
+        """
+        Adds a thumbnail of the coarse pass to the preview popup.
+        """
+        extract = self.sender()
+        # Late thumbnail of a file that is no longer previewed
+        if extract is None or extract is not self.__coarseExtract:
+            ThumbnailRing.release(qimg)
+            return
+        self.reelDisplay.addThumbnail(qimg, extract.positionMs(pos))
+        # kept by the preview popup until the coarse set is cleared
+        replaced = self.preview.addCoarse(qimg, extract.positionMs(pos))
+        if replaced is not None:
+            ThumbnailRing.release(replaced)
+
+    def __clearCoarse(self):
+        """
+        Drops the coarse thumbnails, giving their reel buffers back.
+        """
+        for _, qimg in self.preview.coarseThumbnails():
+            ThumbnailRing.release(qimg)
+        self.preview.clearCoarse()
+# |--------------------------End of __addCoarsePreview--------------------------|
+
+# |-----------------------------------------------------------------------------|
+# __buildProxy :-
+# |-----------------------------------------------------------------------------|
+    def __buildProxy(self, fileName):
+        """
+        Writes the scrubbing proxy of a local file in the background when
+        scrub proxies are enabled; a proxy of an earlier session is found by
+        the preview worker and the coarse pass themselves (the builder just
+        reports it), so no fingerprint is read on the GUI thread.
+        """
+        if (self.__proxyBuilder is not None
+                or not self.settings.value("scrub_proxy", False, type=bool)
+                or not os.path.isfile(fileName)):
+            return
+        builder = ProxyBuilder(fileName)
+        thread = QThread(self)
+        builder.moveToThread(thread)
+        builder.progress.connect(self.__showProxyProgress)
+        builder.proxyReady.connect(self.__useProxy)
+        builder.finished.connect(thread.quit)
+        builder.finished.connect(builder.deleteLater)
+        thread.finished.connect(thread.deleteLater)
+        thread.finished.connect(lambda: self.__threads.remove(
+            (thread, builder)))
+        thread.started.connect(builder.run)
+        # keep references until the thread is done
+        self.__threads.append((thread, builder))
+        self.__proxyBuilder = builder
+        thread.start()
+# |--------------------------End of __buildProxy--------------------------------|
+
+# |-----------------------------------------------------------------------------|
+# __showProxyProgress :-
+# |-----------------------------------------------------------------------------|
+    def __showProxyProgress(self, fileName, done):
+        """
+        Shows the progress of the proxy job of the current file.
+        """
+        if fileName != self.__previewFile:
+            return
+        if done < 1.0:
+            self.statusBar().showMessage(
+                f"Building scrub proxy: {int(done * 100)}%")
+        else:
+            self.statusBar().clearMessage()
+# |--------------------------End of __showProxyProgress-------------------------|
+
+# |-----------------------------------------------------------------------------|
+# __useProxy :-
+# |-----------------------------------------------------------------------------|
+    def __useProxy(self, fileName, proxy):
+        """
+        Serves previews and the coarse pass of a file from its new proxy.
+        """
+        if fileName != self.__previewWorker.current():
+            # Not previewed yet: the proxy is picked up when it is
+            return
+        self.__previewWorker.setProxy(fileName, proxy)
+        if self.__coarseExtract is None or self.__coarseExtract.fPath != proxy:
+            # Started before the proxy was there
+            self.__extractCoarse(fileName)
+# |--------------------------End of __useProxy----------------------------------|
+
+# |-----------------------------------------------------------------------------|
+# __indexFile :-
+# |-----------------------------------------------------------------------------|
+    def __indexFile(self, fileName):
+        """
+        Loads or builds the keyframe index of a file on a worker thread.
+        """
+        builder = IndexBuilder(fileName)
+        thread = QThread(self)
+        builder.moveToThread(thread)
+        builder.indexReady.connect(self.__setPreviewIndex)
+        builder.finished.connect(thread.quit)
+        builder.finished.connect(builder.deleteLater)
+        thread.finished.connect(thread.deleteLater)
+        thread.finished.connect(lambda: self.__threads.remove(
+            (thread, builder)))
+        thread.started.connect(builder.run)
+        # keep references until the thread is done
+        self.__threads.append((thread, builder))
+        thread.start()
+# |--------------------------End of __indexFile---------------------------------|
+
+# |-----------------------------------------------------------------------------|
+# __setPreviewIndex :-
+# |-----------------------------------------------------------------------------|
+    def __setPreviewIndex(self, fileName, index):
+        """
+        Hands a finished keyframe index to the preview extractor of the file.
+        """
+        self.__previewWorker.setIndex(fileName, index)
+# |--------------------------End of __setPreviewIndex---------------------------|
+
+# |-----------------------------------------------------------------------------|
+# __probeFiles :-
+# |-----------------------------------------------------------------------------|
+    def __probeFiles(self, fileNames):
+        """
+        Probes the metadata of opened files in parallel on a worker thread.
+        Batches opened meanwhile get their own prober: every file queued is
+        reported, whatever was opened after it.
+        """
+        prober = BatchProber(fileNames)
+        thread = QThread(self)
+        prober.moveToThread(thread)
+        prober.probed.connect(self.__addProbe)
+        prober.finished.connect(thread.quit)
+        prober.finished.connect(prober.deleteLater)
+        thread.finished.connect(thread.deleteLater)
+        thread.finished.connect(lambda: self.__threads.remove(
+            (thread, prober)))
+        thread.finished.connect(lambda: self.__probers.remove(prober))
+        thread.started.connect(prober.run)
+        # keep references until the thread is done
+        self.__threads.append((thread, prober))
+        self.__probers.append(prober)
+        thread.start()
+# |--------------------------End of __probeFiles--------------------------------|
+
+# |-----------------------------------------------------------------------------|
+# __addProbe :-
+# |-----------------------------------------------------------------------------|
+    def __addProbe(self, fileName, info):
+        """
+        Shows a probe result in the playlist, and as the duration of the
+        file playing.
+        """
+        if info is not None:
+            self.__mediaInfo[fileName] = info
+        self.playlist.setItemInfo(fileName, info)
+        if info is not None and fileName == self.__previewFile:
+            self.__showDuration(info.duration)
+# |--------------------------End of __addProbe----------------------------------|
+
 # |-----------------------------------------------------------------------------|
 # __openFileDailog :-
 # |-----------------------------------------------------------------------------|
@@ -438,15 +1097,17 @@ class MyVideoPlayer(QMainWindow):
             directory = os.path.dirname(self.__fileNames[0])
             self.settings.setValue("last_dir", directory)
             for fn in self.__fileNames:
-                self.__displayReelContent()
                 self.playlist.addPLItem(fn)
+            # Durations stream in while the first file already plays
+            self.__probeFiles(self.__fileNames)
             self.__playFile(self.__fileNames[0])
 
     def playNetworkURL(self, path):
         self.__fileNames.append(path)
         self.mediaPlayer.setMediaFile(path)
-        self.__previewExtract = PreviewPosition(path)
-        self.__displayReelContent()
+        self.__closePreview(path)
+        # shown by __addProbe once the stream is probed
+        self.__displayReelContent(path)
         self.mediaControls.playMedia.emit()
 
 
@@ -0,0 +1,270 @@
+"""
+MyLibrary.py - Local Media Library Browser
+
+This module provides the library browser of the video player: a tree of
+the library root folders and the media below them, read from the
+MediaLibrary index instead of the file system, so that folders with tens of
+thousands of files open at once.
+
+Key Components:
+- MyLibraryItem: Tree widget item representing a folder or a media file
+- MyLibrary: Main window with the library tree
+
+Key Responsibilities:
+- List the root folders, and the content of a folder when it is expanded
+- Show the durations known to the MetadataCache next to the files
+- Refresh folders the library watcher reports as changed
+- Emit signals to play or queue media and to add or remove root folders
+
+Dependencies:
+- PyQt6: GUI components (QMainWindow, QTreeWidget, QTreeWidgetItem, QMenu)
+- mediaLibrary: MediaLibrary index (passed in by the main window)
+- metadataCache: Durations of the files listed
+"""
+
+import os.path
+import PyQt6.QtWidgets
+from PyQt6.QtCore import Qt
+from PyQt6.QtCore import pyqtSignal
+from PyQt6.QtGui import QAction
+from metadataCache import MetadataCache
+
+
+# ===============================================================================
+# MyLibraryItem-
+# ===============================================================================
+class MyLibraryItem(PyQt6.QtWidgets.QTreeWidgetItem):
+    """
+    This class is used to create a folder or media file item of the library.
+    """
+
+# |-----------------------------------------------------------------------------|
+# Constructor :-
+# |-----------------------------------------------------------------------------|
+    def __init__(self, fullPath, isFolder, parent=None):
+        """
+        This constructor is used to initialize the library item.
+        """
+        super(MyLibraryItem, self).__init__(parent)
+        self.fullPath = fullPath
+        self.isFolder = isFolder
+        # folder content is listed the first time it is expanded
+        self.populated = False
+        self.setText(0, os.path.basename(fullPath) or fullPath)
+        if isFolder:
+            self.setChildIndicatorPolicy(
+                PyQt6.QtWidgets.QTreeWidgetItem.ChildIndicatorPolicy.ShowIndicator)
+# |--------------------------End of Constructor---------------------------------|
+
+
+# ===============================================================================
+# MyLibrary-
+# ===============================================================================
+class MyLibrary(PyQt6.QtWidgets.QMainWindow):
+    """
+    This class is used to create the library browser of the video player.
+    """
+    playMediaFile = pyqtSignal(str)
+    queueMediaFiles = pyqtSignal(list)
+    rootAdded = pyqtSignal(str)
+    rootRemoved = pyqtSignal(str)
+# |-----------------------------------------------------------------------------|
+# Constructor :-
+# |-----------------------------------------------------------------------------|
+
+    def __init__(self, *args, **kwargs):
+        """
+        This constructor is used to initialize the library browser.
+        """
+        super(MyLibrary, self).__init__(*args, **kwargs)
+        self.setWindowTitle("Library")
+        self.mainWidget = PyQt6.QtWidgets.QTreeWidget(self)
+        self.mainWidget.setHeaderLabels(["Library", "Duration"])
+        self.mainWidget.setContextMenuPolicy(
+            Qt.ContextMenuPolicy.CustomContextMenu)
+        self.setCentralWidget(self.mainWidget)
+        self.mainWidget.itemExpanded.connect(self.__populate)
+        self.mainWidget.itemActivated.connect(self.__itemActivated)
+        self.mainWidget.customContextMenuRequested.connect(self.__showMenu)
+        addAction = QAction("Add Folder", self)
+        addAction.triggered.connect(self.__addFolderDialog)
+        self.menuBar().addAction(addAction)
+        self.library = None
+        # listed items by path, for refreshes and probe results
+        self.__folders = {}
+        self.__files = {}
+# |--------------------------End of Constructor---------------------------------|
+
+# |-----------------------------------------------------------------------------|
+# setLibrary :-
+# |-----------------------------------------------------------------------------|
+    def setLibrary(self, library):
+        """
+        Shows the content of a library index.
+
+        Args:
+            library (MediaLibrary): Index to browse
+        """
+        self.library = library
+        self.reload()
+# |--------------------------End of setLibrary----------------------------------|
+
+# |-----------------------------------------------------------------------------|
+# reload :-
+# |-----------------------------------------------------------------------------|
+    def reload(self):
+        """
+        Lists the root folders again, collapsed.
+        """
+        self.mainWidget.clear()
+        self.__folders.clear()
+        self.__files.clear()
+        if self.library is None:
+            return
+        for root in self.library.roots():
+            it = MyLibraryItem(root, True)
+            self.mainWidget.addTopLevelItem(it)
+            self.__folders[root] = it
+# |--------------------------End of reload--------------------------------------|
+
+# |-----------------------------------------------------------------------------|
+# refreshFolder :-
+# |-----------------------------------------------------------------------------|
+    def refreshFolder(self, folder):
+        """
+        Lists a folder again if it is shown, keeping its subfolders expanded.
+
+        Args:
+            folder (str): Folder whose content changed
+        """
+        it = self.__folders.get(folder)
+        if it is None or not it.populated:
+            return
+        expanded = [it.child(i).fullPath for i in range(it.childCount())
+                    if it.child(i).isExpanded()]
+        self.__forget(it)
+        it.populated = False
+        self.__populate(it)
+        for path in expanded:
+            if path in self.__folders:
+                self.__folders[path].setExpanded(True)
+# |--------------------------End of refreshFolder-------------------------------|
+
+# |-----------------------------------------------------------------------------|
+# setItemInfo :-
+# |-----------------------------------------------------------------------------|
+    def setItemInfo(self, fullPath, info):
+        """
+        Shows the duration of a listed media file once it is probed.
+
+        Args:
+            fullPath (str): Complete file path to the media
+            info (MediaInfo): Probe result, None if the file cannot be opened
+        """
+        it = self.__files.get(fullPath)
+        if it is not None:
+            self.__showInfo(it, info)
+# |--------------------------End of setItemInfo---------------------------------|
+
+    @staticmethod
+    def __showInfo(it, info):
+        if info is None:
+            return
+        seconds = int(info.duration)
+        it.setText(1, f"{seconds // 60}:{seconds % 60:02d}")
+        it.setToolTip(0, f"{info.width}x{info.height} {info.codec} "
+                         f"{info.fps:.3g} fps")
+
+    def __forget(self, it):
+        """
+        Removes the children of a folder item (and their registrations).
+        """
+        for child in it.takeChildren():
+            if child.isFolder:
+                self.__forget(child)
+                self.__folders.pop(child.fullPath, None)
+            else:
+                self.__files.pop(child.fullPath, None)
+
+# |-----------------------------------------------------------------------------|
+# __populate :-
+# |-----------------------------------------------------------------------------|
+    def __populate(self, it):
+        """
+        Lists the content of a folder from the index when it is expanded.
+        """
+        if not it.isFolder or it.populated or self.library is None:
+            return
+        it.populated = True
+        folders, files = self.library.children(it.fullPath)
+        children = []
+        for path in folders:
+            child = MyLibraryItem(path, True)
+            self.__folders[path] = child
+            children.append(child)
+        # Durations of the whole folder with one query
+        cache = MetadataCache.shared()
+        infos = cache.getMany([f[0] for f in files]) if cache else {}
+        for path, size, mtime in files:
+            child = MyLibraryItem(path, False)
+            self.__showInfo(child, infos.get(path))
+            self.__files[path] = child
+            children.append(child)
+        # one insertion for the whole folder
+        it.addChildren(children)
+        if not children:
+            it.setChildIndicatorPolicy(
+                PyQt6.QtWidgets.QTreeWidgetItem.ChildIndicatorPolicy.DontShowIndicator)
+# |--------------------------End of __populate----------------------------------|
+
+# |-----------------------------------------------------------------------------|
+# __itemActivated :-
+# |-----------------------------------------------------------------------------|
+    def __itemActivated(self, it):
+        """
+        Plays a media file on double-click or Enter.
+        """
+        if not it.isFolder:
+            self.playMediaFile.emit(it.fullPath)
+# |--------------------------End of __itemActivated-----------------------------|
+
+# |-----------------------------------------------------------------------------|
+# __showMenu :-
+# |-----------------------------------------------------------------------------|
+    def __showMenu(self, pos):
+        """
+        Offers to queue the item under the cursor (a folder with everything
+        below it), and to remove a root folder.
+        """
+        it = self.mainWidget.itemAt(pos)
+        if it is None or self.library is None:
+            return
+        menu = PyQt6.QtWidgets.QMenu(self)
+        queueAction = menu.addAction("Queue")
+        removeAction = None
+        if it.parent() is None:
+            removeAction = menu.addAction("Remove Folder")
+        chosen = menu.exec(self.mainWidget.viewport().mapToGlobal(pos))
+        if chosen is queueAction:
+            if it.isFolder:
+                files = self.library.filesUnder(it.fullPath)
+            else:
+                files = [it.fullPath]
+            if files:
+                self.queueMediaFiles.emit(files)
+        elif chosen is not None and chosen is removeAction:
+            self.rootRemoved.emit(it.fullPath)
+# |--------------------------End of __showMenu----------------------------------|
+
+# |-----------------------------------------------------------------------------|
+# __addFolderDialog :-
+# |-----------------------------------------------------------------------------|
+    def __addFolderDialog(self):
+        """
+        Asks for a folder to add to the library.
+        """
+        folder = PyQt6.QtWidgets.QFileDialog.getExistingDirectory(
+            self, "Add Library Folder")
+        if folder:
+            self.rootAdded.emit(folder)
+# |--------------------------End of __addFolderDialog---------------------------|
@@ -10,6 +10,7 @@ Key Responsibilities:
 - Configure audio output and device selection
 - Provide volume control with logarithmic scaling
 - Toggle fullscreen mode for video display
+- Host the live scrub overlay painted over the video while dragging
 - Handle keyboard events (Escape to exit fullscreen)
 
 The class encapsulates the PyQt6 multimedia components and provides a simplified interface
@@ -31,6 +32,7 @@ from PyQt6.QtMultimedia import QMediaDevices
 from PyQt6.QtWidgets import QVBoxLayout
 from PyQt6.QtCore import QUrl
 from PyQt6.QtWidgets import QWidget
+from MyScrubOverlay import MyScrubOverlay
 import math
 import PyQt6.QtCore
 
@@ -59,6 +61,18 @@ class MyMediaPlayer(QWidget):
         self.__fullScreen = False
         self.setLayout(QVBoxLayout())
         self.layout().addWidget(self.__videoWidget)
+        # scrub frames are painted over the video: a sibling in a native
+        # window of its own, stacked above the native window the video
+        # widget may render through
+        self.__scrubOverlay = MyScrubOverlay(self)
+        self.__scrubOverlay.setAttribute(
+            PyQt6.QtCore.Qt.WidgetAttribute.WA_DontCreateNativeAncestors)
+        self.__scrubOverlay.setAttribute(
+            PyQt6.QtCore.Qt.WidgetAttribute.WA_NativeWindow)
+        self.__scrubOverlay.setCovered(self.__videoWidget)
+        # in fullscreen the video widget is a window of its own: a child,
+        # like the media controls shown over it, which stay on top
+        self.__fullScreenOverlay = MyScrubOverlay(self.__videoWidget)
         self.__audio = QAudioOutput(self)
         self.mediaPlayer.setVideoOutput(self.__videoWidget)
         self.mediaPlayer.setAudioOutput(self.__audio)
@@ -98,6 +112,22 @@ class MyMediaPlayer(QWidget):
 
 # |--------------------------End of Constructor--------------------------------|
 
+# |-----------------------------------------------------------------------------|
+# scrubOverlay :-
+# |-----------------------------------------------------------------------------|
+    def scrubOverlay(self):
+        """
+        Returns the overlay showing live scrub frames over the video.
+
+        Returns:
+            MyScrubOverlay: The overlay of the current mode (hidden while
+                            not scrubbing)
+        """
+        if self.__fullScreen:
+            return self.__fullScreenOverlay
+        return self.__scrubOverlay
+# |--------------------------End of scrubOverlay--------------------------------|
+
 # |-----------------------------------------------------------------------------|
 # playMediaFile :-
 # |-----------------------------------------------------------------------------|
@@ -156,10 +186,12 @@ class MyMediaPlayer(QWidget):
             # Enter fullscreen mode
             self.__videoWidget.setFullScreen(True)
             self.__fullScreen = True
+            self.__scrubOverlay.clear()
         else:
             # Exit fullscreen mode
             self.__videoWidget.setFullScreen(False)
             self.__fullScreen = False
+            self.__fullScreenOverlay.clear()
 
     def isFullScreen(self):
         """
@@ -184,6 +216,11 @@ class MyMediaPlayer(QWidget):
         Returns:
             bool: True if event was handled and consumed, False otherwise
         """
+        if event.type() in (PyQt6.QtCore.QEvent.Type.Resize,
+                            PyQt6.QtCore.QEvent.Type.Move):
+            # Keep the scrub overlays covering the video
+            self.__scrubOverlay.cover()
+            self.__fullScreenOverlay.cover()
         if event.type() == PyQt6.QtCore.QEvent.Type.KeyPress:
             if event.key() == PyQt6.QtCore.Qt.Key.Key_Escape:
                 # Exit fullscreen when Escape is pressed
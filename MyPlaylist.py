@@ -10,6 +10,7 @@ Key Components:
 Key Responsibilities:
 - Store and display playlist items with file paths
 - Set and highlight the currently playing item
+- Show the duration and format of items as their probes come in
 - Navigate to previous/next items in the playlist
 - Extract and display file names
 
@@ -61,6 +62,8 @@ class MyPlaylist(PyQt6.QtWidgets.QMainWindow):
         super(MyPlaylist, self).__init__(*args, **kwargs)
         self.mainWidget = PyQt6.QtWidgets.QListWidget(self)
         self.setCentralWidget(self.mainWidget)
+        # items by full path, probe results are matched to them
+        self.__items = {}
 # |--------------------------End of Constructor---------------------------------|
 
 # |-----------------------------------------------------------------------------|
@@ -82,8 +85,30 @@ class MyPlaylist(PyQt6.QtWidgets.QMainWindow):
         it = MyPlaylistItem(fn, fullPath)
         # Add it to the playlist widget
         self.mainWidget.addItem(it)
+        self.__items.setdefault(fullPath, []).append(it)
 # |--------------------------End of addPLItem-----------------------------------|
 
+# |-----------------------------------------------------------------------------|
+# setItemInfo :-
+# |-----------------------------------------------------------------------------|
+    def setItemInfo(self, fullPath, info):
+        """
+        Shows the probed metadata of a media file on its playlist items.
+
+        Args:
+            fullPath (str): Complete file path to the media
+            info (MediaInfo): Probe result, None if the file cannot be opened
+        """
+        for it in self.__items.get(fullPath, []):
+            if info is None:
+                it.setText(f"{it.displayText}  (unreadable)")
+                continue
+            seconds = int(info.duration)
+            it.setText(f"{it.displayText}  ({seconds // 60}:{seconds % 60:02d})")
+            it.setToolTip(f"{info.width}x{info.height} {info.codec} "
+                          f"{info.fps:.3g} fps")
+# |--------------------------End of setItemInfo---------------------------------|
+
 # |-----------------------------------------------------------------------------|
 # setActiveItem :-
 # |-----------------------------------------------------------------------------|
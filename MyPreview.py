@@ -7,6 +7,8 @@ the user hovers over the timeline seek slider.
 Key Responsibilities:
 - Display a preview frame from the video at the hovered timeline position
 - Show timestamp of the preview frame
+- Keep a coarse set of evenly spaced thumbnails shown instantly for any
+  position until the exact frame is decoded
 - Frameless dialog for clean overlay appearance
 - Automatic positioning based on cursor location
 
@@ -16,8 +18,11 @@ The preview is displayed as a small frameless dialog with:
 
 Dependencies:
 - PyQt6: GUI components (QDialog, QGraphicsView, QGraphicsScene, QLabel, QVBoxLayout)
+- bisect: Nearest coarse thumbnail lookup
 """
 
+import bisect
+
 from PyQt6.QtWidgets import QDialog
 from PyQt6.QtWidgets import QGraphicsView
 from PyQt6.QtWidgets import QGraphicsScene
@@ -52,6 +57,59 @@ class MyPreview(QDialog):
         self.mainLayout.addWidget(self.view)
         self.mainLayout.addWidget(self.position)
         self.setWindowFlag(Qt.WindowType.FramelessWindowHint)
+        # coarse thumbnails: sorted times (ms) and their images
+        self.__coarseTimes = []
+        self.__coarseImages = []
+
+    def addCoarse(self, qImg, ms):
+        """
+        Adds a thumbnail of the coarse set computed when a file is opened.
+
+        Args:
+            qImg (QImage): Thumbnail image
+            ms (float): Media time of the thumbnail in milliseconds
+
+        Returns:
+            QImage: The thumbnail it replaces at the same time, or None
+        """
+        i = bisect.bisect_left(self.__coarseTimes, ms)
+        if i < len(self.__coarseTimes) and self.__coarseTimes[i] == ms:
+            replaced, self.__coarseImages[i] = self.__coarseImages[i], qImg
+            return replaced
+        self.__coarseTimes.insert(i, ms)
+        self.__coarseImages.insert(i, qImg)
+        return None
+
+    def clearCoarse(self):
+        """
+        Drops the coarse thumbnails (a different file was opened).
+        """
+        self.__coarseTimes = []
+        self.__coarseImages = []
+
+    def coarseThumbnails(self):
+        """
+        Returns the coarse thumbnails as (ms, QImage) pairs in time order.
+        """
+        return list(zip(self.__coarseTimes, self.__coarseImages))
+
+    def nearestCoarse(self, ms):
+        """
+        Returns the coarse thumbnail closest in time to a position.
+
+        Args:
+            ms (float): Hovered media time in milliseconds
+
+        Returns:
+            QImage: The nearest available thumbnail, or None if there is none
+        """
+        i = bisect.bisect_left(self.__coarseTimes, ms)
+        if i == len(self.__coarseTimes) or (
+                i > 0 and ms - self.__coarseTimes[i-1] <= self.__coarseTimes[i] - ms):
+            i -= 1
+        if i < 0:
+            return None
+        return self.__coarseImages[i]
 
     def showImage(self, qImg, pos):
         """
@@ -0,0 +1,115 @@
+"""
+MyScrubOverlay.py - Live Scrub Frames over the Video Surface
+
+This module provides the MyScrubOverlay class, which paints decoded frames
+over the video widget while the seek slider is dragged, the way editing
+applications scrub: the picture follows the handle continuously, and the
+media player itself is only seeked once, when the handle is released.
+
+Key Responsibilities:
+- Cover the video widget while scrubbing, from above it as a sibling (a
+  video widget may render through a native window that child widgets
+  cannot paint over)
+- Paint the newest scrub frame letterboxed like the video, converted to a
+  pixmap on arrival so that the decoder's buffer can be reused at once
+- Hand the surface back to the player once its accurate seek has landed
+
+Dependencies:
+- PyQt6: QWidget, QPainter and QPixmap
+"""
+
+from PyQt6.QtWidgets import QWidget
+from PyQt6.QtGui import QPainter
+from PyQt6.QtGui import QPixmap
+from PyQt6.QtCore import QRectF
+from PyQt6.QtCore import Qt
+
+
+# ===============================================================================
+# MyScrubOverlay-
+# ===============================================================================
+class MyScrubOverlay(QWidget):
+    """
+    This class is used to paint live scrub frames over the video widget.
+    """
+# |-----------------------------------------------------------------------------|
+# Constructor :-
+# |-----------------------------------------------------------------------------|
+
+    def __init__(self, *args, **kwargs):
+        """
+        This constructor is used to initialize the MyScrubOverlay class.
+        """
+        super(MyScrubOverlay, self).__init__(*args, **kwargs)
+        self.__frame = None
+        # widget covered, the parent when None
+        self.__covered = None
+        # opaque: every pixel is painted, nothing behind needs repainting
+        self.setAttribute(Qt.WidgetAttribute.WA_OpaquePaintEvent)
+        self.hide()
+# |--------------------------End of Constructor--------------------------------|
+
+    def setCovered(self, widget):
+        """
+        Sets the widget to cover: the parent, or a sibling.
+
+        Args:
+            widget (QWidget): Widget covered, None for the parent
+        """
+        self.__covered = widget
+        self.cover()
+
+    def cover(self):
+        """
+        Matches the geometry of the covered widget (call when it moves or
+        is resized).
+        """
+        covered = self.__covered
+        if covered is None or covered is self.parentWidget():
+            if self.parentWidget() is not None:
+                self.setGeometry(self.parentWidget().rect())
+        elif covered.parentWidget() is self.parentWidget():
+            self.setGeometry(covered.geometry())
+
+    def showFrame(self, qImg):
+        """
+        Shows a scrub frame over the covered widget.
+
+        Args:
+            qImg (QImage): Decoded frame, not referenced after the call
+        """
+        self.__frame = QPixmap.fromImage(qImg)
+        self.cover()
+        if not self.isVisible():
+            self.show()
+            self.raise_()
+        self.update()
+
+    def frame(self):
+        """
+        Returns the frame shown (QPixmap), or None.
+        """
+        return self.__frame
+
+    def clear(self):
+        """
+        Hides the overlay and releases the frame.
+        """
+        self.__frame = None
+        self.hide()
+
+    def paintEvent(self, event):
+        """
+        Paints the frame scaled to fit, centered on black.
+        """
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), Qt.GlobalColor.black)
+        if self.__frame is not None and not self.__frame.isNull():
+            size = self.__frame.size().scaled(
+                self.size(), Qt.AspectRatioMode.KeepAspectRatio)
+            target = QRectF((self.width() - size.width()) / 2,
+                            (self.height() - size.height()) / 2,
+                            size.width(), size.height())
+            painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform)
+            painter.drawPixmap(target, self.__frame, QRectF(self.__frame.rect()))
+        painter.end()
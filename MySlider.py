@@ -8,11 +8,14 @@ Key Responsibilities:
 - Detect mouse movements over the slider
 - Calculate timeline position from mouse coordinates
 - Emit preview signals with position and timestamp information
-- Throttle preview updates to avoid excessive processing (50ms intervals)
+- Throttle preview updates to the measured preview latency, with a trailing
+  update where the cursor comes to rest
 - Track mouse entry/exit for efficient preview generation
+- Estimate scrub direction and speed for preview prefetching
 
 Custom Signals:
 - showPreview(tuple): Emits (x, y, milliseconds) for preview display
+- scrubMotion(float, float): Emits (milliseconds, velocity in ms/s) on moves
 - enterPreview(): Emitted when mouse enters slider
 - exitPreview(): Emitted when mouse leaves slider
 
@@ -24,7 +27,7 @@ import time
 import PyQt6.QtCore
 from PyQt6.QtWidgets import QSlider
 # from PyQt6 import QtGui
-from PyQt6.QtCore import pyqtSignal
+from PyQt6.QtCore import pyqtSignal, QTimer
 
 # derive QSlilder class to enable hovering to show timestamp
 
@@ -34,8 +37,12 @@ class MySlider(QSlider):
     This class is used to derive the QSlider class to enable hovering to show timestamp.
     """
     showPreview = pyqtSignal(tuple)
+    scrubMotion = pyqtSignal(float, float)
     enterPreview = pyqtSignal()
     exitPreview = pyqtSignal()
+    # bounds of the preview interval in seconds
+    minInterval = 0.016
+    maxInterval = 0.5
 # |-----------------------------------------------------------------------------|
 # Constructor :-
 # |-----------------------------------------------------------------------------|
@@ -51,6 +58,16 @@ class MySlider(QSlider):
         # self.setTickPosition(QSlider.TickPosition.TicksBothSides)
         self.__inside = False
         self.__sentStamp = time.time()
+        # smoothed end-to-end preview latency, paces the previews
+        self.__latency = 0.05
+        # preview held back by the throttle, sent when the cursor rests
+        self.__pending = None
+        self.__trailing = QTimer(self)
+        self.__trailing.setSingleShot(True)
+        self.__trailing.timeout.connect(self.__sendPending)
+        # last hover sample (milliseconds, timestamp) and smoothed velocity
+        self.__lastMove = None
+        self.__velocity = 0.0
         # just setting some size aspects
         # self.setMinimumHeight(20)
         # self.setMinimumWidth(100)
@@ -79,7 +96,9 @@ class MySlider(QSlider):
         Handles mouse movement over the slider for preview generation.
 
         Calculates the timeline position based on mouse coordinates and
-        emits preview signals with throttling (50ms minimum between updates).
+        emits preview signals no faster than previews are being displayed
+        (see reportLatency). A throttled position is sent once the interval
+        has passed, so the last preview matches where the cursor rests.
 
         Args:
             event (QMouseEvent): The mouse movement event
@@ -88,17 +107,71 @@ class MySlider(QSlider):
         x, y = event.pos().x(), event.pos().y()
         # Calculate corresponding position in media (in seconds)
         loc = self.duration*(x/self.width())
+        if self.__inside:
+            self.__trackMotion(loc*1000, time.time())
 
-        # Only emit if inside slider and throttle is satisfied (50ms minimum)
-        if self.__inside and time.time()-self.__sentStamp > 0.05:
+        if self.__inside:
             # Convert local coordinates to global screen coordinates
             global_pos = self.mapToGlobal(event.pos())
-            # Emit preview signal with position and milliseconds
-            self.showPreview.emit((global_pos.x(), global_pos.y(), loc*1000))
-            # Update timestamp to throttle further updates
-            self.__sentStamp = time.time()
+            self.__pending = (global_pos.x(), global_pos.y(), loc*1000)
+            wait = self.interval() - (time.time()-self.__sentStamp)
+            if wait <= 0:
+                self.__sendPending()
+            elif not self.__trailing.isActive():
+                # Trailing update once the interval has passed
+                self.__trailing.start(int(wait*1000) + 1)
         return super().mouseMoveEvent(event)
 
+    def interval(self):
+        """
+        Returns the minimum time between two previews in seconds.
+
+        Follows the measured preview latency: cached previews on a fast
+        machine come at display rate, slow (network) files are not asked for
+        more previews than they can deliver.
+        """
+        return min(max(self.__latency, self.minInterval), self.maxInterval)
+
+    def reportLatency(self, seconds):
+        """
+        Records the time from a preview request to its display.
+
+        Args:
+            seconds (float): End-to-end latency of one preview
+        """
+        self.__latency = 0.7 * self.__latency + 0.3 * seconds
+
+    def __sendPending(self):
+        """
+        Emits the preview held back by the throttle.
+        """
+        self.__trailing.stop()
+        if self.__pending is None or not self.__inside:
+            return
+        # Emit preview signal with position and milliseconds
+        self.showPreview.emit(self.__pending)
+        self.__pending = None
+        # Update timestamp to throttle further updates
+        self.__sentStamp = time.time()
+
+    def __trackMotion(self, ms, stamp):
+        """
+        Updates the scrub velocity estimate and emits it with the position.
+
+        Args:
+            ms (float): Hovered position in milliseconds
+            stamp (float): Time of the mouse event in seconds
+        """
+        if self.__lastMove is not None:
+            dt = stamp - self.__lastMove[1]
+            if dt <= 0:
+                return
+            velocity = (ms - self.__lastMove[0]) / dt
+            # Smooth out jitter of single events
+            self.__velocity = 0.5 * self.__velocity + 0.5 * velocity
+        self.__lastMove = (ms, stamp)
+        self.scrubMotion.emit(ms, self.__velocity)
+
     def enterEvent(self, event):
         """
         Handles mouse entering the slider area.
@@ -111,6 +184,9 @@ class MySlider(QSlider):
         self.__inside = True
         # Initialize throttle timestamp
         self.__sentStamp = time.time()
+        # Start a fresh velocity estimate
+        self.__lastMove = None
+        self.__velocity = 0.0
 
     def leaveEvent(self, event):
         """
@@ -120,6 +196,9 @@ class MySlider(QSlider):
         """
         # Set flag to indicate mouse is outside slider
         self.__inside = False
+        # Drop a preview still held back by the throttle
+        self.__trailing.stop()
+        self.__pending = None
         # Emit signal that preview should stop
         self.exitPreview.emit()
         # Emit empty preview to hide the preview window
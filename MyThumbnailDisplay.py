@@ -8,23 +8,171 @@ the current playback position.
 Key Responsibilities:
 - Display multiple thumbnail images in a horizontal scrollable view
 - Show current playback position with a vertical line indicator
-- Automatically center the view on the current playback position
+- Keep the playhead in view as playback moves on
 - Support dynamic duration and position updates
+- Resolve thumbnails only for tiles in or near the viewport (virtualized strip)
+- Zoom levels from the whole file down to one tile per second
+- Pack thumbnails into a few large atlas pixmaps drawn by a single item
 
 The class uses QGraphicsView and QGraphicsScene for efficient image display
-and includes a green vertical line as the playhead indicator.
+and includes a green vertical line as the playhead indicator. The strip is
+divided into tiles of a fixed time span (the zoom level); only the tiles
+around the viewport are resolved, filled from the thumbnails added so far
+or from a thumbnail source. Thumbnails are blitted into atlas pages
+(ReelAtlas) as they arrive and no other copy is kept: the atlas bounds the
+memory whatever the length or density of the reel, and a thumbnail whose
+cell was recycled is asked for again through the source. One ReelItem
+paints every visible tile as a source rectangle of a page: two scene items
+in total, whatever the zoom.
+
+Custom Signals:
+- tileRequested(float): Emits the time (ms) of a visible tile without image
 
 Dependencies:
-- PyQt6: QGraphicsView, QGraphicsScene, QPixmap, QPen
+- PyQt6: QGraphicsView, QGraphicsScene, QGraphicsItem, QPixmap, QPainter, QPen
+- bisect: Nearest thumbnail lookup
+- collections.OrderedDict: Least recently used atlas cells
 """
 
+import bisect
+import math
+from collections import OrderedDict
 from PyQt6.QtWidgets import QGraphicsView
 from PyQt6.QtWidgets import QGraphicsScene
+from PyQt6.QtWidgets import QGraphicsItem
 from PyQt6.QtGui import QPixmap
+from PyQt6.QtGui import QPainter
 from PyQt6.QtCore import Qt
+from PyQt6.QtCore import QRectF
+from PyQt6.QtCore import pyqtSignal
 from PyQt6.QtGui import QPen
 
 
+# ===============================================================================
+# ReelAtlas- Thumbnails packed into a few large pixmaps
+# ===============================================================================
+class ReelAtlas(object):
+    """
+    Pages of equally sized cells, each holding one thumbnail.
+
+    Thumbnails are drawn into a free cell when they arrive; once every page
+    is full the least recently used cell is reused.
+
+    Attributes:
+    - pages: The atlas pixmaps
+    - cellW, cellH: Cell size in pixels
+    """
+    # page side in pixels, within the texture limits of any GPU
+    pageSize = 2048
+    # pages at most, cells beyond are recycled
+    maxPages = 4
+
+    def __init__(self, cellW, cellH):
+        """
+        Args:
+            cellW (int): Thumbnail width
+            cellH (int): Thumbnail height
+        """
+        self.cellW = cellW
+        self.cellH = cellH
+        self.columns = max(self.pageSize // cellW, 1)
+        self.rows = max(self.pageSize // cellH, 1)
+        self.pages = []
+        # key -> cell number, least recently used first
+        self.__cells = OrderedDict()
+        self.__next = 0
+
+    def __contains__(self, key):
+        return key in self.__cells
+
+    def __len__(self):
+        return len(self.__cells)
+
+    def __locate(self, cell):
+        page, i = divmod(cell, self.columns * self.rows)
+        row, column = divmod(i, self.columns)
+        return page, QRectF(column * self.cellW, row * self.cellH,
+                            self.cellW, self.cellH)
+
+    def insert(self, key, qImg):
+        """
+        Draws a thumbnail into the atlas.
+
+        Args:
+            key: Identifies the thumbnail
+            qImg (QImage): The thumbnail, scaled to the cell if needed
+
+        Returns:
+            The key whose cell was recycled for it, or None
+        """
+        evicted = None
+        if key in self.__cells:
+            cell = self.__cells.pop(key)
+        elif self.__next < self.maxPages * self.columns * self.rows:
+            cell = self.__next
+            self.__next += 1
+            if cell // (self.columns * self.rows) == len(self.pages):
+                page = QPixmap(self.columns * self.cellW, self.rows * self.cellH)
+                page.fill(Qt.GlobalColor.black)
+                self.pages.append(page)
+        else:
+            # Full: recycle the least recently used cell
+            evicted, cell = self.__cells.popitem(last=False)
+        self.__cells[key] = cell
+        page, rect = self.__locate(cell)
+        painter = QPainter(self.pages[page])
+        painter.drawImage(rect, qImg)
+        painter.end()
+        return evicted
+
+    def source(self, key):
+        """
+        Returns where a thumbnail is in the atlas.
+
+        Args:
+            key: Identifies the thumbnail
+
+        Returns:
+            tuple: (page QPixmap, source QRectF), or None if not in the atlas
+        """
+        cell = self.__cells.get(key)
+        if cell is None:
+            return None
+        self.__cells.move_to_end(key)
+        page, rect = self.__locate(cell)
+        return self.pages[page], rect
+
+
+# ===============================================================================
+# ReelItem- Single scene item painting the visible reel tiles
+# ===============================================================================
+class ReelItem(QGraphicsItem):
+    """
+    Scene item covering the whole strip; paints only the exposed tiles.
+    """
+
+    def __init__(self, paintTiles):
+        """
+        Args:
+            paintTiles (callable): paintTiles(painter, exposedRect)
+        """
+        super(ReelItem, self).__init__()
+        self.__paintTiles = paintTiles
+        self.__rect = QRectF()
+        # exposedRect in paint() is the damaged area, not the whole strip
+        self.setFlag(QGraphicsItem.GraphicsItemFlag.ItemUsesExtendedStyleOption)
+
+    def setRect(self, rect):
+        self.prepareGeometryChange()
+        self.__rect = rect
+
+    def boundingRect(self):
+        return self.__rect
+
+    def paint(self, painter, option, widget=None):
+        self.__paintTiles(painter, option.exposedRect)
+
+
 # ===============================================================================
 # MyThubnailDisplay-
 # ===============================================================================
@@ -32,6 +180,15 @@ class MyThumbnailDisplay(QGraphicsView):
     """
     Create a qgraphicsview widget to display reel of images array.
     """
+    tileRequested = pyqtSignal(float)
+    # milliseconds covered by one tile at the zoom levels finer than the fit
+    zoomLevels = (3600000, 900000, 300000, 60000, 15000, 5000, 1000)
+    # number of tiles when the whole file fits the strip (zoom level 0)
+    fitTiles = 100
+    # reel images added with addImage are this many evenly spaced positions
+    reelCount = 100
+    # tiles kept on either side of the viewport
+    tileMargin = 4
 
 # |-----------------------------------------------------------------------------|
 # Constructor :-
@@ -41,10 +198,19 @@ class MyThumbnailDisplay(QGraphicsView):
         This constructor is used to initialize the thumbnail display.
         """
         super(MyThumbnailDisplay, self).__init__(parent=parent)
-        self.display = QGraphicsScene()
+        # owned by the view: torn down after it, not before its scroll bars
+        self.display = QGraphicsScene(self)
         self.setScene(self.display)
-        self.clearDisplay()
         self.__pen = QPen(Qt.GlobalColor.green, 3)
+        # callable(ms) -> QImage or None, for tiles without a thumbnail
+        self.__source = None
+        # callable(QImage), called once a source image is drawn
+        self.__release = None
+        # tile size, taken from the first thumbnail
+        self.__tileW = 142
+        self.__tileH = 80
+        self.clearDisplay()
+        self.horizontalScrollBar().valueChanged.connect(self.__updateTiles)
 # |--------------------------End of Constructor---------------------------------|
 
     def clearDisplay(self):
@@ -53,35 +219,79 @@ class MyThumbnailDisplay(QGraphicsView):
 
         Called when a new video is opened to clear old thumbnails.
         """
-        # Reset thumbnail count
-        self.__count = 0
-        # Reset total width of all thumbnails
-        self.__totalW = 0
         # Reset stored duration
         self.__duration = 0
+        # Times (ms) of the added thumbnails held by the atlas, sorted
+        self.__times = []
+        # Atlas keys of the tiles around the viewport, by tile number
+        self.__tiles = {}
+        self.__atlas = ReelAtlas(self.__tileW, self.__tileH)
+        # Tiles whose image was asked for with tileRequested
+        self.__requested = set()
+        # Range of tiles kept, (first, last)
+        self.__kept = (0, -1)
+        # Zoom level, 0 fits the whole file
+        self.__level = 0
+        self.__r = None
         # Clear all graphics items from the scene
         self.display.clear()
+        self.__reel = ReelItem(self.__paintTiles)
+        self.display.addItem(self.__reel)
+
+    def setSource(self, source, release=None):
+        """
+        Sets where tiles without an added thumbnail get their image from.
+
+        Args:
+            source (callable): source(ms) returns a QImage or None (e.g. a
+                               preview cache lookup or SpriteTrack.image
+                               of a sidecar thumbnail track)
+            release (callable): release(qImg) is called with every source
+                                image once it is drawn into the atlas
+        """
+        self.__source = source
+        self.__release = release
+        self.__requested.clear()
+        self.__updateTiles()
 
     def addImage(self, qImg, pos):
         """
-        Adds a thumbnail image to the timeline strip.
+        Adds a thumbnail image of the reel to the timeline strip.
 
         Args:
             qImg (QImage): The thumbnail frame image
             pos (int): Sequential position/index of the thumbnail
 
-        Thumbnails are arranged horizontally with each at position (pos * width).
+        Reel thumbnails are evenly spaced: position pos of reelCount.
+        """
+        self.addThumbnail(qImg, pos * self.__duration / self.reelCount)
+
+    def addThumbnail(self, qImg, ms):
         """
-        # Convert QImage to QPixmap for display
-        pm = QPixmap.fromImage(qImg)
-        # Add the pixmap to the graphics scene
-        pmi = self.display.addPixmap(pm)
-        # Position horizontally based on thumbnail width
-        pmi.setPos(pos * pm.width(), 0)
-        # Increment thumbnail counter
-        self.__count += 1
-        # Calculate total width (100 thumbnails max)
-        self.__totalW = 100*pm.width()
+        Adds a thumbnail of any time to the timeline strip.
+
+        Args:
+            qImg (QImage): The thumbnail frame image
+            ms (float): Media time of the thumbnail in milliseconds
+
+        The image is drawn into the atlas at once and not kept.
+        """
+        if not len(self.__atlas) and (qImg.width(), qImg.height()) != (
+                self.__tileW, self.__tileH):
+            # Tiles take the size of the thumbnails
+            self.__tileW, self.__tileH = qImg.width(), qImg.height()
+            self.__atlas = ReelAtlas(self.__tileW, self.__tileH)
+            self.__layout()
+        if ms not in self.__atlas:
+            bisect.insort(self.__times, ms)
+        self.__insert(ms, qImg)
+        if not self.__duration:
+            return
+        tile = int(ms // self.tileMs())
+        if self.__kept[0] <= tile <= self.__kept[1]:
+            # Refresh the tile, the new thumbnail may be closer to it
+            self.__dropTile(tile)
+            self.__loadTile(tile)
 
     def setDuration(self, duration):
         """
@@ -94,11 +304,13 @@ class MyThumbnailDisplay(QGraphicsView):
         """
         # Store duration in milliseconds
         self.__duration = duration*1000
-        # Create a vertical line at the beginning as playhead indicator
-        self.__r = self.display.addLine(
-            0, 0, 0, 80, self.__pen)  # Green pen defined in constructor
-        # Set high Z-value so line appears on top of images
-        self.__r.setZValue(5000)
+        if self.__r is None:
+            # Create a vertical line at the beginning as playhead indicator
+            self.__r = self.display.addLine(
+                0, 0, 0, self.__tileH, self.__pen)  # Green pen defined in constructor
+            # Set high Z-value so line appears on top of images
+            self.__r.setZValue(5000)
+        self.__layout()
 
     def setPosition(self, pos):
         """
@@ -108,14 +320,220 @@ class MyThumbnailDisplay(QGraphicsView):
             pos (int): Current playback position in milliseconds
 
         Calculates the corresponding position in the thumbnail strip and
-        centers the view to keep the playhead visible.
+        centers the view to keep the playhead visible. Scrolling repaints
+        atlas rectangles of a single item, so it can follow every update.
         """
         if self.__duration:
-            # Calculate progress ratio (0.0 to 1.0)
-            p = round(pos/self.__duration, 6)
             # Convert to position in thumbnail strip
-            p = p*self.__totalW
+            p = pos / self.tileMs() * self.__tileW
             # Center the view on the playhead position
             self.centerOn(p, 0)
             # Move the playhead line to the current position
             self.__r.setPos(p, 0)
+
+# |-----------------------------------------------------------------------------|
+# zoom :-
+# |-----------------------------------------------------------------------------|
+    def tileSpans(self):
+        """
+        Returns the milliseconds per tile of every zoom level.
+
+        Level 0 fits the whole file in fitTiles tiles, the others are the
+        finer zoomLevels (down to a second per tile).
+        """
+        fit = max(self.__duration / self.fitTiles, 1)
+        return [fit] + [span for span in self.zoomLevels if span < fit]
+
+    def tileMs(self):
+        """
+        Returns the milliseconds covered by one tile at the current zoom.
+        """
+        return self.tileSpans()[self.__level]
+
+    def zoomLevel(self):
+        return self.__level
+
+    def setZoom(self, level):
+        """
+        Changes the zoom level, keeping the time at the view center in place.
+
+        Args:
+            level (int): Index into tileSpans(), 0 fits the whole file
+        """
+        level = min(max(level, 0), len(self.tileSpans()) - 1)
+        if level == self.__level:
+            return
+        center = self.mapToScene(self.viewport().rect().center()).x()
+        ms = center / self.__tileW * self.tileMs()
+        self.__level = level
+        self.__layout()
+        self.centerOn(ms / self.tileMs() * self.__tileW, 0)
+        self.__updateTiles()
+
+    def zoomIn(self):
+        self.setZoom(self.__level + 1)
+
+    def zoomOut(self):
+        self.setZoom(self.__level - 1)
+
+    def wheelEvent(self, event):
+        """
+        Ctrl + wheel zooms, the plain wheel scrolls the strip.
+        """
+        if event.modifiers() & Qt.KeyboardModifier.ControlModifier:
+            if event.angleDelta().y() > 0:
+                self.zoomIn()
+            elif event.angleDelta().y() < 0:
+                self.zoomOut()
+            event.accept()
+            return
+        return super().wheelEvent(event)
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.__updateTiles()
+
+# |-----------------------------------------------------------------------------|
+# tiles :-
+# |-----------------------------------------------------------------------------|
+    def tileCount(self):
+        """
+        Returns the number of tiles of the strip at the current zoom.
+        """
+        if not self.__duration:
+            return 0
+        return math.ceil(self.__duration / self.tileMs())
+
+    def __layout(self):
+        """
+        Sizes the scene for the current zoom and rebuilds the kept tiles.
+        """
+        for tile in list(self.__tiles):
+            self.__dropTile(tile)
+        self.__requested.clear()
+        self.__kept = (0, -1)
+        rect = QRectF(0, 0, self.tileCount() * self.__tileW, self.__tileH)
+        self.display.setSceneRect(rect)
+        self.__reel.setRect(rect)
+        self.__updateTiles()
+
+    def __updateTiles(self, *args):
+        """
+        Creates the tiles in or near the viewport and drops the others.
+        """
+        count = self.tileCount()
+        if not count:
+            return
+        visible = self.mapToScene(self.viewport().rect()).boundingRect()
+        first = max(int(visible.left() // self.__tileW) - self.tileMargin, 0)
+        last = min(int(visible.right() // self.__tileW) + self.tileMargin,
+                   count - 1)
+        self.__kept = (first, last)
+        for tile in [t for t in self.__tiles if not first <= t <= last]:
+            self.__dropTile(tile)
+        for tile in range(first, last + 1):
+            if tile not in self.__tiles:
+                self.__loadTile(tile)
+
+    def __loadTile(self, tile):
+        """
+        Resolves the thumbnail of a tile: the nearest added thumbnail, else
+        the source, else a tileRequested.
+        """
+        span = self.tileMs()
+        ms = (tile + 0.5) * span
+        key = self.__keyNear(ms, span / 2)
+        if key is None and self.__source is not None:
+            key = ("tile", span, tile)
+            if key not in self.__atlas:
+                qImg = self.__source(ms)
+                if qImg is None:
+                    key = None
+                else:
+                    self.__insert(key, qImg)
+                    if self.__release is not None:
+                        self.__release(qImg)
+        if key is None:
+            if tile not in self.__requested:
+                # Whoever decodes thumbnails can fill it with addThumbnail
+                self.__requested.add(tile)
+                self.tileRequested.emit(ms)
+            return
+        self.__tiles[tile] = key
+        self.__reel.update(QRectF(tile * self.__tileW, 0,
+                                  self.__tileW, self.__tileH))
+
+    def __insert(self, key, qImg):
+        """
+        Draws a thumbnail into the atlas, forgetting the one it replaces.
+        """
+        evicted = self.__atlas.insert(key, qImg)
+        if evicted is None:
+            return
+        if not isinstance(evicted, tuple):
+            # Added thumbnail gone: its tiles go back to the source
+            del self.__times[bisect.bisect_left(self.__times, evicted)]
+        for tile in [t for t, k in self.__tiles.items() if k == evicted]:
+            # Resolved again on the next viewport update
+            self.__dropTile(tile)
+            self.__requested.discard(tile)
+            self.__reel.update(QRectF(tile * self.__tileW, 0,
+                                      self.__tileW, self.__tileH))
+
+    def __dropTile(self, tile):
+        """
+        Forgets a tile (its thumbnail stays in the atlas until recycled).
+        """
+        self.__tiles.pop(tile, None)
+
+    def __paintTiles(self, painter, exposed):
+        """
+        Paints the resolved tiles within an exposed area from the atlas.
+        """
+        first = max(int(exposed.left() // self.__tileW), 0)
+        last = int(exposed.right() // self.__tileW)
+        for tile in range(first, last + 1):
+            key = self.__tiles.get(tile)
+            source = self.__atlas.source(key) if key is not None else None
+            if source is None:
+                continue
+            page, rect = source
+            painter.drawPixmap(QRectF(tile * self.__tileW, 0, self.__tileW,
+                                      self.__tileH), page, rect)
+
+    def __keyNear(self, ms, within):
+        """
+        Returns the time of the added thumbnail closest to a time, if within
+        a distance.
+        """
+        i = bisect.bisect_left(self.__times, ms)
+        best = None
+        for j in (i - 1, i):
+            if 0 <= j < len(self.__times) and abs(self.__times[j] - ms) <= within:
+                if best is None or abs(self.__times[j] - ms) < abs(best - ms):
+                    best = self.__times[j]
+        return best
+
+    def tileItems(self):
+        """
+        Returns the number of tiles currently resolved around the viewport.
+        """
+        return len(self.__tiles)
+
+    def atlasSource(self, ms):
+        """
+        Returns where the thumbnail added for a time is in the atlas.
+
+        Args:
+            ms (float): Time the thumbnail was added with
+
+        Returns:
+            tuple: (page QPixmap, source QRectF), or None if not held
+        """
+        return self.__atlas.source(ms)
+
+    def atlasPages(self):
+        """
+        Returns the number of atlas pixmaps in use.
+        """
+        return len(self.__atlas.pages)
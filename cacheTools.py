@@ -0,0 +1,142 @@
+"""
+cacheTools.py - Shared Helpers for On-Disk Caches
+
+This module provides the small helpers every persistent cache of the video
+player relies on, so that derived artifacts (indexes, thumbnails, metadata)
+are stored in one place and found again on the next session.
+
+Caches holding one file per media (thumbnail stores, keyframe indexes,
+scrubbing proxies) have a disk budget: entries are touched when used, and
+the least recently used ones are deleted once a new entry pushes the cache
+over its budget. The MYVIDEOPLAYER_CACHE environment variable moves every
+cache to another folder (tests use a scratch one).
+
+Key Functions:
+- cacheDirectory(): Per-cache folder inside the user's cache location
+- fileKey(): Stable key identifying a media file's current contents
+- touchEntry(): Mark a cache entry as recently used
+- trimCache(): Evict least recently used entries over the budget
+
+Dependencies:
+- PyQt6: QStandardPaths for the platform cache location
+- fileIdentity: Content fingerprints of local files
+"""
+
+import hashlib
+import os
+import logging
+from PyQt6.QtCore import QStandardPaths
+from fileIdentity import FileIdentity
+logger = logging.getLogger(__name__)
+
+# Disk budget in bytes of the caches trimmed by trimCache
+cacheBudgets = {
+    "thumbnails": 1 << 30,
+    "index": 256 << 20,
+    "proxies": 8 << 30,
+}
+
+
+def cacheDirectory(name):
+    """
+    Returns (and creates) the folder used by a named cache.
+
+    Args:
+        name (str): Sub folder name of the cache (e.g. "index")
+
+    Returns:
+        str: Absolute path of the cache folder
+    """
+    base = os.environ.get("MYVIDEOPLAYER_CACHE")
+    if not base:
+        # Platform cache root (~/.cache on Linux)
+        base = os.path.join(QStandardPaths.writableLocation(
+            QStandardPaths.StandardLocation.GenericCacheLocation),
+            "MyVideoPlayer")
+    path = os.path.join(base, name)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def fileKey(fPath):
+    """
+    Builds a key identifying a media file for cache lookups.
+
+    Args:
+        fPath (str): Path (or network URL) of the media
+
+    Returns:
+        str: Hex digest that changes whenever the file is modified
+
+    Local files are identified by a sampled fingerprint of their content
+    (see fileIdentity), so the key survives renames and moves; network URLs
+    by the URL itself.
+    """
+    try:
+        return FileIdentity.shared().fingerprint(fPath)
+    except (OSError, ValueError):
+        # Not a local file (network URL)
+        return hashlib.sha1(fPath.encode("utf-8")).hexdigest()
+
+
+def touchEntry(path):
+    """
+    Marks a cache entry as used now (entries are evicted by modification
+    time, access times are often not recorded).
+
+    Args:
+        path (str): Path of the entry
+    """
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+
+
+def trimCache(name, keep=()):
+    """
+    Deletes the least recently used entries of a cache over its budget.
+
+    Args:
+        name (str): Cache name (see cacheDirectory and cacheBudgets)
+        keep (iterable): Entries never deleted, e.g. the one just written
+
+    Returns:
+        int: Number of entries deleted
+
+    Files being written (.part) are left alone; entries still open
+    elsewhere stay usable on POSIX (the data lives until closed), and are
+    skipped where they cannot be deleted.
+    """
+    budget = cacheBudgets.get(name)
+    if budget is None:
+        return 0
+    keep = {os.path.abspath(path) for path in keep}
+    entries = []
+    total = 0
+    with os.scandir(cacheDirectory(name)) as found:
+        for entry in found:
+            if not entry.is_file() or entry.name.endswith(".part"):
+                continue
+            try:
+                st = entry.stat()
+            except OSError:
+                continue
+            # Blocks actually used: thumbnail stores are sparse files
+            size = st.st_blocks * 512 if hasattr(st, "st_blocks") else st.st_size
+            entries.append((st.st_mtime, size, entry.path))
+            total += size
+    removed = 0
+    for _, size, path in sorted(entries):
+        if total <= budget:
+            break
+        if os.path.abspath(path) in keep:
+            continue
+        try:
+            os.remove(path)
+        except OSError as ex:
+            logger.debug(f"Cache entry kept {path}: {ex}")
+            continue
+        total -= size
+        removed += 1
+    return removed
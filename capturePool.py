@@ -0,0 +1,156 @@
+"""
+capturePool.py - LRU Pool of Open VideoCapture Handles
+
+This module provides the CapturePool class which keeps recently used OpenCV
+captures open, so that switching back and forth between playlist items,
+probing metadata and extracting the reel do not open (demuxer probing,
+decoder setup, network connection) the same file again and again.
+
+Key Responsibilities:
+- Lend open captures keyed by the file key of the media
+- Take captures back as idle, most recently used first
+- Release the least recently used idle captures beyond a bound
+- Drop the idle captures of a file, or all of them
+
+A capture is lent to one user at a time (captures are not thread-safe); two
+users of the same file at once get two handles, both kept when returned.
+
+Dependencies:
+- cv2: VideoCapture
+- collections.OrderedDict: Recency order of the idle captures
+- threading: Lock guarding the idle captures
+"""
+
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+import cv2
+from cacheTools import fileKey
+
+
+# ===============================================================================
+# CapturePool- Bounded LRU pool of idle VideoCapture handles
+# ===============================================================================
+class CapturePool(object):
+    """
+    Least recently used pool of open captures.
+
+    Attributes:
+    - maxIdle: Most idle captures kept open
+    - hits, misses, evictions: Usage counters
+    """
+    __shared = None
+    __sharedLock = threading.Lock()
+
+    def __init__(self, maxIdle=6):
+        """
+        Args:
+            maxIdle (int): Most idle captures kept open
+        """
+        self.maxIdle = maxIdle
+        self.__lock = threading.Lock()
+        # (file key, serial) -> capture; serial tells handles of a file apart
+        self.__idle = OrderedDict()
+        self.__serial = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @classmethod
+    def shared(cls):
+        """
+        Returns the pool shared by everything in this process.
+        """
+        with cls.__sharedLock:
+            if cls.__shared is None:
+                cls.__shared = cls()
+            return cls.__shared
+
+    def __len__(self):
+        return len(self.__idle)
+
+    def acquire(self, fPath):
+        """
+        Lends a capture of a file, opening one if none is idle.
+
+        Args:
+            fPath (str): Path (or network URL) of the media
+
+        Returns:
+            cv2.VideoCapture: The capture; its read position is unspecified
+        """
+        key = fileKey(fPath)
+        with self.__lock:
+            # Most recently returned handle of the file first
+            for entry in reversed(self.__idle):
+                if entry[0] == key:
+                    self.hits += 1
+                    return self.__idle.pop(entry)
+            self.misses += 1
+        return cv2.VideoCapture(fPath)
+
+    def release(self, fPath, capture):
+        """
+        Takes a lent capture back, releasing the least recently used idle
+        captures beyond maxIdle.
+
+        Args:
+            fPath (str): Path the capture was acquired for
+            capture (cv2.VideoCapture): The capture
+        """
+        if not capture.isOpened():
+            return
+        evicted = []
+        with self.__lock:
+            self.__serial += 1
+            self.__idle[(fileKey(fPath), self.__serial)] = capture
+            while len(self.__idle) > self.maxIdle:
+                evicted.append(self.__idle.popitem(last=False)[1])
+                self.evictions += 1
+        # Closing may block on network streams, not under the lock
+        for old in evicted:
+            old.release()
+
+    @contextmanager
+    def borrow(self, fPath):
+        """
+        Lends a capture for the duration of a with block.
+
+        Args:
+            fPath (str): Path (or network URL) of the media
+        """
+        capture = self.acquire(fPath)
+        try:
+            yield capture
+        finally:
+            self.release(fPath, capture)
+
+    def drop(self, fPath):
+        """
+        Releases the idle captures of a file.
+        """
+        key = fileKey(fPath)
+        with self.__lock:
+            dropped = [self.__idle.pop(e) for e in list(self.__idle) if e[0] == key]
+        for capture in dropped:
+            capture.release()
+
+    def clear(self):
+        """
+        Releases every idle capture (counters are kept).
+        """
+        with self.__lock:
+            dropped = list(self.__idle.values())
+            self.__idle.clear()
+        for capture in dropped:
+            capture.release()
+
+    def stats(self):
+        """
+        Returns the usage counters.
+
+        Returns:
+            dict: hits, misses, evictions and idle captures
+        """
+        return {"hits": self.hits, "misses": self.misses,
+                "evictions": self.evictions, "idle": len(self.__idle)}
@@ -0,0 +1,464 @@
+"""
+containerHeaders.py - Duration and Dimensions from Container Headers
+
+This module reads the metadata of MP4/MOV and Matroska/WebM files straight
+from their headers, in pure Python: no demuxer is opened and no decoder is
+initialized, and only the few header structures needed are read (a few
+kilobytes, whatever the file size), which matters on network mounts.
+
+- MP4/MOV: top level boxes are walked by their headers (mdat is skipped,
+  not read) to the moov box, where for the first video track mdhd, hdlr,
+  stsd and stsz give the exact duration, timescale, frame count,
+  dimensions and codec; the movie duration of mvhd stands in for a track
+  duration left at zero.
+- Matroska/WebM: the Segment Info (TimecodeScale, Duration) and the first
+  video TrackEntry (CodecID, DefaultDuration, PixelWidth/Height) are read;
+  the SeekHead locates them when they follow the clusters.
+- MPEG-TS/M2TS (188 or 192 byte packets): no header holds the duration;
+  the first and last timestamps are sampled from the head and the tail of
+  the file (a few MB each, constant time for any file size).
+
+Key Classes:
+- ContainerInfo: Metadata found in the headers
+
+Key Functions:
+- readHeaders(): Metadata of a file, or None for other formats
+- transportStreamDuration(): Duration of an MPEG transport stream
+
+Dependencies:
+- struct: Binary header fields
+"""
+
+import os
+import struct
+from collections import namedtuple
+from metadataCache import MediaInfo
+import logging
+logger = logging.getLogger(__name__)
+
+# Top level boxes an MP4/MOV file starts with
+MP4_FIRST_BOXES = {b"ftyp", b"moov", b"mdat", b"free", b"wide", b"skip",
+                   b"pnot"}
+
+# Matroska element IDs
+EBML = 0x1A45DFA3
+SEGMENT = 0x18538067
+SEEK_HEAD = 0x114D9B74
+SEEK = 0x4DBB
+SEEK_ID = 0x53AB
+SEEK_POSITION = 0x53AC
+INFO = 0x1549A966
+TIMECODE_SCALE = 0x2AD7B1
+DURATION = 0x4489
+TRACKS = 0x1654AE6B
+TRACK_ENTRY = 0xAE
+TRACK_TYPE = 0x83
+CODEC_ID = 0x86
+DEFAULT_DURATION = 0x23E383
+VIDEO = 0xE0
+PIXEL_WIDTH = 0xB0
+PIXEL_HEIGHT = 0xBA
+CLUSTER = 0x1F43B675
+
+# MPEG transport streams
+TS_SYNC = 0x47
+# PCR and PTS bases are 33-bit counters of a 90 kHz clock
+TS_CLOCK = 90000
+TS_WRAP = 1 << 33
+
+
+# ===============================================================================
+# ContainerInfo- Metadata found in the container headers
+# ===============================================================================
+class ContainerInfo(namedtuple("ContainerInfo", "duration timescale frameCount "
+                               "fps width height codec")):
+    """
+    Metadata of the first video stream as stored in the container.
+
+    Attributes:
+    - duration: Duration of the video stream in seconds
+    - timescale: Ticks per second of the stream's timestamps
+    - frameCount: Number of frames (DefaultDuration based for Matroska)
+    - fps: Average frames per second
+    - width, height: Coded frame size in pixels
+    - codec: Sample entry type (MP4) or CodecID (Matroska)
+    """
+    __slots__ = ()
+
+    def mediaInfo(self):
+        """
+        Returns the metadata as stored by the MetadataCache.
+        """
+        return MediaInfo(round(self.duration, 3), self.frameCount, self.fps,
+                         self.width, self.height, self.codec)
+
+
+def readHeaders(fPath):
+    """
+    Reads the metadata of an MP4/MOV or Matroska/WebM file from its headers.
+
+    Args:
+        fPath (str): Path of a local file
+
+    Returns:
+        ContainerInfo: The metadata, or None for other formats, files without
+                       a video stream and headers lacking what is needed
+                       (e.g. fragmented MP4, Matroska without DefaultDuration)
+    """
+    try:
+        with open(fPath, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            head = f.read(8)
+            if len(head) < 8:
+                return None
+            if struct.unpack(">I", head[:4])[0] == EBML:
+                return _parseMatroska(f, size)
+            if head[4:8] in MP4_FIRST_BOXES:
+                return _parseMp4(f, size)
+    except (OSError, struct.error, ValueError, UnicodeDecodeError) as ex:
+        logger.debug(f"Unreadable headers in {fPath}: {ex}")
+    return None
+
+
+def _boxes(f, start, end):
+    """
+    Yields (type, data start, box end) of the MP4 boxes between two offsets.
+    """
+    pos = start
+    while pos + 8 <= end:
+        f.seek(pos)
+        size, kind = struct.unpack(">I4s", f.read(8))
+        headerSize = 8
+        if size == 1:
+            # 64-bit size follows the type
+            size = struct.unpack(">Q", f.read(8))[0]
+            headerSize = 16
+        elif size == 0:
+            # Box extends to the end of its parent
+            size = end - pos
+        if size < headerSize:
+            return
+        yield kind, pos + headerSize, min(pos + size, end)
+        pos += size
+
+
+def _child(f, start, end, kind):
+    """
+    Returns (data start, end) of the first child box of a type, or None.
+    """
+    for child, s, e in _boxes(f, start, end):
+        if child == kind:
+            return s, e
+    return None
+
+
+def _timing(f, start):
+    """
+    Returns (timescale, duration) of an mvhd or mdhd box.
+    """
+    f.seek(start)
+    if f.read(1)[0] == 1:
+        # version 1: 64-bit creation, modification and duration
+        f.seek(start + 20)
+        return struct.unpack(">IQ", f.read(12))
+    f.seek(start + 12)
+    return struct.unpack(">II", f.read(8))
+
+
+def _parseMp4(f, size):
+    """
+    Reads the first video track of an MP4/MOV file.
+    """
+    moov = _child(f, 0, size, b"moov")
+    if moov is None:
+        return None
+    for kind, start, end in _boxes(f, *moov):
+        if kind != b"trak":
+            continue
+        mdia = _child(f, start, end, b"mdia")
+        if mdia is None:
+            continue
+        hdlr = _child(f, *mdia, b"hdlr")
+        if hdlr is None:
+            continue
+        # version/flags, pre_defined, handler_type
+        f.seek(hdlr[0] + 8)
+        if f.read(4) != b"vide":
+            continue
+        mdhd = _child(f, *mdia, b"mdhd")
+        stbl = _child(f, *mdia, b"minf")
+        stbl = stbl and _child(f, *stbl, b"stbl")
+        if mdhd is None or stbl is None:
+            return None
+        timescale, duration = _timing(f, mdhd[0])
+        seconds = duration / timescale if timescale else 0
+        mvhd = _child(f, *moov, b"mvhd")
+        if not seconds and mvhd is not None:
+            # Track duration left to the movie header by some muxers
+            movieScale, movieDuration = _timing(f, mvhd[0])
+            seconds = movieDuration / movieScale if movieScale else 0
+        # First sample description: its type is the codec, then the
+        # visual sample entry's width and height
+        stsd = _child(f, *stbl, b"stsd")
+        if stsd is None:
+            return None
+        f.seek(stsd[0] + 8)
+        entry = f.read(36)
+        codec = entry[4:8].decode("latin-1")
+        width, height = struct.unpack(">HH", entry[32:36])
+        # stsz and stz2 both keep the sample count at offset 8
+        sizes = _child(f, *stbl, b"stsz") or _child(f, *stbl, b"stz2")
+        if sizes is None:
+            return None
+        f.seek(sizes[0] + 8)
+        frameCount = struct.unpack(">I", f.read(4))[0]
+        if not (timescale and seconds and frameCount):
+            # Fragmented: samples live in the moof boxes
+            return None
+        return ContainerInfo(seconds, timescale, frameCount,
+                             frameCount / seconds, width, height, codec)
+    return None
+
+
+def _readVint(f, keepMarker):
+    """
+    Reads an EBML variable length integer.
+
+    Args:
+        keepMarker (bool): True for element IDs, False for sizes
+
+    Returns:
+        tuple: (value, length); the value is None for an unknown size
+    """
+    first = f.read(1)
+    if not first or not first[0]:
+        raise ValueError("Invalid EBML variable length integer")
+    length = 9 - first[0].bit_length()
+    data = first + f.read(length - 1)
+    value = int.from_bytes(data, "big")
+    if keepMarker:
+        return value, length
+    bits = 7 * length
+    value &= (1 << bits) - 1
+    # All value bits set: size unknown (live streams)
+    return (None if value == (1 << bits) - 1 else value), length
+
+
+def _elements(f, start, end):
+    """
+    Yields (id, data start, data end) of the EBML elements between offsets.
+    """
+    pos = start
+    while pos < end:
+        f.seek(pos)
+        elementId, idLength = _readVint(f, True)
+        size, sizeLength = _readVint(f, False)
+        dataStart = pos + idLength + sizeLength
+        dataEnd = end if size is None else min(dataStart + size, end)
+        yield elementId, dataStart, dataEnd
+        pos = dataEnd
+
+
+def _readUint(f, start, end):
+    f.seek(start)
+    return int.from_bytes(f.read(end - start), "big")
+
+
+def _parseMatroska(f, size):
+    """
+    Reads the segment info and first video track of a Matroska/WebM file.
+    """
+    segment = next(((s, e) for i, s, e in _elements(f, 0, size)
+                    if i == SEGMENT), None)
+    if segment is None:
+        return None
+    found = {}
+    seeks = {}
+    for elementId, start, end in _elements(f, *segment):
+        if elementId in (INFO, TRACKS):
+            found[elementId] = (start, end)
+        elif elementId == SEEK_HEAD:
+            for seek, s, e in _elements(f, start, end):
+                if seek != SEEK:
+                    continue
+                entry = dict((i, (s2, e2)) for i, s2, e2 in _elements(f, s, e))
+                if SEEK_ID in entry and SEEK_POSITION in entry:
+                    target = _readUint(f, *entry[SEEK_ID])
+                    seeks[target] = segment[0] + _readUint(f, *entry[SEEK_POSITION])
+        elif elementId == CLUSTER:
+            # Media data from here on: jump to what the SeekHead points at
+            break
+        if INFO in found and TRACKS in found:
+            break
+    for elementId in (INFO, TRACKS):
+        if elementId not in found and elementId in seeks:
+            element = next(_elements(f, seeks[elementId], segment[1]), None)
+            if element is not None and element[0] == elementId:
+                found[elementId] = element[1:]
+    if INFO not in found or TRACKS not in found:
+        return None
+    timecodeScale = 1000000
+    duration = None
+    for elementId, start, end in _elements(f, *found[INFO]):
+        if elementId == TIMECODE_SCALE:
+            timecodeScale = _readUint(f, start, end)
+        elif elementId == DURATION:
+            f.seek(start)
+            data = f.read(end - start)
+            duration = struct.unpack(">f" if len(data) == 4 else ">d", data)[0]
+    for elementId, start, end in _elements(f, *found[TRACKS]):
+        if elementId != TRACK_ENTRY:
+            continue
+        track = dict((i, (s, e)) for i, s, e in _elements(f, start, end))
+        if TRACK_TYPE not in track or _readUint(f, *track[TRACK_TYPE]) != 1:
+            continue
+        if DEFAULT_DURATION not in track or not duration or VIDEO not in track:
+            return None
+        frameNs = _readUint(f, *track[DEFAULT_DURATION])
+        video = dict((i, (s, e)) for i, s, e in _elements(f, *track[VIDEO]))
+        codec = ""
+        if CODEC_ID in track:
+            f.seek(track[CODEC_ID][0])
+            codec = f.read(track[CODEC_ID][1] - track[CODEC_ID][0]).decode(
+                "ascii").rstrip("\0")
+        durationNs = duration * timecodeScale
+        return ContainerInfo(
+            durationNs / 1e9, 1e9 / timecodeScale, round(durationNs / frameNs),
+            1e9 / frameNs, _readUint(f, *video.get(PIXEL_WIDTH, (0, 0))),
+            _readUint(f, *video.get(PIXEL_HEIGHT, (0, 0))), codec)
+    return None
+
+
+def transportStreamDuration(fPath, sampleBytes=2*1024*1024):
+    """
+    Measures the duration of an MPEG-TS/M2TS file from its timestamps.
+
+    Args:
+        fPath (str): Path of a local file
+        sampleBytes (int): Bytes read at the head and at the tail
+
+    Returns:
+        float: Duration in milliseconds, or None if not a transport stream
+               or no timestamps were found
+
+    The first video PTS of the head and the last of the tail span the
+    stream, plus one frame interval (the smallest PTS step seen). Streams
+    without video PES use the program clock reference (PCR) instead. A
+    wrap of the 33-bit clock between head and tail is accounted for.
+    """
+    try:
+        with open(fPath, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            # A few packets tell a transport stream, before reading more
+            head = f.read(8 * 192)
+            packetSize, offset = _tsLayout(head)
+            if packetSize is None:
+                return None
+            head += f.read(max(sampleBytes - len(head), 0))
+            tailStart = max(size - sampleBytes, len(head))
+            f.seek(tailStart)
+            tail = f.read()
+    except OSError as ex:
+        logger.debug(f"Unreadable transport stream {fPath}: {ex}")
+        return None
+    first = _tsTimestamps(head, packetSize, offset)
+    last = first
+    # The tail is aligned again: it starts anywhere in a packet
+    _, tailOffset = _tsLayout(tail, packetSize)
+    if tailOffset is not None:
+        last = _tsTimestamps(tail, packetSize, tailOffset)
+    for kind in ("pts", "pcr"):
+        spans = []
+        for pid, (start, end, step) in first[kind].items():
+            if pid in last[kind]:
+                _, end, tailStep = last[kind][pid]
+                step = min(s for s in (step, tailStep, TS_WRAP) if s)
+            span = (end - start) % TS_WRAP
+            if kind == "pts" and step < TS_WRAP:
+                # The last frame lasts one frame interval too
+                span += step
+            spans.append(span)
+        # The stream with the longest span (programs may start late)
+        if spans and max(spans) > 0:
+            return max(spans) * 1000 / TS_CLOCK
+    return None
+
+
+def _tsLayout(data, packetSize=None):
+    """
+    Finds the packet size and the offset of the first sync byte.
+
+    Returns:
+        tuple: (packet size, offset of the first 0x47 sync byte), or
+               (None, None) when data is not a transport stream
+    """
+    sizes = (packetSize,) if packetSize else (188, 192)
+    for size in sizes:
+        # Enough consecutive sync bytes to rule out chance
+        count = min(8, len(data) // size)
+        if count < 2:
+            continue
+        for offset in range(size):
+            if all(data[offset + i * size] == TS_SYNC for i in range(count)
+                   if offset + i * size < len(data)):
+                return size, offset
+    return None, None
+
+
+def _tsTimestamps(data, packetSize, offset):
+    """
+    Collects timestamps of the packets in a sample of a transport stream.
+
+    Returns:
+        dict: "pts" (video PES) and "pcr", each PID -> (first, last, step)
+              with step the smallest positive increment seen (0 if none);
+              first/last in stream order and unwrapped relative to first
+    """
+    found = {"pts": {}, "pcr": {}}
+    for pos in range(offset, len(data) - 187, packetSize):
+        packet = data[pos:pos + 188]
+        if packet[0] != TS_SYNC:
+            continue
+        pid = ((packet[1] & 0x1F) << 8) | packet[2]
+        control = (packet[3] >> 4) & 3
+        payload = 4
+        if control & 2:
+            length = packet[4]
+            payload = 5 + length
+            # PCR flag: 33-bit base in the six bytes after the flags
+            if length >= 7 and packet[5] & 0x10:
+                b = packet[6:12]
+                _tsRecord(found["pcr"], pid, (b[0] << 25) | (b[1] << 17)
+                          | (b[2] << 9) | (b[3] << 1) | (b[4] >> 7))
+        # Start of a video PES carrying a PTS
+        pes = packet[payload:]
+        if (control & 1 and packet[1] & 0x40 and len(pes) >= 14
+                and pes[:3] == b"\0\0\1" and 0xE0 <= pes[3] <= 0xEF
+                and pes[7] & 0x80):
+            b = pes[9:14]
+            _tsRecord(found["pts"], pid, ((b[0] >> 1) & 7) << 30
+                      | b[1] << 22 | (b[2] >> 1) << 15 | b[3] << 7 | b[4] >> 1)
+    return found
+
+
+def _tsRecord(table, pid, value):
+    """
+    Adds a timestamp of a PID to (first, last, smallest step), where last
+    is the largest seen (decode order and B-frames put PTS out of order).
+    """
+    if pid not in table:
+        table[pid] = (value, value, 0)
+        return
+    first, last, step = table[pid]
+    # Relative to the first, across a wrap of the 33-bit clock
+    delta = (value - first) % TS_WRAP
+    lastDelta = (last - first) % TS_WRAP
+    if delta > TS_WRAP // 2:
+        # Behind the first (reordered frame)
+        return
+    gap = abs(delta - lastDelta)
+    if gap and (not step or gap < step):
+        step = gap
+    if delta > lastDelta:
+        last = value
+    table[pid] = (first, last, step)
@@ -0,0 +1,150 @@
+"""
+fileIdentity.py - Sampled Content Fingerprints of Media Files
+
+This module identifies local media files by their content rather than by
+their path, so that derived artifacts (keyframe indexes, thumbnails,
+scrubbing proxies) are found again after files are renamed, moved to other
+folders or copied across mounts.
+
+A fingerprint hashes the file size and a few fixed-size blocks: the head,
+the tail and blocks spaced evenly in between. Reading them costs the same
+on a 50 MB and a 50 GB file. Edits that keep the size and touch none of
+the sampled blocks go unnoticed, which does not happen to media in
+practice: re-encodes, remuxes and metadata edits change the size, the
+header or the index at the tail.
+
+Fingerprints are memoized by (device, inode, size, mtime): a file that was
+only renamed or moved within its file system is not read again.
+
+Key Classes:
+- FileIdentity: Memoizing fingerprint service
+
+Key Functions:
+- fingerprint(): Hex digest of the sampled content of a file
+
+Dependencies:
+- xxhash (optional): XXH3 128-bit hashing, blake2b from hashlib otherwise
+"""
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+try:
+    import xxhash
+except ImportError:
+    # Optional: blake2b is slower, but the samples are small
+    xxhash = None
+
+# Bytes read per sample and number of samples (head and tail included)
+BLOCK_SIZE = 64 * 1024
+SAMPLES = 8
+
+
+def _hasher():
+    """
+    Returns a new 128-bit hash object, XXH3 when available.
+    """
+    if xxhash is not None:
+        return xxhash.xxh3_128()
+    return hashlib.blake2b(digest_size=16)
+
+
+def fingerprint(fPath, blockSize=BLOCK_SIZE, samples=SAMPLES):
+    """
+    Hashes the size and sampled blocks of a file.
+
+    Args:
+        fPath (str): Path of a local file
+        blockSize (int): Bytes per sample
+        samples (int): Number of samples, at least 2 (head and tail)
+
+    Returns:
+        str: Hex digest; files no larger than the samples are hashed whole
+    """
+    h = _hasher()
+    with open(fPath, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        h.update(size.to_bytes(8, "little"))
+        if size <= blockSize * samples:
+            h.update(f.read())
+            return h.hexdigest()
+        # head, tail and evenly spaced interior blocks
+        step = (size - blockSize) / (samples - 1)
+        for i in range(samples):
+            f.seek(int(i * step))
+            h.update(f.read(blockSize))
+    return h.hexdigest()
+
+
+# ===============================================================================
+# FileIdentity- Memoized content fingerprints
+# ===============================================================================
+class FileIdentity(object):
+    """
+    Content fingerprints of files, memoized by (device, inode, size, mtime).
+
+    Attributes:
+    - maxEntries: Most fingerprints memoized
+    - hits, misses: Usage counters
+    """
+    __shared = None
+    __sharedLock = threading.Lock()
+
+    def __init__(self, maxEntries=4096):
+        """
+        Args:
+            maxEntries (int): Most fingerprints memoized
+        """
+        self.maxEntries = maxEntries
+        self.__lock = threading.Lock()
+        self.__memo = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def shared(cls):
+        """
+        Returns the service shared by everything in this process.
+        """
+        with cls.__sharedLock:
+            if cls.__shared is None:
+                cls.__shared = cls()
+            return cls.__shared
+
+    def fingerprint(self, fPath):
+        """
+        Returns the content fingerprint of a local file.
+
+        Args:
+            fPath (str): Path of the file
+
+        Returns:
+            str: Hex digest (see fingerprint())
+
+        Raises:
+            OSError: The file cannot be read
+        """
+        st = os.stat(fPath)
+        stamp = (st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns)
+        with self.__lock:
+            digest = self.__memo.get(stamp)
+            if digest is not None:
+                self.__memo.move_to_end(stamp)
+                self.hits += 1
+                return digest
+            self.misses += 1
+        # Read outside the lock: other files need not wait for this one
+        digest = fingerprint(fPath)
+        with self.__lock:
+            self.__memo[stamp] = digest
+            while len(self.__memo) > self.maxEntries:
+                self.__memo.popitem(last=False)
+        return digest
+
+    def clear(self):
+        """
+        Forgets every memoized fingerprint (counters are kept).
+        """
+        with self.__lock:
+            self.__memo.clear()
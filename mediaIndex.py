@@ -0,0 +1,270 @@
+"""
+mediaIndex.py - Packet/Keyframe Index for Fast Preview Seeking
+
+This module builds, once per media file, an index of every video packet
+holding its presentation timestamp, byte offset and keyframe flag. The index
+is persisted in the user cache so later sessions load it instantly.
+
+Preview extraction uses it to:
+- Convert hover times to frame numbers through real PTS values (correct on
+  variable frame rate files, unlike duration * fps estimates)
+- Seek straight to the nearest keyframe, or decode a known short run from one,
+  instead of letting OpenCV decode from an unknown keyframe on every hover
+
+Key Classes:
+- KeyframeIndex: Sorted packet table with time/frame/keyframe lookups
+- IndexBuilder: QObject that loads or builds an index on a QThread
+
+Dependencies:
+- ffprobe: Packet listing without decoding
+- numpy: Compact packet table storage
+- PyQt6: Signals for background building
+"""
+
+import os.path
+import subprocess
+from array import array
+import numpy as np
+from PyQt6.QtCore import pyqtSignal
+from PyQt6.QtCore import QObject
+from cacheTools import cacheDirectory
+from cacheTools import fileKey
+from cacheTools import touchEntry
+from cacheTools import trimCache
+import logging
+logger = logging.getLogger(__name__)
+
+
+# ===============================================================================
+# KeyframeIndex- Packet table of a video stream in presentation order
+# ===============================================================================
+class KeyframeIndex(object):
+    """
+    Packet table of the first video stream of a media file.
+
+    Packets are kept sorted by presentation time, so a packet's row number is
+    its frame number. Row numbers are not the frame numbers OpenCV seeks to
+    (those assume a constant nominal fps): seek by pts instead.
+
+    Attributes:
+    - pts: Presentation time of each frame in seconds
+    - pos: Byte offset of each packet in the file (-1 when unknown)
+    - key: Keyframe flag of each frame
+    - keyframes: Frame numbers of all keyframes
+    """
+
+    def __init__(self, pts, pos, key):
+        """
+        Initialize an index from packet columns.
+
+        Args:
+            pts (numpy.ndarray): Presentation times in seconds
+            pos (numpy.ndarray): Byte offsets
+            key (numpy.ndarray): Keyframe flags
+        """
+        # Presentation order so that row number == frame number
+        order = np.argsort(pts, kind="stable")
+        self.pts = np.asarray(pts, dtype=np.float64)[order]
+        self.pos = np.asarray(pos, dtype=np.int64)[order]
+        self.key = np.asarray(key, dtype=bool)[order]
+        self.keyframes = np.flatnonzero(self.key)
+        if not len(self.keyframes) and len(self.pts):
+            # Treat the first frame as a keyframe so lookups stay defined
+            self.keyframes = np.array([0])
+
+    @property
+    def frameCount(self):
+        """
+        Number of frames in the index.
+        """
+        return len(self.pts)
+
+    @property
+    def gopLength(self):
+        """
+        Average number of frames between two keyframes.
+        """
+        return self.frameCount / max(len(self.keyframes), 1)
+
+    @staticmethod
+    def cachePath(fPath):
+        """
+        Path of the persisted index of a media file.
+        """
+        return os.path.join(cacheDirectory("index"), fileKey(fPath) + ".npz")
+
+    @classmethod
+    def build(cls, fPath):
+        """
+        Builds the index by listing the packets of the first video stream.
+
+        Args:
+            fPath (str): Path to video file
+
+        Returns:
+            KeyframeIndex: The index, or None if probing failed
+
+        Uses ffprobe, which reads the packet headers without decoding frames.
+        Its CSV listing is parsed line by line as it arrives: as a single
+        document, the packets of a long recording would not fit in memory.
+        """
+        args = ["ffprobe", "-v", "error", "-select_streams", "v:0",
+                "-show_entries", "packet=pts_time,pos,flags",
+                "-of", "csv=p=0", fPath]
+        try:
+            process = subprocess.Popen(args, stdout=subprocess.PIPE,
+                                       stderr=subprocess.PIPE, text=True)
+        except OSError as ex:
+            logger.warning(f"Could not index {fPath}: {ex}")
+            return None
+        pts, pos, key = array("d"), array("q"), array("b")
+        with process:
+            # Fields come in ffprobe's order: pts_time,pos,flags
+            for line in process.stdout:
+                fields = line.strip().split(",")
+                # Packets without a timestamp cannot be addressed
+                if len(fields) < 3 or fields[0] == "N/A":
+                    continue
+                pts.append(float(fields[0]))
+                pos.append(int(fields[1]) if fields[1] != "N/A" else -1)
+                key.append("K" in fields[2])
+            err = process.stderr.read()
+        if process.returncode:
+            logger.warning(f"Could not index {fPath}: {err.strip()}")
+            return None
+        if not pts:
+            return None
+        return cls(pts, pos, key)
+
+    @classmethod
+    def load(cls, fPath):
+        """
+        Loads the persisted index of a media file.
+
+        Returns:
+            KeyframeIndex: The cached index, or None if not indexed yet
+        """
+        path = cls.cachePath(fPath)
+        if not os.path.exists(path):
+            return None
+        touchEntry(path)
+        try:
+            with np.load(path) as data:
+                return cls(data["pts"], data["pos"], data["key"])
+        except (OSError, ValueError, KeyError) as ex:
+            logger.warning(f"Discarding unreadable index {path}: {ex}")
+            return None
+
+    @classmethod
+    def forFile(cls, fPath):
+        """
+        Returns the index of a local media file, building it once if needed.
+
+        Args:
+            fPath (str): Path to video file
+
+        Returns:
+            KeyframeIndex: The index, or None for network/unreadable media
+        """
+        # Indexing a network stream would download all of it
+        if not os.path.isfile(fPath):
+            return None
+        index = cls.load(fPath)
+        if index is None:
+            index = cls.build(fPath)
+            if index is not None:
+                index.save(fPath)
+        return index
+
+    def save(self, fPath):
+        """
+        Persists the index in the user cache, within its disk budget.
+        """
+        path = self.cachePath(fPath)
+        try:
+            np.savez(path, pts=self.pts, pos=self.pos, key=self.key)
+        except OSError as ex:
+            logger.warning(f"Could not save index for {fPath}: {ex}")
+            return
+        trimCache("index", keep=[path])
+
+    def frameAt(self, ms):
+        """
+        Converts a time to the frame displayed at that time.
+
+        Args:
+            ms (float): Time in milliseconds from the start of the stream
+
+        Returns:
+            int: Frame number
+        """
+        # Streams may not start at zero (e.g. transport streams)
+        t = self.pts[0] + ms/1000
+        frame = int(np.searchsorted(self.pts, t, side="right")) - 1
+        return min(max(frame, 0), self.frameCount - 1)
+
+    def timeAt(self, frame):
+        """
+        Converts a frame number to its time in milliseconds from the start
+        of the stream.
+        """
+        frame = min(max(int(frame), 0), self.frameCount - 1)
+        return (self.pts[frame] - self.pts[0]) * 1000
+
+    def keyframeBefore(self, frame):
+        """
+        Returns the last keyframe at or before a frame.
+        """
+        i = int(np.searchsorted(self.keyframes, frame, side="right")) - 1
+        return int(self.keyframes[max(i, 0)])
+
+    def keyframeAfter(self, frame):
+        """
+        Returns the first keyframe at or after a frame (last one if none).
+        """
+        i = int(np.searchsorted(self.keyframes, frame, side="left"))
+        return int(self.keyframes[min(i, len(self.keyframes) - 1)])
+
+    def nearestKeyframe(self, frame):
+        """
+        Returns the keyframe closest in time to a frame.
+        """
+        before = self.keyframeBefore(frame)
+        after = self.keyframeAfter(frame)
+        t = self.pts[min(max(int(frame), 0), self.frameCount - 1)]
+        if abs(self.pts[after] - t) < abs(t - self.pts[before]):
+            return after
+        return before
+
+
+# ===============================================================================
+# IndexBuilder- Loads or builds a KeyframeIndex off the GUI thread
+# ===============================================================================
+class IndexBuilder(QObject):
+    """
+    Loads or builds the KeyframeIndex of a file; meant to be moved to a QThread.
+
+    Signals:
+    - indexReady(str, object): Emitted with the file path and its index
+    - finished(): Emitted when the work is done
+    """
+
+    indexReady = pyqtSignal(str, object)
+    finished = pyqtSignal()
+
+    def __init__(self, fPath):
+        """
+        Args:
+            fPath (str): Path to video file
+        """
+        super().__init__()
+        self.fPath = fPath
+
+    def run(self):
+        """
+        Loads the cached index or builds it, then emits it.
+        """
+        index = KeyframeIndex.forFile(self.fPath)
+        if index is not None:
+            self.indexReady.emit(self.fPath, index)
+        self.finished.emit()
@@ -0,0 +1,598 @@
+"""
+mediaLibrary.py - Incremental Index of Local Media Folders
+
+This module keeps an on-disk index of the media files below the folders
+configured as library roots, so that large collections can be browsed and
+queued without walking the file system, and keeps it current from inotify
+events while the player runs.
+
+The index is an SQLite database in the user cache with one row per folder
+(path, parent, modification time) and one per media file (folder, name,
+size, modification time). Probed metadata (duration, resolution, codec) is
+kept by the MetadataCache under the same (path, size, mtime) identity, and
+filled for new files in the background.
+
+Rescans are incremental: a folder whose modification time is unchanged has
+had no entry added, removed or renamed, so only its known subfolders are
+visited and it is not listed again. A rescan of an unchanged library costs
+one stat() per folder. Files rewritten in place (same name) do not change
+their folder; they are picked up by the watcher while running, and probed
+metadata is re-validated against size and mtime on use in any case.
+
+Key Classes:
+- Inotify: Minimal ctypes binding of the Linux inotify API
+- MediaLibrary: SQLite index of the media files below the library roots
+- LibraryWatcher: Rescans the roots, then applies inotify events to the index
+
+Dependencies:
+- sqlite3: Storage
+- ctypes: inotify (Linux only; elsewhere the index is updated on rescans)
+- PyQt6: QObject worker and signals
+"""
+
+import ctypes
+import ctypes.util
+import errno
+import os
+import select
+import sqlite3
+import struct
+import threading
+from PyQt6.QtCore import QObject
+from PyQt6.QtCore import pyqtSignal
+from cacheTools import cacheDirectory
+from processTools import BatchProber
+import logging
+logger = logging.getLogger(__name__)
+
+# File extensions indexed as media
+MEDIA_EXTENSIONS = frozenset((
+    ".mp4", ".m4v", ".mov", ".mkv", ".webm", ".avi", ".flv", ".wmv",
+    ".mpg", ".mpeg", ".ts", ".mts", ".m2ts", ".3gp", ".ogv"))
+
+
+def isMedia(name):
+    """
+    Returns whether a file name has a media extension.
+    """
+    return os.path.splitext(name)[1].lower() in MEDIA_EXTENSIONS
+
+
+# ===============================================================================
+# Inotify- ctypes binding of the Linux inotify API
+# ===============================================================================
+class Inotify(object):
+    """
+    Watches folders for entries created, deleted, moved or written.
+
+    Events are (watch descriptor, mask, cookie, name) tuples; the masks are
+    those of <sys/inotify.h>.
+    """
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_FROM = 0x00000040
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+    IN_DELETE_SELF = 0x00000400
+    IN_MOVE_SELF = 0x00000800
+    IN_Q_OVERFLOW = 0x00004000
+    IN_IGNORED = 0x00008000
+    IN_ONLYDIR = 0x01000000
+    IN_ISDIR = 0x40000000
+    # inotify_init1 flags (same values as O_NONBLOCK and O_CLOEXEC)
+    IN_NONBLOCK = 0o4000
+    IN_CLOEXEC = 0o2000000
+
+    # What the library needs to know about a folder
+    FOLDER_EVENTS = (IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE
+                     | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR)
+
+    __header = struct.Struct("iIII")
+    __libc = None
+
+    @classmethod
+    def available(cls):
+        """
+        Returns whether the C library provides inotify.
+        """
+        if cls.__libc is None:
+            name = ctypes.util.find_library("c")
+            try:
+                libc = ctypes.CDLL(name, use_errno=True)
+                libc.inotify_init1
+            except (OSError, AttributeError, TypeError):
+                libc = False
+            cls.__libc = libc
+        return bool(cls.__libc)
+
+    def __init__(self):
+        if not self.available():
+            raise OSError(errno.ENOSYS, "inotify is not available")
+        self.fd = self.__libc.inotify_init1(self.IN_NONBLOCK | self.IN_CLOEXEC)
+        if self.fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err))
+
+    def fileno(self):
+        return self.fd
+
+    def addWatch(self, path, mask=FOLDER_EVENTS):
+        """
+        Watches a folder; raises OSError (ENOSPC once fs.inotify.max_user_watches
+        is reached).
+
+        Returns:
+            int: Watch descriptor the events of the folder carry
+        """
+        wd = self.__libc.inotify_add_watch(self.fd, os.fsencode(path), mask)
+        if wd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err), path)
+        return wd
+
+    def removeWatch(self, wd):
+        self.__libc.inotify_rm_watch(self.fd, wd)
+
+    def read(self, timeout=None):
+        """
+        Waits for events.
+
+        Args:
+            timeout (float): Seconds to wait at most, None to block
+
+        Returns:
+            list: (wd, mask, cookie, name) of the events, empty on timeout
+        """
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return []
+        try:
+            data = os.read(self.fd, 65536)
+        except BlockingIOError:
+            return []
+        events = []
+        offset = 0
+        while offset < len(data):
+            wd, mask, cookie, length = self.__header.unpack_from(data, offset)
+            offset += self.__header.size
+            name = data[offset:offset + length].rstrip(b"\0")
+            offset += length
+            events.append((wd, mask, cookie, os.fsdecode(name)))
+        return events
+
+    def close(self):
+        os.close(self.fd)
+
+
+# ===============================================================================
+# MediaLibrary- SQLite index of the media below the library roots
+# ===============================================================================
+class MediaLibrary(object):
+    """
+    Folders and media files below the library roots.
+
+    Safe to use from several threads: writes happen one folder per
+    transaction, so lookups from the GUI thread wait at most for one folder.
+
+    Attributes:
+    - path: Location of the database file
+    """
+    __shared = None
+    __sharedLock = threading.Lock()
+
+    def __init__(self, path=None):
+        """
+        Args:
+            path (str): Database file, by default in the user cache
+        """
+        self.path = path or os.path.join(cacheDirectory("library"),
+                                         "library.sqlite3")
+        # One connection for all threads, serialized by the lock
+        self.__lock = threading.RLock()
+        self.__db = sqlite3.connect(self.path, check_same_thread=False)
+        self.__db.execute("PRAGMA journal_mode=WAL")
+        self.__db.execute("PRAGMA synchronous=NORMAL")
+        self.__db.execute(
+            "CREATE TABLE IF NOT EXISTS dirs ("
+            "id INTEGER PRIMARY KEY, path TEXT UNIQUE, parent INTEGER, "
+            "mtime INTEGER)")
+        self.__db.execute(
+            "CREATE INDEX IF NOT EXISTS dirsParent ON dirs (parent)")
+        # Names only, the folder path is stored once
+        self.__db.execute(
+            "CREATE TABLE IF NOT EXISTS files ("
+            "dir INTEGER, name TEXT, size INTEGER, mtime INTEGER, "
+            "PRIMARY KEY (dir, name)) WITHOUT ROWID")
+        self.__db.commit()
+
+    @classmethod
+    def shared(cls):
+        """
+        Returns the library shared by everything in this process, or None if
+        the database cannot be opened.
+        """
+        with cls.__sharedLock:
+            if cls.__shared is None:
+                try:
+                    cls.__shared = cls()
+                except sqlite3.Error as ex:
+                    logger.warning(f"Media library unavailable: {ex}")
+                    return None
+            return cls.__shared
+
+    def roots(self):
+        """
+        Returns the indexed library roots, sorted.
+        """
+        with self.__lock:
+            rows = self.__db.execute(
+                "SELECT path FROM dirs WHERE parent IS NULL ORDER BY path")
+            return [path for path, in rows]
+
+    def children(self, folder):
+        """
+        Returns the content of a folder as indexed.
+
+        Args:
+            folder (str): Absolute path of an indexed folder
+
+        Returns:
+            tuple: (subfolder paths, [(file path, size, mtime)]), both sorted
+        """
+        with self.__lock:
+            row = self.__db.execute(
+                "SELECT id FROM dirs WHERE path = ?", (folder,)).fetchone()
+            if row is None:
+                return [], []
+            folders = [path for path, in self.__db.execute(
+                "SELECT path FROM dirs WHERE parent = ? ORDER BY path", row)]
+            files = [(os.path.join(folder, name), size, mtime)
+                     for name, size, mtime in self.__db.execute(
+                         "SELECT name, size, mtime FROM files WHERE dir = ? "
+                         "ORDER BY name", row)]
+        return folders, files
+
+    def filesUnder(self, folder):
+        """
+        Returns the paths of every media file in and below a folder, sorted.
+        """
+        with self.__lock:
+            rows = self.__db.execute(
+                "SELECT dirs.path, files.name FROM files "
+                "JOIN dirs ON files.dir = dirs.id "
+                # '0' follows '/': a range scan over the subtree
+                "WHERE dirs.path = ? OR (dirs.path >= ? AND dirs.path < ?) "
+                "ORDER BY dirs.path, files.name",
+                (folder, folder + "/", folder + "0")).fetchall()
+        return [os.path.join(path, name) for path, name in rows]
+
+    def folders(self, root):
+        """
+        Returns the paths of a root and every folder below it.
+        """
+        with self.__lock:
+            rows = self.__db.execute(
+                "SELECT path FROM dirs WHERE path = ? "
+                "OR (path >= ? AND path < ?)", (root, root + "/", root + "0"))
+            return [path for path, in rows]
+
+    def count(self):
+        """
+        Returns the number of media files indexed.
+        """
+        with self.__lock:
+            return self.__db.execute("SELECT COUNT(*) FROM files").fetchone()[0]
+
+    def addRoot(self, root):
+        """
+        Adds a library root (indexed by the next scan).
+        """
+        root = os.path.abspath(root)
+        with self.__lock, self.__db:
+            self.__db.execute(
+                "INSERT OR IGNORE INTO dirs (path, parent, mtime) "
+                "VALUES (?, NULL, -1)", (root,))
+
+    def removeRoot(self, root):
+        """
+        Forgets a library root and everything below it.
+        """
+        self.removeFolder(os.path.abspath(root))
+
+    def removeFolder(self, folder):
+        """
+        Forgets a folder and everything below it.
+        """
+        with self.__lock, self.__db:
+            ids = "SELECT id FROM dirs WHERE path = ? OR (path >= ? AND path < ?)"
+            args = (folder, folder + "/", folder + "0")
+            self.__db.execute(f"DELETE FROM files WHERE dir IN ({ids})", args)
+            self.__db.execute(f"DELETE FROM dirs WHERE id IN ({ids})", args)
+
+    def updateFile(self, folder, name):
+        """
+        Indexes, re-indexes or forgets one file after a change.
+
+        Returns:
+            bool: Whether the file is indexed now
+        """
+        fPath = os.path.join(folder, name)
+        try:
+            st = os.stat(fPath)
+        except OSError:
+            st = None
+        with self.__lock, self.__db:
+            row = self.__db.execute(
+                "SELECT id FROM dirs WHERE path = ?", (folder,)).fetchone()
+            if row is None:
+                return False
+            if st is None or not isMedia(name):
+                self.__db.execute("DELETE FROM files WHERE dir = ? AND name = ?",
+                                  (row[0], name))
+                return False
+            self.__db.execute("INSERT OR REPLACE INTO files VALUES (?,?,?,?)",
+                              (row[0], name, st.st_size, st.st_mtime_ns))
+        return True
+
+    def scan(self, root, stop=None):
+        """
+        Brings the index of a folder tree up to date.
+
+        Folders whose modification time matches the index are not listed;
+        only their known subfolders are visited.
+
+        Args:
+            root (str): Library root (or any indexed folder) to rescan
+            stop (callable): Returns True to abandon the scan
+
+        Returns:
+            tuple: (folders whose content changed, media files added or
+                    changed since the last scan)
+        """
+        root = os.path.abspath(root)
+        changed, newFiles = [], []
+        # A folder not indexed yet becomes a root
+        self.addRoot(root)
+        pending = [root]
+        while pending:
+            if stop is not None and stop():
+                break
+            folder = pending.pop()
+            subfolders = self.__scanFolder(folder, changed, newFiles)
+            pending.extend(reversed(subfolders))
+        return changed, newFiles
+
+    def __scanFolder(self, folder, changed, newFiles):
+        """
+        Rescans one folder if it changed; returns the subfolders to visit.
+        """
+        with self.__lock:
+            folderId, parent, known = self.__db.execute(
+                "SELECT id, parent, mtime FROM dirs WHERE path = ?",
+                (folder,)).fetchone()
+        try:
+            mtime = os.stat(folder).st_mtime_ns
+        except OSError:
+            if parent is None:
+                # A root offline (e.g. unmounted): keep its index
+                return []
+            # Gone (or unreadable) since it was indexed
+            self.removeFolder(folder)
+            changed.append(os.path.dirname(folder))
+            return []
+        if mtime == known:
+            with self.__lock:
+                return [path for path, in self.__db.execute(
+                    "SELECT path FROM dirs WHERE parent = ? ORDER BY path",
+                    (folderId,))]
+        # Listed: stat the media files, collect the subfolders
+        files, subfolders = {}, []
+        try:
+            with os.scandir(folder) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if not entry.name.startswith("."):
+                                subfolders.append(entry.path)
+                        elif isMedia(entry.name) and entry.is_file():
+                            st = entry.stat()
+                            files[entry.name] = (st.st_size, st.st_mtime_ns)
+                    except OSError:
+                        continue
+        except OSError as ex:
+            logger.warning(f"Could not list {folder}: {ex}")
+            return []
+        subfolders.sort()
+        with self.__lock, self.__db:
+            indexed = {name: (size, mt) for name, size, mt in self.__db.execute(
+                "SELECT name, size, mtime FROM files WHERE dir = ?", (folderId,))}
+            gone = [(folderId, n) for n in indexed if n not in files]
+            self.__db.executemany(
+                "DELETE FROM files WHERE dir = ? AND name = ?", gone)
+            fresh = [(folderId, n, *files[n]) for n in files
+                     if indexed.get(n) != files[n]]
+            self.__db.executemany(
+                "INSERT OR REPLACE INTO files VALUES (?,?,?,?)", fresh)
+            knownFolders = [path for path, in self.__db.execute(
+                "SELECT path FROM dirs WHERE parent = ?", (folderId,))]
+            self.__db.executemany(
+                "INSERT OR IGNORE INTO dirs (path, parent, mtime) "
+                "VALUES (?, ?, -1)", [(p, folderId) for p in subfolders])
+            self.__db.execute("UPDATE dirs SET mtime = ? WHERE id = ?",
+                              (mtime, folderId))
+        for path in set(knownFolders) - set(subfolders):
+            self.removeFolder(path)
+        newFiles.extend(os.path.join(folder, n) for _, n, _, _ in fresh)
+        if gone or fresh or set(knownFolders) != set(subfolders):
+            changed.append(folder)
+        return subfolders
+
+    def close(self):
+        """
+        Closes the database.
+        """
+        with self.__lock:
+            self.__db.close()
+
+
+# ===============================================================================
+# LibraryWatcher- Keeps the library index current
+# ===============================================================================
+class LibraryWatcher(QObject):
+    """
+    Rescans the library roots, probes new files, then applies inotify events
+    to the index until stopped; meant to be moved to a QThread.
+
+    Without inotify (other systems, or fs.inotify.max_user_watches reached)
+    the index is brought up to date by the rescan only.
+
+    Signals:
+    - folderChanged(str): Emitted with a folder whose content changed
+    - probed(str, object): Emitted with a file path and its MediaInfo
+    - finished(): Emitted when stopped
+    """
+
+    folderChanged = pyqtSignal(str)
+    probed = pyqtSignal(str, object)
+    finished = pyqtSignal()
+
+    # Background probes running at once: playback comes first
+    probeWorkers = 2
+    # Seconds between checks of the stop flag while waiting for events
+    pollInterval = 0.25
+
+    def __init__(self, library, roots):
+        """
+        Args:
+            library (MediaLibrary): Index to keep current
+            roots (list): Library root folders
+        """
+        super().__init__()
+        self.library = library
+        self.roots = [os.path.abspath(r) for r in roots]
+        self._stopped = False
+        self.__prober = None
+        self.__inotify = None
+        # watch descriptor <-> folder
+        self.__folders = {}
+        self.__watches = {}
+
+    def stop(self):
+        """
+        Stops the watcher; a scan in progress ends after its current folder.
+        """
+        self._stopped = True
+        if self.__prober is not None:
+            self.__prober.stop()
+
+    def run(self):
+        """
+        Rescans, probes, then watches until stopped.
+        """
+        stopped = lambda: self._stopped
+        newFiles = []
+        for root in self.roots:
+            changed, fresh = self.library.scan(root, stopped)
+            newFiles += fresh
+            for folder in changed:
+                self.folderChanged.emit(folder)
+        if Inotify.available() and not self._stopped:
+            try:
+                self.__inotify = Inotify()
+            except OSError as ex:
+                logger.warning(f"Library not watched: {ex}")
+        if self.__inotify is not None:
+            for root in self.roots:
+                for folder in self.library.folders(root):
+                    self.__watch(folder)
+        self.__probe(newFiles)
+        while not self._stopped and self.__inotify is not None:
+            events = self.__inotify.read(self.pollInterval)
+            if events:
+                self.__apply(events)
+        if self.__inotify is not None:
+            self.__inotify.close()
+        self.finished.emit()
+
+    def __probe(self, paths):
+        """
+        Fills the metadata cache for new files.
+        """
+        if not paths or self._stopped:
+            return
+        self.__prober = BatchProber(paths)
+        self.__prober.workers = self.probeWorkers
+        self.__prober.probed.connect(self.probed)
+        self.__prober.run()
+        self.__prober = None
+
+    def __watch(self, folder):
+        if folder in self.__watches:
+            return
+        try:
+            wd = self.__inotify.addWatch(folder)
+        except OSError as ex:
+            # ENOSPC: out of watches, the rest is only rescanned
+            logger.warning(f"Could not watch {folder}: {ex}")
+            return
+        self.__watches[folder] = wd
+        self.__folders[wd] = folder
+
+    def __unwatch(self, folder):
+        """
+        Forgets the watches of a folder tree gone from the index.
+        """
+        for path in list(self.__watches):
+            if path == folder or path.startswith(folder + "/"):
+                self.__folders.pop(self.__watches.pop(path), None)
+
+    def __apply(self, events):
+        """
+        Applies a batch of inotify events to the index.
+        """
+        changed, newFiles = set(), []
+        for wd, mask, cookie, name in events:
+            if mask & Inotify.IN_Q_OVERFLOW:
+                # Events were lost: rescan (stat only where unchanged)
+                for root in self.roots:
+                    folders, fresh = self.library.scan(root)
+                    changed.update(folders)
+                    newFiles += fresh
+                    for folder in self.library.folders(root):
+                        self.__watch(folder)
+                continue
+            folder = self.__folders.get(wd)
+            if folder is None:
+                continue
+            if mask & (Inotify.IN_DELETE_SELF | Inotify.IN_MOVE_SELF
+                       | Inotify.IN_IGNORED):
+                if mask & Inotify.IN_IGNORED:
+                    self.__folders.pop(wd, None)
+                    self.__watches.pop(folder, None)
+                continue
+            path = os.path.join(folder, name)
+            if mask & Inotify.IN_ISDIR:
+                if name.startswith("."):
+                    continue
+                if mask & (Inotify.IN_DELETE | Inotify.IN_MOVED_FROM):
+                    self.library.removeFolder(path)
+                    self.__unwatch(path)
+                elif mask & (Inotify.IN_CREATE | Inotify.IN_MOVED_TO):
+                    # A new (possibly populated) tree: the parent changed, so
+                    # it is listed, and so is the new tree; the rest is stat()
+                    folders, fresh = self.library.scan(folder)
+                    changed.update(folders)
+                    newFiles += fresh
+                    for sub in self.library.folders(path):
+                        self.__watch(sub)
+                changed.add(folder)
+            elif isMedia(name):
+                if mask & Inotify.IN_CREATE:
+                    # Still being written: indexed on IN_CLOSE_WRITE
+                    continue
+                if self.library.updateFile(folder, name):
+                    newFiles.append(path)
+                changed.add(folder)
+        self.__probe(list(dict.fromkeys(newFiles)))
+        for folder in sorted(changed):
+            self.folderChanged.emit(folder)
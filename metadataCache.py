@@ -0,0 +1,170 @@
+"""
+metadataCache.py - Persistent Cache of Media Metadata Probes
+
+This module keeps what probing a media file found (duration, frame count,
+frame rate, resolution and codec) in an SQLite database in the user cache,
+so opening the same libraries again skips probing altogether.
+
+Rows are keyed by absolute path and only served while the file's size and
+modification time are unchanged. The database runs in WAL mode: lookups from
+the GUI thread are never blocked by a worker thread storing new probes.
+
+Key Classes:
+- MediaInfo: Metadata of one media file
+- MetadataCache: SQLite table of MediaInfo with single and bulk lookups
+
+Dependencies:
+- sqlite3: Storage (json_each for bulk lookups)
+"""
+
+import json
+import os
+import sqlite3
+import threading
+from collections import namedtuple
+from cacheTools import cacheDirectory
+import logging
+logger = logging.getLogger(__name__)
+
+# Metadata of one media file; duration in seconds, codec as a FourCC string
+MediaInfo = namedtuple(
+    "MediaInfo", "duration frameCount fps width height codec")
+
+
+# ===============================================================================
+# MetadataCache- SQLite table of media metadata
+# ===============================================================================
+class MetadataCache(object):
+    """
+    Media metadata persisted per (path, size, modification time).
+
+    Only local files are cached: network URLs have no size or modification
+    time to tell a changed stream apart.
+
+    Attributes:
+    - path: Location of the database file
+    """
+    __shared = None
+    __sharedLock = threading.Lock()
+
+    def __init__(self, path=None):
+        """
+        Args:
+            path (str): Database file, by default in the user cache
+        """
+        self.path = path or os.path.join(cacheDirectory("metadata"),
+                                         "media.sqlite3")
+        # One connection for all threads, serialized by the lock
+        self.__lock = threading.Lock()
+        self.__db = sqlite3.connect(self.path, check_same_thread=False)
+        self.__db.execute("PRAGMA journal_mode=WAL")
+        # WAL stays consistent on a crash with NORMAL, fsync at checkpoints
+        self.__db.execute("PRAGMA synchronous=NORMAL")
+        self.__db.execute(
+            "CREATE TABLE IF NOT EXISTS media ("
+            "path TEXT PRIMARY KEY, size INTEGER, mtime INTEGER, "
+            "duration REAL, frameCount INTEGER, fps REAL, "
+            "width INTEGER, height INTEGER, codec TEXT)")
+        self.__db.commit()
+
+    @classmethod
+    def shared(cls):
+        """
+        Returns the cache shared by everything in this process, or None if
+        the database cannot be opened.
+        """
+        with cls.__sharedLock:
+            if cls.__shared is None:
+                try:
+                    cls.__shared = cls()
+                except sqlite3.Error as ex:
+                    logger.warning(f"Metadata cache unavailable: {ex}")
+                    return None
+            return cls.__shared
+
+    @staticmethod
+    def __identity(fPath):
+        """
+        Returns (absolute path, size, mtime) of a local file, or None.
+        """
+        try:
+            st = os.stat(fPath)
+        except (OSError, ValueError):
+            return None
+        return os.path.abspath(fPath), st.st_size, st.st_mtime_ns
+
+    def get(self, fPath):
+        """
+        Returns the cached metadata of a file.
+
+        Args:
+            fPath (str): Path of the media
+
+        Returns:
+            MediaInfo: The metadata, or None if not cached or out of date
+        """
+        return self.getMany([fPath]).get(fPath)
+
+    def getMany(self, paths):
+        """
+        Returns the cached metadata of many files with a single query.
+
+        Args:
+            paths (iterable): Paths of the media (e.g. a whole playlist)
+
+        Returns:
+            dict: Path -> MediaInfo for the files cached and unchanged
+        """
+        identities = {}
+        for fPath in paths:
+            identity = self.__identity(fPath)
+            if identity is not None:
+                identities[identity[0]] = (fPath, identity)
+        if not identities:
+            return {}
+        # Paths go in as one JSON array: no limit on bound parameters
+        with self.__lock:
+            rows = self.__db.execute(
+                "SELECT path, size, mtime, duration, frameCount, fps, width, "
+                "height, codec FROM media WHERE path IN "
+                "(SELECT value FROM json_each(?))",
+                (json.dumps(list(identities)),)).fetchall()
+        found = {}
+        for path, size, mtime, *info in rows:
+            fPath, identity = identities[path]
+            if identity == (path, size, mtime):
+                found[fPath] = MediaInfo(*info)
+        return found
+
+    def put(self, fPath, info):
+        """
+        Stores the metadata of a file.
+        """
+        self.putMany({fPath: info})
+
+    def putMany(self, infos):
+        """
+        Stores the metadata of many files in one transaction.
+
+        Args:
+            infos (dict): Path -> MediaInfo; network URLs are skipped
+        """
+        rows = []
+        for fPath, info in infos.items():
+            identity = self.__identity(fPath)
+            if identity is not None:
+                rows.append(identity + tuple(info))
+        if not rows:
+            return
+        with self.__lock:
+            with self.__db:
+                self.__db.executemany(
+                    "INSERT OR REPLACE INTO media VALUES (?,?,?,?,?,?,?,?,?)",
+                    rows)
+
+    def close(self):
+        """
+        Closes the database.
+        """
+        with self.__lock:
+            self.__db.close()
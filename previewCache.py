@@ -0,0 +1,162 @@
+"""
+previewCache.py - In-Memory LRU Cache of Preview Frames
+
+This module provides the PreviewCache class which keeps recently shown hover
+previews in memory so that moving back and forth over the same part of the
+seek slider does not decode the same frames again.
+
+Key Responsibilities:
+- Store preview QImages keyed by (file key, frame bucket)
+- Bound the cache by the total bytes of the stored images
+- Evict least recently used previews first
+- Count hits, misses and evictions
+- Hold leases on images that view shared buffers while they are cached
+- Stay consistent when shared by the GUI thread and the preview worker
+
+Dependencies:
+- collections.OrderedDict: Recency order of the entries
+- threading: Lock guarding the entries
+- PyQt6: QImage entries
+"""
+
+import threading
+from collections import OrderedDict
+
+
+# ===============================================================================
+# PreviewCache- Byte-budgeted LRU cache of preview frames
+# ===============================================================================
+class PreviewCache(object):
+    """
+    Least recently used cache of preview images with a byte budget.
+
+    Keys are (file key, frame bucket) tuples so entries of several files can
+    live side by side: switching back to a playlist item finds its previews.
+
+    Images may view buffers that are leased to them (see
+    processTools.ThumbnailRing): the lease put() is given is released when
+    the image leaves the cache, and get() takes a lease for its caller
+    while the entry cannot be evicted.
+
+    Attributes:
+    - maxBytes: Budget for the total size of the cached images
+    - currentBytes: Total size of the cached images
+    - hits, misses, evictions: Usage counters
+    - leases: retain(image)/release(image) provider, or None
+    """
+
+    def __init__(self, maxBytes=64*1024*1024, leases=None):
+        """
+        Args:
+            maxBytes (int): Budget for the total size of the cached images
+            leases: Provider of retain(image) and release(image), e.g.
+                    processTools.ThumbnailRing
+        """
+        self.maxBytes = maxBytes
+        self.leases = leases
+        self.__lock = threading.Lock()
+        self.__entries = OrderedDict()
+        self.currentBytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __contains__(self, key):
+        with self.__lock:
+            return key in self.__entries
+
+    def __len__(self):
+        return len(self.__entries)
+
+    def get(self, key):
+        """
+        Returns a cached preview and marks it as most recently used.
+
+        Args:
+            key (tuple): (file key, frame bucket)
+
+        Returns:
+            QImage: The cached preview (with a lease of its own), or None on
+                    a miss
+        """
+        with self.__lock:
+            qImg = self.__entries.get(key)
+            if qImg is None:
+                self.misses += 1
+                return None
+            self.__entries.move_to_end(key)
+            self.hits += 1
+            if self.leases is not None:
+                self.leases.retain(qImg)
+            return qImg
+
+    def put(self, key, qImg):
+        """
+        Adds a preview, evicting least recently used ones over budget.
+
+        Args:
+            key (tuple): (file key, frame bucket)
+            qImg (QImage): The preview image, its lease handed to the cache
+        """
+        size = qImg.sizeInBytes()
+        if size > self.maxBytes:
+            # Would evict everything else and still not fit
+            self.__release([qImg])
+            return
+        dropped = []
+        with self.__lock:
+            old = self.__entries.pop(key, None)
+            if old is not None:
+                self.currentBytes -= old.sizeInBytes()
+                dropped.append(old)
+            self.__entries[key] = qImg
+            self.currentBytes += size
+            while self.currentBytes > self.maxBytes:
+                _, evicted = self.__entries.popitem(last=False)
+                self.currentBytes -= evicted.sizeInBytes()
+                self.evictions += 1
+                dropped.append(evicted)
+        self.__release(dropped)
+
+    def discard(self, fileKey):
+        """
+        Drops every preview of a file.
+
+        Args:
+            fileKey (str): File key the previews were stored under
+        """
+        dropped = []
+        with self.__lock:
+            for key in [k for k in self.__entries if k[0] == fileKey]:
+                dropped.append(self.__entries.pop(key))
+                self.currentBytes -= dropped[-1].sizeInBytes()
+        self.__release(dropped)
+
+    def clear(self):
+        """
+        Drops every preview (counters are kept).
+        """
+        with self.__lock:
+            dropped = list(self.__entries.values())
+            self.__entries.clear()
+            self.currentBytes = 0
+        self.__release(dropped)
+
+    def __release(self, images):
+        """
+        Gives back the leases of images that left the cache.
+        """
+        if self.leases is not None:
+            for qImg in images:
+                self.leases.release(qImg)
+
+    def stats(self):
+        """
+        Returns the usage counters.
+
+        Returns:
+            dict: hits, misses, evictions, entries and bytes
+        """
+        return {"hits": self.hits, "misses": self.misses,
+                "evictions": self.evictions, "entries": len(self.__entries),
+                "bytes": self.currentBytes}
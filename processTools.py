@@ -9,18 +9,31 @@ This module provides utilities for video and audio file processing including:
 
 Key Classes:
 - ExtractImages: Multi-threaded frame extraction from videos
+- ReelExtractor: Reel extraction in a process pool through shared memory
+- ThumbnailRing: Reusable preallocated thumbnail buffers
 - PreviewPosition: Single frame extraction for timeline previews
+- PreviewWorker: Latest-request-wins preview decoding on a worker thread
+- BatchProber: Parallel metadata probing of many files
 - SelectionLine: Graphics line item for timeline playhead
 
 Key Functions:
+- decodeThumbnail(): Decode one frame already scaled to thumbnail size
+- extractReelRange(): Process pool task of ReelExtractor
+- sequentialReadCheaper(): Measure whether streaming beats seeking
+- keyframesCheaper(): Measure whether exact frames cost many keyframes
+- readSequential(): Stream through a file decoding only target frames
+- readKeyframes(): Decode only the keyframes closest to target frames
 - extractAudio(): Extract audio from video file
+- probeMedia(): Read duration, frame count, rate, resolution and codec
+- mediaInfo(), mediaInfoMany(): Metadata through the persistent cache
 - checkDuration(): Get video duration, frame count, and frame rate
 - checkDurationAudio(): Get audio file duration
 - browseChildren(): (Defined in MyNetworkTree)
 
 Processing Libraries:
 - cv2 (OpenCV): Video file reading and frame extraction
-- ffmpeg: Audio extraction
+- ffmpeg: Audio extraction, reduced-resolution thumbnail decoding
+- av (PyAV, optional): Keyframe-only decoding for reels
 - PyQt6: GUI components and signals
 
 Note: This module handles heavy I/O operations and is often used with threading
@@ -37,9 +50,32 @@ from PyQt6.QtGui import QPen
 from PyQt6.QtWidgets import QApplication
 import cv2
 import math
+import shutil
+import time
+import threading
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures import as_completed
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import get_context, shared_memory
 # import win32com.client
 import os.path
 import ffmpeg
+from thumbnailStore import ThumbnailStore
+from cacheTools import fileKey
+from mediaIndex import KeyframeIndex
+from spriteSheet import SpriteTrack
+from scrubProxy import cachedProxy
+from capturePool import CapturePool
+from metadataCache import MediaInfo
+from metadataCache import MetadataCache
+from containerHeaders import readHeaders
+from containerHeaders import transportStreamDuration
+try:
+    import av
+except ImportError:
+    # Optional: keyframe-only reels then locate keyframes with the index
+    av = None
 import logging
 logger = logging.getLogger(__name__)
 
@@ -59,7 +95,8 @@ class ExtractImages(QObject):
     QImage objects for display in a thumbnail strip.
 
     Signals:
-    - reelImage(QImage, int): Emitted when a frame is extracted
+    - reelImage(QImage, int): Emitted when a frame is extracted (leasing a
+      ring buffer, see ThumbnailRing.release)
     - finished(): Emitted when extraction for this thread is complete
     - over(int): Emitted when thread finishes with thread index
 
@@ -70,13 +107,18 @@ class ExtractImages(QObject):
     - capture: OpenCV VideoCapture object
     - frameCount: Total frames in video
     - frameInterval: Spacing between extracted frames
+    - scaledDecode: Whether thumbnails are decoded scaled by ffmpeg
+    - sequential: Whether the file is streamed once instead of seeked
+    - keyframesOnly: Whether the nearest keyframe stands in for each frame
     """
 
+    # Sources at least this tall are decoded scaled (see decodeThumbnail)
+    scaledDecodeHeight = 1080
     reelImage = pyqtSignal(QImage, int)  # Signal: extracted frame and position
     finished = pyqtSignal()  # Signal: thread finished extracting
     over = pyqtSignal(int)  # Signal: thread finished with position index
 
-    def __init__(self, fPath, split, pos):
+    def __init__(self, fPath, split, pos, keyframesOnly=None):
         """
         Initialize frame extractor for a video file.
 
@@ -84,12 +126,17 @@ class ExtractImages(QObject):
             fPath (str): Path to video file
             split (int): Number of parallel extraction threads
             pos (int): This thread's index (0 to split-1)
+            keyframesOnly (bool): Decode only the keyframe closest to each
+                                  reel frame (much faster on long GOPs),
+                                  None to measure (see keyframesCheaper)
         """
         super().__init__()
         self.fPath = fPath
         self.split = split
         self.pos = pos
+        self.keyframesOnly = keyframesOnly
         self._readVideo = False
+        self._stopped = False
 
     def baselineRead(self):
         """
@@ -100,8 +147,8 @@ class ExtractImages(QObject):
         - Frame width and height (for aspect ratio)
         - Frame interval for equally-spaced extraction
         """
-        # Open video file with OpenCV
-        self.capture = cv2.VideoCapture(self.fPath)
+        # Open video file with OpenCV (or reuse an idle handle)
+        self.capture = CapturePool.shared().acquire(self.fPath)
         # Get total number of frames in video
         self.frameCount = int(self.capture.get(cv2.CAP_PROP_FRAME_COUNT))
         # Get video resolution
@@ -109,32 +156,106 @@ class ExtractImages(QObject):
         fH = int(self.capture.get(cv2.CAP_PROP_FRAME_HEIGHT))
         # Calculate aspect ratio for thumbnail resizing
         self.r = fW / fH
+        self.fps = self.capture.get(cv2.CAP_PROP_FPS)
+        self.sourceHeight = fH
+        # Large frames are scaled while decoding instead of after
+        self.scaledDecode = (fH >= self.scaledDecodeHeight and bool(self.fps)
+                             and ffmpegAvailable())
+        # Reusable thumbnail buffers
+        self._ring = ThumbnailRing(int(self.r * 80), 80)
         # Calculate interval between frames to extract ~100 thumbnails
         self.frameInterval = math.ceil(self.frameCount / 100)
+        gop = gopOf(self.fPath)
+        if self.keyframesOnly is None:
+            self.keyframesOnly = keyframesCheaper(self.capture,
+                                                  self.frameInterval, gop)
+        # Keyframes are found by PyAV's decoder, else by the keyframe index
+        self._keyIndex = None
+        if self.keyframesOnly and av is None:
+            self._keyIndex = KeyframeIndex.forFile(self.fPath)
+            self.keyframesOnly = self._keyIndex is not None
+        # Stream through the file when seeking costs more than decoding
+        # the frames between two targets (each thread streams its own
+        # contiguous part of the reel, see targets())
+        self.sequential = (not self.scaledDecode and not self.keyframesOnly
+                           and sequentialReadCheaper(
+                               self.capture, self.frameInterval, gop))
         # Mark that video info has been read
         self._readVideo = True
 
+    def stop(self):
+        """
+        Asks a running extraction to stop after the current frame.
+        Thread-safe (a plain flag read by run()).
+        """
+        self._stopped = True
+
+    def positionMs(self, pos):
+        """
+        Returns the media time of a position emitted by reelImage.
+
+        Args:
+            pos (int): Sequential position of an extracted frame
+
+        Returns:
+            float: Time of the frame in milliseconds
+        """
+        return pos * self.frameInterval / self.fps * 1000 if self.fps else 0.0
+
+    def targets(self):
+        """
+        Returns the frame numbers this thread extracts.
+
+        Seeking threads take every split-th reel frame, starting at their
+        position, so the reel fills in evenly. Streaming threads take a
+        contiguous part of the reel instead: strided, each of them would
+        decode the whole file.
+
+        Returns:
+            range: Ascending frame numbers
+        """
+        if not self.sequential:
+            # Stride by (frameInterval * split) to distribute work across threads
+            return range(self.pos*self.frameInterval, self.frameCount,
+                         self.frameInterval*self.split)
+        positions = range(0, self.frameCount, self.frameInterval)
+        return positions[len(positions)*self.pos//self.split:
+                         len(positions)*(self.pos + 1)//self.split]
+
     def _transmitFrame(self, frame, pos):
         """
-        Converts an OpenCV frame to QImage and emits it.
+        Converts an OpenCV frame to a thumbnail QImage and emits it.
 
         Args:
             frame (numpy.ndarray): OpenCV frame in BGR888 format
             pos (int): Frame position in sequence
 
-        Resizes frame to thumbnail size while maintaining aspect ratio
-        and emits it through the reelImage signal.
+        Resizes frame to thumbnail size while maintaining aspect ratio through a
+        reusable ring buffer and emits it through the reelImage signal.
+        Frames decoded scaled already sit in a ring buffer.
         """
-        # Get frame dimensions
-        height, width, channel = frame.shape
-        # Calculate bytes per line for QImage (3 channels * width)
-        bytesPerLine = 3 * width
-        # Convert OpenCV BGR frame to QImage
-        qImg = QImage(frame.data, width, height,
-                      bytesPerLine, QImage.Format.Format_BGR888)
-        # Scale to thumbnail size (80px height, maintain aspect ratio)
-        self.reelImage.emit(qImg.scaled(
-            int(self.r * 80), 80), pos)
+        if frame.shape[0] == 80:
+            qImg = self._ring.wrap(frame)
+        else:
+            # Scale to thumbnail size (80px height, maintain aspect ratio)
+            qImg = self._ring.resize(frame)
+        self.reelImage.emit(qImg, pos)
+
+    def _seekFrames(self, targets):
+        """
+        Yields (frame number, frame) seeking to each target, until a read fails.
+        """
+        if not self.scaledDecode:
+            yield from seekFrames(self.capture, targets)
+            return
+        for i in targets:
+            # Let ffmpeg seek and scale while decoding
+            image = decodeThumbnail(self.fPath, i/self.fps, int(self.r * 80),
+                                    80, self.sourceHeight, self._ring.acquire())
+            if image is None:
+                # Stop if can't read frame
+                return
+            yield i, image
 
     def run(self):
         """
@@ -142,9 +263,8 @@ class ExtractImages(QObject):
 
         This method is called when the thread starts. It:
         1. Reads video metadata if not already done
-        2. Extracts frames starting at this thread's designated position
-        3. Extracts every (frameInterval * split) frames to distribute work
-        4. Emits each frame and signals completion
+        2. Extracts this thread's share of the frames (see targets())
+        3. Emits each frame and signals completion
 
         Each thread extracts a different subset of frames for parallel processing.
         """
@@ -153,18 +273,29 @@ class ExtractImages(QObject):
             self.baselineRead()
         success, image = self.capture.read()
 
-        # Extract frames starting at this thread's position
-        # Stride by (frameInterval * split) to distribute work across threads
-        for i in range(self.pos*self.frameInterval, self.frameCount, self.frameInterval*self.split):
-            # Set the frame position
-            self.capture.set(cv2.CAP_PROP_POS_FRAMES, i)
-            # Read the frame at this position
-            success, image = self.capture.read()
-            if not success:
-                # Stop if can't read frame
+        targets = self.targets()
+        if self.keyframesOnly:
+            frames = readKeyframes(self.fPath, targets, self.fps,
+                                   self.capture, self._keyIndex)
+        elif self.sequential:
+            # One seek to the start of this thread's part, then streaming
+            if len(targets):
+                self.capture.set(cv2.CAP_PROP_POS_FRAMES, targets[0])
+            frames = readSequential(self.capture, targets)
+        else:
+            frames = self._seekFrames(targets)
+        for i, image in frames:
+            if self._stopped:
+                # No longer wanted
                 break
             # Send the frame and its sequential position
             self._transmitFrame(image, math.floor(i/self.frameInterval))
+        # Hand the capture back for the next extraction of the file
+        CapturePool.shared().release(self.fPath, self.capture)
+        self.capture = None
+        # Buffers still leased are freed when the receiver releases them
+        self._ring.close()
+        self._readVideo = False
 
         # Signal that this thread finished extracting
         self.finished.emit()
@@ -172,6 +303,387 @@ class ExtractImages(QObject):
         self.over.emit(self.pos)
 
 
+class ReelExtractor(QObject):
+    """
+    Extracts the ~100 reel thumbnails of a video in a process pool.
+
+    Drop-in for ExtractImages (same reelImage positions, positionMs, stop and
+    finished), but decoding runs in separate processes instead of QThreads
+    sharing the GIL. The reel is cut into contiguous ranges of positions;
+    each task opens its own capture, seeks or streams (see
+    sequentialReadCheaper) through its range and resizes
+    the thumbnails straight into one shared memory block. The GUI side only
+    wraps finished ranges of the block as QImages, without copying them.
+
+    Media with a WebVTT thumbnail track (see spriteSheet) take the reel from
+    the track instead, without decoding; reel "frames" are then
+    milliseconds. Network media without such a track get no reel: a full
+    pass would compete with playback.
+
+    Signals:
+    - reelImage(QImage, int): Emitted per thumbnail with its reel position;
+      the image views the shared memory block, which stays mapped until every
+      thumbnail is given back with ThumbnailRing.release
+    - finished(): Emitted when extraction is complete or stopped
+
+    Attributes:
+    - source: Path to video file
+    - fPath: Path decoded: the source, or its scrubbing proxy once run()
+             found one
+    - count: Number of thumbnails aimed for
+    - workers: Number of processes
+    - frameInterval: Spacing between extracted frames
+    - keyframesOnly: Whether the nearest keyframe stands in for each frame
+    """
+
+    # Ranges per process: small enough to balance and to stop early
+    rangesPerWorker = 4
+    # Sources at least this tall are decoded scaled (see decodeThumbnail)
+    scaledDecodeHeight = 1080
+
+    reelImage = pyqtSignal(QImage, int)
+    finished = pyqtSignal()
+
+    # Process pool shared by all extractions, started on first use
+    __pool = None
+    __poolWorkers = 0
+    __poolLock = threading.Lock()
+
+    def __init__(self, fPath, count=100, workers=None, keyframesOnly=None):
+        """
+        Args:
+            fPath (str): Path to video file
+            count (int): Number of thumbnails aimed for
+            workers (int): Number of processes, defaults to the CPU count
+            keyframesOnly (bool): Decode only the keyframe closest to each
+                                  reel frame (see readKeyframes), None to
+                                  measure (see keyframesCheaper)
+        """
+        super().__init__()
+        self.source = fPath
+        self.fPath = fPath
+        self.count = count
+        self.workers = workers or os.cpu_count() or 1
+        self.keyframesOnly = keyframesOnly
+        self.fps = 0
+        self.frameInterval = 1
+        self._stopped = False
+
+    @classmethod
+    def pool(cls, workers):
+        """
+        Returns the shared process pool, (re)created for a worker count.
+
+        Processes are spawned rather than forked: the GUI process runs Qt
+        and decoder threads that must not be duplicated mid-operation.
+        """
+        with cls.__poolLock:
+            if cls.__pool is None or cls.__poolWorkers != workers:
+                if cls.__pool is not None:
+                    cls.__pool.shutdown(wait=False, cancel_futures=True)
+                cls.__pool = ProcessPoolExecutor(
+                    max_workers=workers, mp_context=get_context("spawn"))
+                cls.__poolWorkers = workers
+            return cls.__pool
+
+    @classmethod
+    def dropPool(cls):
+        """
+        Discards the shared process pool (it is recreated on next use).
+        """
+        with cls.__poolLock:
+            if cls.__pool is not None:
+                cls.__pool.shutdown(wait=False, cancel_futures=True)
+            cls.__pool = None
+
+    def stop(self):
+        """
+        Asks a running extraction to stop; ranges not started are dropped.
+        """
+        self._stopped = True
+
+    def positionMs(self, pos):
+        """
+        Returns the media time of a position emitted by reelImage.
+        """
+        return pos * self.frameInterval / self.fps * 1000 if self.fps else 0.0
+
+    def run(self):
+        """
+        Extracts the reel, emitting thumbnails range by range as they finish.
+        """
+        sprites = SpriteTrack.forMedia(self.source)
+        if sprites is not None:
+            self.__runSprites(sprites)
+            return
+        if not os.path.isfile(self.source):
+            self.finished.emit()
+            return
+        # Looked up here: the file's fingerprint is not read on the GUI thread
+        proxy = cachedProxy(self.source)
+        if proxy is not None:
+            # Every frame a small keyframe, much cheaper to decode
+            self.fPath = proxy
+        with CapturePool.shared().borrow(self.fPath) as capture:
+            frameCount = int(capture.get(cv2.CAP_PROP_FRAME_COUNT))
+            fW = int(capture.get(cv2.CAP_PROP_FRAME_WIDTH))
+            fH = int(capture.get(cv2.CAP_PROP_FRAME_HEIGHT))
+            self.fps = capture.get(cv2.CAP_PROP_FPS)
+            # Same spacing as ExtractImages
+            self.frameInterval = max(math.ceil(frameCount / self.count), 1)
+            gop = gopOf(self.fPath)
+            if self.keyframesOnly is None and frameCount > 0:
+                self.keyframesOnly = keyframesCheaper(
+                    capture, self.frameInterval, gop)
+        if frameCount <= 0 or not fH:
+            self.finished.emit()
+            return
+        width = int(fW / fH * 80)
+        if self.keyframesOnly and av is None:
+            # Build the index once here, the range tasks load it
+            self.keyframesOnly = KeyframeIndex.forFile(self.fPath) is not None
+        scaled = (fH >= self.scaledDecodeHeight and bool(self.fps)
+                  and ffmpegAvailable() and not self.keyframesOnly)
+        positions = list(range(0, frameCount, self.frameInterval))
+        shape = (len(positions), 80, width, 3)
+        # Contiguous ranges of reel positions
+        ranges = min(len(positions), self.workers * self.rangesPerWorker)
+        bounds = [len(positions) * i // ranges for i in range(ranges + 1)]
+
+        block = shared_memory.SharedMemory(create=True, size=int(np.prod(shape)))
+        shared = np.ndarray(shape, np.uint8, buffer=block.buf)
+        # Thumbnails are handed out as views of the block
+        ring = ThumbnailRing(width, 80, buffers=shared, onClosed=block.close)
+        try:
+            pool = self.pool(self.workers)
+            try:
+                futures = [pool.submit(extractReelRange, self.fPath, block.name,
+                                       shape, positions, start, stop, scaled,
+                                       fH, gop, self.keyframesOnly)
+                           for start, stop in zip(bounds, bounds[1:]) if stop > start]
+            except BrokenProcessPool as ex:
+                logger.warning(f"Reel extraction failed for {self.fPath}: {ex}")
+                self.dropPool()
+                futures = []
+            for future in as_completed(futures):
+                if self._stopped:
+                    for pending in futures:
+                        pending.cancel()
+                    break
+                try:
+                    start, done = future.result()
+                except Exception as ex:
+                    logger.warning(f"Reel extraction failed for {self.fPath}: {ex}")
+                    if isinstance(ex, BrokenProcessPool):
+                        # A pool process died: start a new pool next time
+                        self.dropPool()
+                    continue
+                for i in range(start, start + done):
+                    self.reelImage.emit(ring.wrap(shared[i]), i)
+            # Ranges still decoding must be done with the block before unlink
+            for future in futures:
+                if not future.cancel():
+                    try:
+                        future.result()
+                    except Exception:
+                        pass
+        finally:
+            del shared
+            # Only the name goes now, the mapping once the ring is released
+            block.unlink()
+            ring.close()
+        self.finished.emit()
+
+    def __runSprites(self, sprites):
+        """
+        Emits the reel from a thumbnail track, positions in milliseconds.
+        """
+        self.fps = 1000
+        self.frameInterval = max(math.ceil(sprites.durationMs / self.count), 1)
+        for pos in range(math.ceil(sprites.durationMs / self.frameInterval)):
+            if self._stopped:
+                break
+            qImg = sprites.image(pos * self.frameInterval)
+            if qImg is not None:
+                self.reelImage.emit(qImg, pos)
+        self.finished.emit()
+
+
+class ThumbnailRing(object):
+    """
+    Preallocated buffers that thumbnails are decoded and resized into.
+
+    Frames are resized with cv2.resize(dst=...) into a free buffer of the
+    ring, and the QImage handed out views that buffer: nothing is allocated
+    between the decode and QPixmap.fromImage. Queued signals share a QImage's
+    pixels instead of copying them, so a buffer is leased to its image until
+    the receiver calls ThumbnailRing.release() with it, right after
+    QPixmap.fromImage (or when a cache that kept the image drops it); an
+    image handed to several receivers takes a lease per receiver with
+    retain(). Leased buffers are not written again; when every buffer is leased the ring
+    grows by one, so a consumer that falls behind costs memory, never a
+    thumbnail overwritten while it is read. A closed ring keeps the buffers
+    of leased images until the last one is released.
+
+    Attributes:
+    - width, height: Thumbnail size in pixels
+    """
+    # Leased images by QImage.cacheKey(), which the copies made by signals
+    # share: [ring, buffer number, leases]
+    __leases = {}
+    __leaseLock = threading.Lock()
+
+    def __init__(self, width, height=80, size=2, buffers=None, onClosed=None):
+        """
+        Args:
+            width (int): Thumbnail width in pixels
+            height (int): Thumbnail height in pixels
+            size (int): Number of preallocated buffers
+            buffers (numpy.ndarray): Existing (n, height, width, 3) buffers to
+                                     hand out instead (e.g. shared memory)
+            onClosed (callable): Called once the ring is closed and none of
+                                 its images is leased any more
+        """
+        self.width = width
+        self.height = height
+        if buffers is None:
+            buffers = [np.empty((height, width, 3), np.uint8)
+                       for _ in range(size)]
+        self.__buffers = list(buffers)
+        # buffer number -> leases of images viewing it
+        self.__leased = {}
+        self.__next = 0
+        self.__closed = False
+        self.__onClosed = onClosed
+
+    def __len__(self):
+        return len(self.__buffers)
+
+    def acquire(self):
+        """
+        Returns a buffer no leased image views, (height, width, 3) BGR.
+        """
+        with self.__leaseLock:
+            n = len(self.__buffers)
+            for k in range(n):
+                i = (self.__next + k) % n
+                if not self.__leased.get(i):
+                    self.__next = (i + 1) % n
+                    return self.__buffers[i]
+            # Every buffer is still read somewhere
+            self.__buffers.append(np.empty((self.height, self.width, 3), np.uint8))
+            return self.__buffers[-1]
+
+    def wrap(self, buffer):
+        """
+        Hands a thumbnail out as a QImage leasing its buffer.
+
+        Args:
+            buffer (numpy.ndarray): BGR frame of the ring's size, normally a
+                                    buffer of the ring (others are copied
+                                    into one)
+
+        Returns:
+            QImage: BGR888 image viewing the buffer; pass it to release()
+                    once done with it
+        """
+        address = buffer.ctypes.data
+        i = next((i for i, b in enumerate(self.__buffers)
+                  if b.ctypes.data == address), None)
+        if i is None:
+            # A decoder's own frame: copied into a free buffer
+            target = self.acquire()
+            target[...] = buffer
+            return self.wrap(target)
+        buffer = self.__buffers[i]
+        qImg = QImage(buffer.data, self.width, self.height, buffer.strides[0],
+                      QImage.Format.Format_BGR888)
+        with self.__leaseLock:
+            self.__leases[qImg.cacheKey()] = [self, i, 1]
+            self.__leased[i] = self.__leased.get(i, 0) + 1
+        return qImg
+
+    def resize(self, frame):
+        """
+        Resizes a full-size frame into a free buffer.
+
+        Args:
+            frame (numpy.ndarray): BGR frame of any size
+
+        Returns:
+            QImage: Thumbnail leasing its buffer (see wrap())
+        """
+        buffer = self.acquire()
+        cv2.resize(frame, (self.width, self.height), dst=buffer,
+                   interpolation=cv2.INTER_AREA)
+        return self.wrap(buffer)
+
+    @classmethod
+    def retain(cls, qImg):
+        """
+        Takes one more lease on a handed out image, for one more receiver.
+
+        Args:
+            qImg (QImage): The image, or any copy of it (ignored if not leased)
+        """
+        with cls.__leaseLock:
+            lease = cls.__leases.get(qImg.cacheKey())
+            if lease is not None:
+                ring, i = lease[:2]
+                lease[2] += 1
+                ring.__leased[i] += 1
+
+    @classmethod
+    def release(cls, qImg):
+        """
+        Gives a lease on a handed out image back; its buffer is written again
+        once every lease is back.
+
+        Thread-safe; images that are not leased (e.g. owning their pixels)
+        are ignored, so receivers can release every image they get.
+
+        Args:
+            qImg (QImage): The image, or any copy of it
+        """
+        with cls.__leaseLock:
+            key = qImg.cacheKey()
+            lease = cls.__leases.get(key)
+            if lease is None:
+                return
+            ring, i = lease[:2]
+            lease[2] -= 1
+            if not lease[2]:
+                del cls.__leases[key]
+            ring.__leased[i] -= 1
+            if ring.__leased[i]:
+                return
+            del ring.__leased[i]
+            done = ring.__closed and not ring.__leased
+        if done:
+            ring.__finish()
+
+    def close(self):
+        """
+        Retires the ring: its buffers go once no image leases them.
+        """
+        with self.__leaseLock:
+            if self.__closed:
+                return
+            self.__closed = True
+            done = not self.__leased
+        if done:
+            self.__finish()
+
+    def __finish(self):
+        self.__buffers = []
+        if self.__onClosed is not None:
+            try:
+                self.__onClosed()
+            except BufferError as ex:
+                # Still exported somewhere: freed with its last reference
+                logger.warning(f"Thumbnail buffers kept: {ex}")
+
+
 class PreviewPosition(object):
     """
     Extracts single frames at specific timestamps for timeline preview.
@@ -179,30 +691,331 @@ class PreviewPosition(object):
     Used for hovering over timeline to show frame at that position without
     requiring pre-extracted thumbnails. Faster than ExtractImages for single frames.
 
+    When a KeyframeIndex is set, seeks land on known keyframes: a requested
+    frame is decoded as a short run from its keyframe (or from the current
+    decode position when that is closer), and frames too far from any
+    keyframe snap to the nearest one.
+
+    Decoded thumbnails are kept in a persistent ThumbnailStore (one slot per
+    time bucket), so previews of already scrubbed positions are served from
+    the memory-mapped cache file without decoding, even in later sessions.
+
+    Once an all-intra scrubbing proxy of the media exists (see scrubProxy),
+    frames are decoded from it: every frame is a small keyframe, so any
+    frame is one cheap seek away and keyframe snapping is not needed.
+
+    A WebVTT thumbnail track next to the media (see spriteSheet) serves
+    previews before anything else; with such a track, media OpenCV cannot
+    open (e.g. some network streams) still get previews, frame numbers then
+    being milliseconds.
+
+    The capture is lent by the shared CapturePool and handed back by close(),
+    so reopening a recently previewed file reuses its open handle. Indexed
+    previews decoded by PyAV are scaled to thumbnail size while converting
+    out of the decoder's YUV, so no full-size BGR frame is made; ffmpeg
+    processes (decodeThumbnail) are left to reel extraction, one per hover
+    would bypass both the pool and the index.
+
     Attributes:
     - fPath: Path to video file
     - capture: OpenCV VideoCapture object
     - frameCount: Total frames in video
+    - fps: Frames per second reported by the container
     - r: Aspect ratio (width/height)
+    - index: KeyframeIndex of the file, or None until it is available
+    - store: ThumbnailStore of the file, or None if unavailable
+    - key: File key identifying the current contents of the file
+    - durationMs: Duration of the video in milliseconds
+    - maxRun: Longest run of frames decoded after a keyframe before snapping
+    - seekRetries: Seeks tried before decoding from the start without PyAV
+    - bucketMs: Length of the time bucket sharing one preview
+    - sprites: SpriteTrack of the media, or None
+    - proxy: Path of the scrubbing proxy decoded instead, or None
     """
 
-    def __init__(self, fPath):
+    maxRun = 24
+    # Seeks retried when OpenCV lands past an indexed frame (see _readTimed)
+    seekRetries = 3
+    # Preview granularity when there is no thumbnail store
+    bucketMs = 250
+
+    def __init__(self, fPath, index=None):
         """
         Initialize preview extractor for a video file.
 
         Args:
             fPath (str): Path to video file
+            index (KeyframeIndex): Optional packet index of the file
         """
         self.fPath = fPath
-        # Open video file
-        self.capture = cv2.VideoCapture(self.fPath)
+        self.key = fileKey(fPath)
+        # Thumbnails published alongside the media
+        self.sprites = SpriteTrack.forMedia(fPath)
+        # Open video file (or reuse an idle handle)
+        self._capturePath = fPath
+        self.capture = CapturePool.shared().acquire(fPath)
         # Get total frames
         self.frameCount = int(self.capture.get(cv2.CAP_PROP_FRAME_COUNT))
+        # Get frames per second (used until an index is available)
+        self.fps = self.capture.get(cv2.CAP_PROP_FPS)
         # Get video dimensions
         fW = int(self.capture.get(cv2.CAP_PROP_FRAME_WIDTH))
         fH = int(self.capture.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        if not (fH and self.fps) and self.sprites is not None:
+            # Nothing decodable: the track alone, in millisecond "frames"
+            fW, fH = self.sprites.width, self.sprites.height
+            self.fps = 1000
+            self.frameCount = int(self.sprites.durationMs)
         # Calculate aspect ratio
         self.r = fW / fH
+        # Frame the next read() returns (-1 when unknown)
+        self._nextFrame = -1
+        # PyAV demuxer and frame iterator of indexed seeks (see _readIndexed)
+        self._container = None
+        self._frames = None
+        self.durationMs = self.frameCount / self.fps * 1000 if self.fps else 0
+        self.setIndex(index)
+        # Persistent thumbnails of earlier sessions
+        self.store = ThumbnailStore.open(
+            self.fPath, int(self.r * 80), 80, self.durationMs)
+        # Reusable buffers for thumbnails that do not go to the store
+        self._ring = ThumbnailRing(int(self.r * 80), 80)
+        # Display-sized buffers of scrub frames, sized on first use
+        self._frameRing = None
+        if self.store is not None:
+            self.bucketMs = self.store.bucketMs
+        # Proxy of an earlier session
+        self.proxy = None
+        proxy = cachedProxy(fPath)
+        if proxy is not None:
+            self.useProxy(proxy)
+
+    def useProxy(self, proxy):
+        """
+        Decodes frames from a scrubbing proxy instead of the media.
+
+        Args:
+            proxy (str): Path of the all-intra proxy of the media
+        """
+        capture = CapturePool.shared().acquire(proxy)
+        if not capture.isOpened():
+            logger.warning(f"Unreadable proxy {proxy}")
+            return
+        CapturePool.shared().release(self._capturePath, self.capture)
+        self._capturePath = proxy
+        self.capture = capture
+        self.proxy = proxy
+        self._nextFrame = -1
+
+    def close(self):
+        """
+        Hands the capture back to the pool; the extractor is unusable after.
+        """
+        if self.capture is not None:
+            CapturePool.shared().release(self._capturePath, self.capture)
+            self.capture = None
+        if self._container is not None:
+            self._container.close()
+            self._container = None
+            self._frames = None
+        # Images still leased keep their buffers until released
+        self._ring.close()
+        if self._frameRing is not None:
+            self._frameRing.close()
+
+    def setIndex(self, index):
+        """
+        Attaches a KeyframeIndex to seek through.
+
+        Args:
+            index (KeyframeIndex): Packet index of the file, or None
+        """
+        self.index = index
+        self._nextFrame = -1
+        if index is not None:
+            self.frameCount = index.frameCount
+            self.durationMs = index.timeAt(index.frameCount - 1)
+
+    def frameAt(self, ms):
+        """
+        Converts a time to a frame number.
+
+        Args:
+            ms (float): Time in milliseconds
+
+        Returns:
+            int: Frame number, from real PTS values when indexed
+        """
+        if self.index is not None:
+            return self.index.frameAt(ms)
+        return int((ms/1000)*self.fps)
+
+    def timeAt(self, positionImage):
+        """
+        Converts a frame number to a time in milliseconds.
+        """
+        if self.index is not None:
+            return self.index.timeAt(positionImage)
+        return positionImage / self.fps * 1000 if self.fps else 0
+
+    def bucketOf(self, positionImage):
+        """
+        Returns the time bucket a frame falls in (same frame bucket, same preview).
+        """
+        ms = self.timeAt(positionImage)
+        if self.store is not None:
+            return self.store.bucketOf(ms)
+        return int(ms // self.bucketMs)
+
+    def _resolve(self, positionImage):
+        """
+        Returns the frame actually decoded for a requested frame.
+
+        With an index, frames further than maxRun from their keyframe snap to
+        the closest keyframe: too long a run to decode for a preview.
+        """
+        if self.index is None or self.proxy is not None:
+            return positionImage
+        if positionImage - self.index.keyframeBefore(positionImage) > self.maxRun:
+            return self.index.nearestKeyframe(positionImage)
+        return positionImage
+
+    def _seek(self, positionImage):
+        """
+        Positions the capture so that the next read() returns a frame.
+
+        Used without an index (or on the proxy, see _readTimed otherwise).
+
+        Args:
+            positionImage (int): Requested frame number
+
+        Returns:
+            int: Frame number the next read() returns
+        """
+        if 0 <= self._nextFrame <= positionImage <= self._nextFrame + self.maxRun:
+            # Close ahead of the current position: decode forward
+            for _ in range(positionImage - self._nextFrame):
+                self.capture.grab()
+        else:
+            # No index: let OpenCV seek from whatever keyframe precedes
+            self.capture.set(cv2.CAP_PROP_POS_FRAMES, positionImage)
+        return positionImage
+
+    def _readTimed(self, positionImage):
+        """
+        Decodes an index row with OpenCV, for when PyAV is not installed.
+
+        OpenCV seeks by the average frame rate, so on variable frame rate
+        media a seek lands frames away from the time asked, on either side.
+        Grabbed frames report their real timestamp though: a seek that went
+        past the row is retried earlier by the overshoot (halfway when it
+        went past the end), then frames are grabbed forward, counted by
+        index row, up to the row.
+
+        Args:
+            positionImage (int): Resolved frame number (index row)
+
+        Returns:
+            numpy.ndarray: The frame in BGR, or None if decoding failed
+        """
+        key = self.index.keyframeBefore(positionImage)
+        # Continue from the current position when it lies on the run
+        if key <= self._nextFrame <= positionImage:
+            at = self._nextFrame - 1
+        else:
+            target = self.index.timeAt(positionImage)
+            ms = self.index.timeAt(key)
+            for _ in range(self.seekRetries):
+                self.capture.set(cv2.CAP_PROP_POS_MSEC, ms)
+                landed = None
+                if self.capture.grab():
+                    landed = self.capture.get(cv2.CAP_PROP_POS_MSEC)
+                    # Half a millisecond absorbs rounding between time bases
+                    if landed <= target + 0.5:
+                        break
+                # Past the row, or past the end when nothing was grabbed
+                if landed is None:
+                    ms /= 2
+                else:
+                    ms = max(ms - (landed - target), 0)
+            else:
+                # Still past it: from the first frame, which OpenCV finds
+                self.capture.set(cv2.CAP_PROP_POS_FRAMES, 0)
+                if not self.capture.grab():
+                    return None
+                landed = self.capture.get(cv2.CAP_PROP_POS_MSEC)
+            at = self.index.frameAt(landed + 0.5)
+        # Skip the frames before the row without converting them
+        for _ in range(positionImage - at):
+            if not self.capture.grab():
+                return None
+        success, image = self.capture.retrieve()
+        return image if success else None
+
+    def _readIndexed(self, positionImage, size=None):
+        """
+        Decodes an index row with PyAV, seeking by presentation time.
+
+        OpenCV converts both frame numbers and times with the average frame
+        rate, so on variable frame rate media its seeks land frames away
+        from the row wanted. Here the seek goes to the keyframe's PTS and
+        frames are decoded until the row's own PTS.
+
+        Args:
+            positionImage (int): Resolved frame number (index row)
+            size (tuple): (width, height) the frame is scaled to while
+                          converting to BGR, None for full size
+
+        Returns:
+            numpy.ndarray: The frame in BGR, or None if decoding failed
+        """
+        scale = {}
+        if size is not None:
+            scale = dict(width=size[0], height=size[1], interpolation="AREA")
+        try:
+            if self._container is None:
+                self._container = av.open(self.fPath)
+            stream = self._container.streams.video[0]
+            key = self.index.keyframeBefore(positionImage)
+            if self._frames is None or not key <= self._nextFrame <= positionImage:
+                self._container.seek(
+                    int(round(self.index.pts[key] / stream.time_base)),
+                    stream=stream, backward=True)
+                self._frames = self._container.decode(stream)
+            # Half a millisecond absorbs rounding between time bases
+            target = self.index.pts[positionImage] - 0.0005
+            for frame in self._frames:
+                if frame.pts is not None and frame.pts * stream.time_base >= target:
+                    return frame.to_ndarray(format="bgr24", **scale)
+        except (av.FFmpegError, OSError) as ex:
+            logger.warning(f"Preview decoding failed for {self.fPath}: {ex}")
+        return None
+
+    def _read(self, positionImage, size=None):
+        """
+        Decodes the frame shown for a requested frame number.
+
+        Args:
+            positionImage (int): Requested frame number
+            size (tuple): (width, height) wanted, honoured by PyAV decoding
+                          only; OpenCV captures return full frames
+
+        Returns:
+            tuple: (frame number decoded, BGR frame or None)
+        """
+        if self.index is not None and self.proxy is None:
+            positionImage = self._resolve(positionImage)
+            if av is not None:
+                image = self._readIndexed(positionImage, size)
+            else:
+                image = self._readTimed(positionImage)
+        else:
+            positionImage = self._seek(positionImage)
+            success, image = self.capture.read()
+            if not success:
+                image = None
+        self._nextFrame = positionImage + 1 if image is not None else -1
+        return positionImage, image
 
     def extract(self, positionImage):
         """
@@ -215,22 +1028,871 @@ class PreviewPosition(object):
             QImage: Scaled thumbnail image, or None if extraction failed
 
         Returns a thumbnail sized image (80px height) maintaining aspect ratio.
+        Frames are resized straight into the store slot, and the image
+        returned from the store owns a copy of it. Without a store they are
+        resized into a ring buffer the image leases (see ThumbnailRing).
         """
-        # Seek to the specified frame
-        self.capture.set(cv2.CAP_PROP_POS_FRAMES, positionImage)
-        # Read the frame
-        success, image = self.capture.read()
-        if success:
-            # Get frame dimensions
-            height, width, channel = image.shape
-            # Calculate bytes per line
-            bytesPerLine = 3 * width
-            # Convert OpenCV BGR to QImage
-            qImg = QImage(image.data, width, height,
-                          bytesPerLine, QImage.Format.Format_BGR888)
-            # Scale to thumbnail size
-            return qImg.scaled(int(self.r * 80), 80)
+        if self.sprites is not None:
+            # Published thumbnail track, no decoding
+            qImg = self.sprites.image(self.timeAt(positionImage))
+            if qImg is not None:
+                return qImg
+        bucket = None
+        if self.store is not None:
+            # Already decoded in this or an earlier session
+            bucket = self.bucketOf(positionImage)
+            qImg = self.store.image(bucket)
+            if qImg is not None:
+                return qImg
+        # Seek to and read the specified frame, thumbnail sized if possible
+        width = self.store.width if bucket is not None else self._ring.width
+        positionImage, image = self._read(positionImage, (width, 80))
+        if image is None:
+            return None
+        if bucket is not None:
+            # Keep it for later hovers and sessions, written in place
+            slot = self.store.slot(bucket)
+            if image.shape[0] == 80:
+                slot[...] = image
+            else:
+                cv2.resize(image, (self.store.width, 80), dst=slot,
+                           interpolation=cv2.INTER_AREA)
+            self.store.commit(bucket)
+            return self.store.image(bucket)
+        if image.shape[0] == 80:
+            return self._ring.wrap(image)
+        # Scale to thumbnail size into a reusable buffer
+        return self._ring.resize(image)
+
+    def frame(self, positionImage, height):
+        """
+        Decodes a frame for display on the video surface while scrubbing.
+
+        Args:
+            positionImage (int): Frame number to decode
+            height (int): Display height; larger frames are scaled down
+
+        Returns:
+            QImage: The frame leasing a ring buffer (see ThumbnailRing), or
+                    None if decoding failed
+
+        Seeks like previews do (keyframe snapping with an index, the proxy
+        when there is one) but bypasses thumbnail stores and sprite tracks.
+        """
+        positionImage, image = self._read(positionImage)
+        if image is None:
+            return None
+        fH, fW = image.shape[:2]
+        if fH > height > 0:
+            fW = max(int(fW * height / fH), 1)
+            fH = height
+        ring = self._frameRing
+        if ring is None or (ring.width, ring.height) != (fW, fH):
+            # New display size: buffers of the old one go once released
+            if ring is not None:
+                ring.close()
+            ring = self._frameRing = ThumbnailRing(fW, fH)
+        if image.shape[0] != fH:
+            return ring.resize(image)
+        return ring.wrap(image)
+
+    def extractMany(self, positions, stop=None):
+        """
+        Extracts several frames in a single forward pass.
+
+        Args:
+            positions (iterable): Frame numbers to extract
+            stop (callable): Optional check, extraction ends when it returns True
+
+        Returns:
+            dict: Frame number -> QImage (None if extraction failed) for the
+                  frames extracted before stopping
+
+        Targets are decoded in increasing order so that nearby ones are
+        reached by decoding forward instead of seeking back to a keyframe.
+        """
+        images = {}
+        for positionImage in sorted(set(positions)):
+            if stop is not None and stop():
+                break
+            images[positionImage] = self.extract(positionImage)
+        return images
+
+
+class PreviewWorker(QObject):
+    """
+    Owns the preview extractor and decodes hover previews off the GUI thread.
+
+    This object is meant to be moved to a dedicated QThread. The GUI thread
+    only posts requests; a request replaces any older one that has not been
+    started yet (latest request wins), so while the cursor moves only the
+    newest hover position is decoded. Results come back through the queued
+    previewReady signal and are added to the shared PreviewCache.
+
+    While no request is waiting, the worker prefetches previews ahead of the
+    cursor along the scrub direction, as far as the scrub speed suggests the
+    cursor will travel within prefetchSeconds. Prefetching yields to every
+    new request and stops when the cursor leaves the slider.
+
+    While the slider is dragged, display-sized frames for live scrubbing are
+    decoded with the same extractor (latest request wins, ahead of previews).
+
+    Thumbnails of reel tiles (see MyThumbnailDisplay.tileRequested) are
+    decoded in batches, one forward pass over the tiles asked for so far,
+    before prefetching and yielding to every hover or scrub request.
+
+    Nothing is opened until open() is called, so a file can be played without
+    ever paying for its preview extractor; close() drops the extractor of a
+    file that is no longer shown.
+
+    Images handed to the GUI may lease thumbnail buffers: receivers give
+    every one back with ThumbnailRing.release once it is converted or shown.
+
+    Signals:
+    - previewReady(QImage, tuple): Decoded preview and the request it answers
+    - scrubReady(QImage, float): Scrub frame and the time it was asked for
+    - tileReady(QImage, float, str): Reel tile thumbnail, the time it was
+      asked for and the file it belongs to
+    """
+
+    previewReady = pyqtSignal(QImage, tuple)
+    scrubReady = pyqtSignal(QImage, float)
+    tileReady = pyqtSignal(QImage, float, str)
+    # internal signals, queued into the worker thread
+    _openRequested = pyqtSignal(str)
+    _indexRequested = pyqtSignal(str, object)
+    _proxyRequested = pyqtSignal(str, str)
+    _wake = pyqtSignal()
+    _prefetchWake = pyqtSignal()
+
+    # Seconds of cursor travel to prefetch and the most frames per pass
+    prefetchSeconds = 1.0
+    prefetchFrames = 8
+
+    def __init__(self, cache):
+        """
+        Args:
+            cache (PreviewCache): Cache shared with the GUI thread, holding
+                                  leases through ThumbnailRing
+        """
+        super().__init__()
+        self.cache = cache
+        self.__lock = threading.Lock()
+        self.__pending = None
+        self.__scrub = None
+        self.__hint = None
+        # times (ms) of the reel tiles waiting for a thumbnail
+        self.__tiles = set()
+        self.__extract = None
+        # File asked for last (GUI thread); the extractor may still lag behind
+        self.__wanted = None
+        # always queued: requests pile up as events, only the newest is kept
+        queued = Qt.ConnectionType.QueuedConnection
+        self._openRequested.connect(self.__openFile, queued)
+        self._indexRequested.connect(self.__attachIndex, queued)
+        self._proxyRequested.connect(self.__attachProxy, queued)
+        self._wake.connect(self.__process, queued)
+        self._prefetchWake.connect(self.__prefetch, queued)
+
+    def open(self, fPath):
+        """
+        Switches to a new media file (opened in the worker thread).
+
+        Args:
+            fPath (str): Path (or network URL) of the media
+        """
+        self.cancel()
+        self.stopPrefetch()
+        self.__dropTiles()
+        self.__wanted = fPath
+        self._openRequested.emit(fPath)
+
+    def close(self):
+        """
+        Drops the extractor of the current file (closed in the worker thread).
+        """
+        self.cancel()
+        self.stopPrefetch()
+        self.__dropTiles()
+        self.__wanted = None
+        self._openRequested.emit("")
+
+    def current(self):
+        """
+        Returns the file previews were asked for last, or None after close().
+        """
+        return self.__wanted
+
+    def setIndex(self, fPath, index):
+        """
+        Hands a KeyframeIndex over to the extractor of a file.
+        """
+        self._indexRequested.emit(fPath, index)
+
+    def setProxy(self, fPath, proxy):
+        """
+        Switches the extractor of a file over to its scrubbing proxy.
+        """
+        self._proxyRequested.emit(fPath, proxy)
+
+    def request(self, display):
+        """
+        Asks for the preview of a hover position, replacing older requests.
+
+        Args:
+            display (tuple): (x, y, milliseconds) from MySlider.showPreview
+        """
+        with self.__lock:
+            self.__pending = display
+        self._wake.emit()
+
+    def scrub(self, ms, height):
+        """
+        Asks for a frame to show on the video surface, replacing older ones.
+
+        Args:
+            ms (float): Time dragged to in milliseconds
+            height (int): Height of the video surface
+        """
+        with self.__lock:
+            self.__scrub = (ms, height)
+        self._wake.emit()
+
+    def cancel(self):
+        """
+        Drops the requests waiting to be decoded, if any.
+        """
+        with self.__lock:
+            self.__pending = None
+            self.__scrub = None
+
+    def prefetch(self, ms, velocity):
+        """
+        Updates the scrub motion that prefetching follows.
+
+        Args:
+            ms (float): Cursor position in milliseconds
+            velocity (float): Scrub speed in milliseconds of media per second,
+                              negative when scrubbing backwards
+        """
+        with self.__lock:
+            self.__hint = (ms, velocity)
+        self._prefetchWake.emit()
+
+    def stopPrefetch(self):
+        """
+        Stops prefetching (the cursor left the slider).
+        """
+        with self.__lock:
+            self.__hint = None
+
+    def requestTile(self, ms):
+        """
+        Asks for the thumbnail of a reel tile, answered by tileReady.
+
+        Args:
+            ms (float): Time of the tile in milliseconds
+        """
+        with self.__lock:
+            self.__tiles.add(ms)
+        self._prefetchWake.emit()
+
+    def __dropTiles(self):
+        with self.__lock:
+            self.__tiles = set()
+
+    def cached(self, ms):
+        """
+        Returns the cached preview of a time without decoding.
+
+        Args:
+            ms (float): Time in milliseconds
+
+        Returns:
+            QImage: The preview (to release, see ThumbnailRing), or None if
+                    it has to be decoded
+        """
+        # The worker thread swaps extractors under the lock; one taken here
+        # stays usable (its store only serves copies, see ThumbnailStore)
+        with self.__lock:
+            extract = self.__extract
+        if extract is None or extract.fPath != self.__wanted:
+            return None
+        return self.cache.get((extract.key, extract.bucketOf(extract.frameAt(ms))))
+
+    def storedThumbnails(self):
+        """
+        Returns the previews decoded so far for the current file.
+
+        Returns:
+            list: (ms, QImage) pairs from the persistent thumbnail store
+        """
+        with self.__lock:
+            extract = self.__extract
+        if (extract is None or extract.fPath != self.__wanted
+                or extract.store is None):
+            return []
+        return list(extract.store.thumbnails())
+
+    def __openFile(self, fPath):
+        """
+        Opens the extractor of a file, handing the preview cache over.
+
+        Cached previews are keyed by file contents, so those of other files
+        stay valid (switching back is instant); only previews of an older
+        version of the same file are dropped. An empty path only closes the
+        current extractor.
+        """
+        old = self.__extract
+        extract = None
+        try:
+            if fPath:
+                extract = PreviewPosition(fPath)
+        except ZeroDivisionError:
+            # No video stream (dimensions are zero)
+            logger.warning(f"No preview available for {fPath}")
+        if old and extract and old.fPath == fPath and old.key != extract.key:
+            self.cache.discard(old.key)
+        with self.__lock:
+            self.__extract = extract
+        if old is not None:
+            # Kept open in the pool for switching back
+            old.close()
+
+    def __attachIndex(self, fPath, index):
+        if self.__extract and self.__extract.fPath == fPath:
+            self.__extract.setIndex(index)
+
+    def __attachProxy(self, fPath, proxy):
+        if (self.__extract and self.__extract.fPath == fPath
+                and self.__extract.proxy != proxy):
+            self.__extract.useProxy(proxy)
+
+    def __process(self):
+        """
+        Decodes the newest pending request; older ones were replaced.
+        """
+        with self.__lock:
+            display, self.__pending = self.__pending, None
+            scrub, self.__scrub = self.__scrub, None
+        if self.__extract is None:
+            return
+        if scrub is not None:
+            # The video surface goes first, a preview can wait a frame
+            qImg = self.__extract.frame(self.__extract.frameAt(scrub[0]),
+                                        scrub[1])
+            if qImg is not None:
+                self.scrubReady.emit(qImg, scrub[0])
+        if not display:
+            return
+        pp = self.__extract.frameAt(display[2])
+        key = (self.__extract.key, self.__extract.bucketOf(pp))
+        qImg = self.cache.get(key)
+        if qImg is None:
+            qImg = self.__extract.extract(pp)
+            if qImg is None:
+                return
+            self.cache.put(key, qImg)
+            # The cache keeps the lease extract() gave, this one is sent
+            ThumbnailRing.retain(qImg)
+        self.previewReady.emit(qImg, display)
+        # idle again: resume prefetching
+        self._prefetchWake.emit()
+
+    def _prefetchTargets(self, ms, velocity):
+        """
+        Plans the frames to prefetch ahead of a moving cursor.
+
+        Args:
+            ms (float): Cursor position in milliseconds
+            velocity (float): Scrub speed in milliseconds of media per second
+
+        Returns:
+            list: Frame numbers whose previews are not cached yet
+        """
+        extract = self.__extract
+        span = abs(velocity) * self.prefetchSeconds
+        if extract is None or span < extract.bucketMs:
+            return []
+        # one target per bucket, spread further apart on fast scrubs
+        step = max(extract.bucketMs, span / self.prefetchFrames)
+        direction = 1 if velocity > 0 else -1
+        targets = []
+        for i in range(1, int(span // step) + 1):
+            t = ms + direction * i * step
+            if not 0 <= t < extract.durationMs:
+                break
+            pp = extract.frameAt(t)
+            if (extract.key, extract.bucketOf(pp)) not in self.cache:
+                targets.append(pp)
+        return targets
+
+    def __prefetch(self):
+        """
+        Decodes the reel tiles asked for, then previews ahead of the cursor,
+        while no request is waiting.
+        """
+        with self.__lock:
+            busy = self.__pending is not None or self.__scrub is not None
+        if busy or self.__extract is None:
+            return
+        extract = self.__extract
+
+        def waiting():
+            # a real request ends batches at once
+            return self.__pending is not None or self.__scrub is not None
+
+        if not self.__decodeTiles(extract, waiting):
+            return
+        with self.__lock:
+            hint = self.__hint
+        if hint is None:
+            return
+
+        def interrupted():
+            # so does the cursor leaving
+            return waiting() or self.__hint is None
+
+        images = extract.extractMany(self._prefetchTargets(*hint), interrupted)
+        for pp, qImg in images.items():
+            if qImg is not None:
+                self.cache.put((extract.key, extract.bucketOf(pp)), qImg)
+
+    def __decodeTiles(self, extract, waiting):
+        """
+        Answers the reel tiles asked for, decoding those not cached in one
+        forward pass.
+
+        Returns:
+            bool: False if a request interrupted the batch (the tiles left
+                  are decoded once it is answered)
+        """
+        with self.__lock:
+            tiles, self.__tiles = self.__tiles, set()
+        # frame -> tile times showing it
+        frames = {}
+        for ms in tiles:
+            frames.setdefault(extract.frameAt(ms), []).append(ms)
+        missing = []
+        for pp, times in frames.items():
+            qImg = self.cache.get((extract.key, extract.bucketOf(pp)))
+            if qImg is None:
+                missing.append(pp)
+            else:
+                # get() leased it for the first tile
+                self.__sendTile(extract, qImg, times,
+                                leased=self.cache.leases is not None)
+        images = extract.extractMany(missing, waiting)
+        for pp, qImg in images.items():
+            if qImg is not None:
+                self.cache.put((extract.key, extract.bucketOf(pp)), qImg)
+                self.__sendTile(extract, qImg, frames[pp])
+        left = [ms for pp in missing if pp not in images for ms in frames[pp]]
+        if left:
+            with self.__lock:
+                self.__tiles.update(left)
+            return False
+        return True
+
+    def __sendTile(self, extract, qImg, times, leased=False):
+        """
+        Emits a thumbnail for tiles, with a lease per tile (see ThumbnailRing).
+        """
+        for i, ms in enumerate(times):
+            if i or not leased:
+                ThumbnailRing.retain(qImg)
+            self.tileReady.emit(qImg, ms, extract.fPath)
+
+
+class BatchProber(QObject):
+    """
+    Probes the metadata of many files at once; meant to be moved to a QThread.
+
+    Files found in the MetadataCache are reported first, all from one query;
+    the others are probed in parallel on a thread pool (probing waits on the
+    disk or the network, and OpenCV releases the GIL while opening) and
+    reported in the order their probes finish. New probes are stored back in
+    the cache in one transaction at the end.
+
+    Signals:
+    - probed(str, object): Emitted with a file path and its MediaInfo (None
+      if the file cannot be opened)
+    - finished(): Emitted when every file was reported, or after stop()
+    """
+
+    probed = pyqtSignal(str, object)
+    finished = pyqtSignal()
+
+    # Probes running at once
+    workers = 8
+
+    def __init__(self, paths):
+        """
+        Args:
+            paths (list): Paths (or network URLs) of the media
+        """
+        super().__init__()
+        self.paths = list(paths)
+        self._stopped = False
+
+    def stop(self):
+        """
+        Stops reporting; probes already running are finished but dropped.
+        """
+        self._stopped = True
+
+    def run(self):
+        """
+        Reports cached metadata, then probes the remaining files in parallel.
+        """
+        cache = MetadataCache.shared()
+        found = cache.getMany(self.paths) if cache is not None else {}
+        for fPath, info in found.items():
+            self.probed.emit(fPath, info)
+        missing = [p for p in dict.fromkeys(self.paths) if p not in found]
+        probed = {}
+        if missing and not self._stopped:
+            with ThreadPoolExecutor(min(self.workers, len(missing))) as pool:
+                futures = {pool.submit(probeMedia, p): p for p in missing}
+                for future in as_completed(futures):
+                    if self._stopped:
+                        pool.shutdown(cancel_futures=True)
+                        break
+                    fPath = futures[future]
+                    try:
+                        info = future.result()
+                    except Exception as ex:
+                        logger.warning(f"Probe failed for {fPath}: {ex}")
+                        info = None
+                    if info is not None:
+                        probed[fPath] = info
+                    self.probed.emit(fPath, info)
+        if probed and cache is not None:
+            cache.putMany(probed)
+        self.finished.emit()
+
+
+def ffmpegAvailable():
+    """
+    Tells whether the ffmpeg executable can be found in PATH.
+    """
+    return shutil.which("ffmpeg") is not None
+
+
+def decodeThumbnail(fPath, seconds, width, height=80, sourceHeight=0, out=None):
+    """
+    Decodes one frame already scaled down to thumbnail size.
+
+    Args:
+        fPath (str): Path to the video file
+        seconds (float): Time of the frame
+        width (int): Thumbnail width
+        height (int): Thumbnail height
+        sourceHeight (int): Height of the video, enables lowres decoding
+        out (numpy.ndarray): Optional contiguous (height, width, 3) buffer
+                             the frame is read into
+
+    Returns:
+        numpy.ndarray: (height, width, 3) BGR frame, or None if decoding failed
+
+    ffmpeg seeks, decodes and scales in one process, so the full-size frame
+    never reaches Python: no full-size BGR conversion, copy or QImage.scaled.
+    Decoders supporting lowres (MPEG-4 part 2, MJPEG, ...) also decode at a
+    reduced resolution; others ignore the option.
+    """
+    # Largest power of two reduction that stays above the thumbnail height
+    lowres = 0
+    while lowres < 3 and sourceHeight >> (lowres + 1) >= height:
+        lowres += 1
+    if out is None:
+        out = np.empty((height, width, 3), np.uint8)
+    try:
+        process = (ffmpeg.input(fPath, ss=seconds, lowres=lowres)
+                   .filter("scale", width, height)
+                   .output("pipe:", format="rawvideo", pix_fmt="bgr24", vframes=1)
+                   .global_args("-loglevel", "error")
+                   .run_async(pipe_stdout=True, pipe_stderr=True))
+    except OSError as ex:
+        logger.warning(f"Scaled decode failed for {fPath}: {ex}")
+        return None
+    # Read the raw frame straight into the buffer
+    view = memoryview(out).cast("B")
+    filled = 0
+    while filled < len(view):
+        n = process.stdout.readinto(view[filled:])
+        if not n:
+            break
+        filled += n
+    _, err = process.communicate()
+    if filled < len(view):
+        logger.warning(f"Scaled decode failed for {fPath}: {err.decode(errors='replace')}")
         return None
+    return out
+
+
+def gopOf(fPath):
+    """
+    Returns the average keyframe distance of an already indexed file.
+
+    Args:
+        fPath (str): Path to video file
+
+    Returns:
+        float: Frames between keyframes, 0 if the file is not indexed yet
+    """
+    if not os.path.isfile(fPath):
+        return 0
+    index = KeyframeIndex.load(fPath)
+    return index.gopLength if index is not None else 0
+
+
+def seekFrames(capture, targets):
+    """
+    Yields (frame number, frame) seeking to each target, until a read fails.
+
+    Args:
+        capture (cv2.VideoCapture): Open capture
+        targets (iterable): Frame numbers
+    """
+    for i in targets:
+        # Set the frame position
+        capture.set(cv2.CAP_PROP_POS_FRAMES, i)
+        # Read the frame at this position
+        success, image = capture.read()
+        if not success:
+            return
+        yield i, image
+
+
+def readSequential(capture, targets):
+    """
+    Yields (frame number, frame) streaming once through a file.
+
+    Frames between targets are skipped with grab(), which demuxes and decodes
+    but leaves out the conversion to BGR; only targets are retrieve()d. No
+    seek decodes the same group of pictures twice.
+
+    Args:
+        capture (cv2.VideoCapture): Open capture
+        targets (iterable): Ascending frame numbers
+    """
+    current = int(capture.get(cv2.CAP_PROP_POS_FRAMES))
+    for i in targets:
+        if i < current:
+            # Behind the stream: only a seek gets there
+            capture.set(cv2.CAP_PROP_POS_FRAMES, i)
+            current = i
+        while current < i:
+            if not capture.grab():
+                return
+            current += 1
+        if not capture.grab():
+            return
+        current += 1
+        success, image = capture.retrieve()
+        if not success:
+            return
+        yield i, image
+
+
+def readKeyframes(fPath, targets, fps, capture=None, index=None):
+    """
+    Yields (frame number, frame) with the keyframe closest to each target.
+
+    With PyAV the decoder is told to skip every non-key frame
+    (skip_frame NONKEY): each target costs one seek and the decoding of the
+    keyframes around it, never a run of inter frames. Without PyAV the
+    keyframe index locates the keyframes and cv2 seeks straight to them.
+
+    Args:
+        fPath (str): Path to video file
+        targets (iterable): Ascending frame numbers
+        fps (float): Frame rate, maps frame numbers to time
+        capture (cv2.VideoCapture): Open capture, for the index path
+        index (KeyframeIndex): Keyframe index, for the index path
+    """
+    if av is None:
+        last, image = -1, None
+        for i in targets:
+            key = index.nearestKeyframe(i)
+            if key != last:
+                # Landing on a keyframe decodes just that frame; by time, as
+                # index rows are not nominal frame numbers on VFR media
+                capture.set(cv2.CAP_PROP_POS_MSEC, index.timeAt(key))
+                success, image = capture.read()
+                if not success:
+                    return
+                last = key
+            yield i, image
+        return
+    try:
+        container = av.open(fPath)
+    except (av.FFmpegError, OSError) as ex:
+        logger.warning(f"Keyframe decoding failed for {fPath}: {ex}")
+        return
+    with container:
+        stream = container.streams.video[0]
+        stream.codec_context.skip_frame = "NONKEY"
+        start = stream.start_time or 0
+        # Keyframes around the current target
+        before = after = None
+        try:
+            for i in targets:
+                pts = start + int(i / fps / stream.time_base)
+                if after is None or after.pts <= pts:
+                    container.seek(pts, stream=stream, backward=True)
+                    frames = container.decode(stream)
+                    before, after = next(frames, None), next(frames, None)
+                    if before is None:
+                        return
+                nearest = before
+                if after is not None and after.pts - pts < pts - before.pts:
+                    nearest = after
+                yield i, nearest.to_ndarray(format="bgr24")
+        except av.FFmpegError as ex:
+            logger.warning(f"Keyframe decoding failed for {fPath}: {ex}")
+
+
+def decodeCosts(capture, step, gop=0):
+    """
+    Times a few grab()s and one seek ahead of the current position.
+
+    The capture is put back where it was afterwards.
+
+    Args:
+        capture (cv2.VideoCapture): Open capture
+        step (int): Frames between two targets
+        gop (float): Average keyframe distance, 0 when unknown
+
+    Returns:
+        tuple: (seconds per grabbed frame, seconds per seek), None if
+               nothing could be grabbed
+    """
+    start = int(capture.get(cv2.CAP_PROP_POS_FRAMES))
+    stamp = time.perf_counter()
+    grabbed = 0
+    for _ in range(4):
+        if not capture.grab():
+            break
+        grabbed += 1
+    if not grabbed:
+        return None
+    grabCost = (time.perf_counter() - stamp) / grabbed
+    # A seek into the middle of what is left: near the start it could still
+    # be inside the group of pictures being decoded
+    frameCount = int(capture.get(cv2.CAP_PROP_FRAME_COUNT))
+    target = max(start + grabbed + step, (start + frameCount) // 2)
+    stamp = time.perf_counter()
+    capture.set(cv2.CAP_PROP_POS_FRAMES, target)
+    capture.grab()
+    seekCost = time.perf_counter() - stamp
+    # A seek decodes from the keyframe before its target: half a GOP on
+    # average, even if the measured one happened to land near a keyframe
+    seekCost = max(seekCost, gop / 2 * grabCost)
+    capture.set(cv2.CAP_PROP_POS_FRAMES, start)
+    return grabCost, seekCost
+
+
+def sequentialReadCheaper(capture, step, gop=0):
+    """
+    Measures whether streaming through a file beats seeking to each target.
+
+    Args:
+        capture (cv2.VideoCapture): Open capture
+        step (int): Frames between two targets
+        gop (float): Average keyframe distance, 0 when unknown
+
+    Returns:
+        bool: True if grabbing step frames is cheaper than one seek
+    """
+    costs = decodeCosts(capture, step, gop)
+    if costs is None:
+        return False
+    grabCost, seekCost = costs
+    return step * grabCost < seekCost
+
+
+def keyframesCheaper(capture, step, gop=0, ratio=8):
+    """
+    Measures whether nearest keyframes are worth their inaccuracy.
+
+    An exact target costs a seek or streaming the step frames since the
+    previous one, whichever is cheaper; a keyframe costs about one decode.
+    Intra-only files and short GOPs keep exact frames, long GOPs and slow
+    seeks switch to keyframes.
+
+    Args:
+        capture (cv2.VideoCapture): Open capture
+        step (int): Frames between two targets
+        gop (float): Average keyframe distance, 0 when unknown
+        ratio (float): Decodes an exact target must cost to switch
+
+    Returns:
+        bool: True if an exact target costs more than ratio decodes
+    """
+    costs = decodeCosts(capture, step, gop)
+    if costs is None:
+        return False
+    grabCost, seekCost = costs
+    return min(step * grabCost, seekCost) > ratio * grabCost
+
+
+def extractReelRange(fPath, blockName, shape, positions, start, stop,
+                     scaled=False, sourceHeight=0, gop=0, keyframesOnly=False):
+    """
+    Decodes a contiguous range of reel thumbnails into shared memory.
+
+    Runs in a ReelExtractor pool process with its own capture.
+
+    Args:
+        fPath (str): Path to video file
+        blockName (str): Name of the shared memory block
+        shape (tuple): (positions, height, width, 3) layout of the block
+        positions (list): Frame number of every reel position
+        start, stop (int): Range of reel positions to decode
+        scaled (bool): Decode scaled by ffmpeg (see decodeThumbnail)
+        sourceHeight (int): Height of the video
+        gop (float): Average keyframe distance, 0 when unknown
+        keyframesOnly (bool): Decode only keyframes (see readKeyframes)
+
+    Returns:
+        tuple: (start, number of thumbnails decoded from start on)
+    """
+    # Spawned pool processes share the creator's resource tracker, so the
+    # block is not unlinked when this process exits
+    block = shared_memory.SharedMemory(name=blockName)
+    done = 0
+    try:
+        frames = np.ndarray(shape, np.uint8, buffer=block.buf)
+        height, width = shape[1], shape[2]
+        # Pool of this worker process: later ranges of the file reuse it
+        capture = CapturePool.shared().acquire(fPath)
+        fps = capture.get(cv2.CAP_PROP_FPS)
+        if scaled:
+            for i in range(start, stop):
+                if decodeThumbnail(fPath, positions[i] / fps, width, height,
+                                   sourceHeight, frames[i]) is None:
+                    break
+                done += 1
+        else:
+            targets = positions[start:stop]
+            step = positions[1] - positions[0] if len(positions) > 1 else 1
+            capture.set(cv2.CAP_PROP_POS_FRAMES, targets[0])
+            if keyframesOnly:
+                index = KeyframeIndex.load(fPath) if av is None else None
+                decoded = readKeyframes(fPath, targets, fps, capture, index)
+            elif sequentialReadCheaper(capture, step, gop):
+                decoded = readSequential(capture, targets)
+            else:
+                decoded = seekFrames(capture, targets)
+            for done, (_, image) in enumerate(decoded, 1):
+                cv2.resize(image, (width, height), dst=frames[start + done - 1],
+                           interpolation=cv2.INTER_AREA)
+        CapturePool.shared().release(fPath, capture)
+        del frames
+    finally:
+        block.close()
+    return start, done
 
 
 def extractAudio(filePath):
@@ -261,6 +1923,83 @@ def extractAudio(filePath):
     return audioPath
 
 
+def probeMedia(filePath):
+    """
+    Reads the metadata of a video file.
+
+    MP4/MOV and Matroska/WebM headers are parsed directly (exact, a few
+    kilobytes read, no decoder); other formats and network URLs are opened
+    with OpenCV. The frame count OpenCV estimates for MPEG transport streams
+    is replaced by the duration their timestamps span.
+
+    Args:
+        filePath (str): Path (or network URL) of the media
+
+    Returns:
+        MediaInfo: The metadata, or None if the file cannot be opened
+    """
+    if os.path.isfile(filePath):
+        headers = readHeaders(filePath)
+        if headers is not None:
+            return headers.mediaInfo()
+    with CapturePool.shared().borrow(filePath) as capture:
+        if not capture.isOpened():
+            return None
+        frameCount = int(capture.get(cv2.CAP_PROP_FRAME_COUNT))
+        frameRate = capture.get(cv2.CAP_PROP_FPS)
+        fourcc = int(capture.get(cv2.CAP_PROP_FOURCC))
+        duration = frameCount / frameRate if frameRate else 0.0
+        durationMs = (transportStreamDuration(filePath)
+                      if os.path.isfile(filePath) else None)
+        if durationMs is not None:
+            # Head to tail timestamps: exact where the count is a guess
+            duration = durationMs / 1000
+            frameCount = round(duration * frameRate)
+        return MediaInfo(
+            round(duration, 3), frameCount, frameRate,
+            int(capture.get(cv2.CAP_PROP_FRAME_WIDTH)),
+            int(capture.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+            "".join(chr((fourcc >> 8 * i) & 0xFF) for i in range(4)).strip("\0"))
+
+
+def mediaInfoMany(paths):
+    """
+    Returns the metadata of many files, probing only those not cached.
+
+    Args:
+        paths (iterable): Paths (or network URLs) of the media
+
+    Returns:
+        dict: Path -> MediaInfo for every file that could be opened
+
+    Cached metadata comes from a single query of the MetadataCache; new
+    probes are stored back in one transaction.
+    """
+    paths = list(paths)
+    cache = MetadataCache.shared()
+    found = cache.getMany(paths) if cache is not None else {}
+    probed = {}
+    for fPath in paths:
+        if fPath not in found:
+            info = probeMedia(fPath)
+            if info is not None:
+                probed[fPath] = info
+    if probed and cache is not None:
+        cache.putMany(probed)
+    found.update(probed)
+    return found
+
+
+def mediaInfo(filePath):
+    """
+    Returns the metadata of a file, from the MetadataCache when possible.
+
+    Returns:
+        MediaInfo: The metadata, or None if the file cannot be opened
+    """
+    return mediaInfoMany([filePath]).get(filePath)
+
+
 def checkDuration(filePath):
     """
     Gets the duration and frame information from a video file.
@@ -274,17 +2013,14 @@ def checkDuration(filePath):
                - frame_count (int): Total number of frames
                - frame_rate (float): Frames per second
 
-    Uses OpenCV to read video metadata without decompressing the entire file.
-    """
-    # Open video with OpenCV
-    capture = cv2.VideoCapture(filePath)
-    # Get total frame count
-    frameCount = capture.get(cv2.CAP_PROP_FRAME_COUNT)
-    # Get frames per second
-    frameRate = capture.get(cv2.CAP_PROP_FPS)
-    # Calculate duration
-    dur = frameCount/frameRate
-    return (round(dur, 3), frameCount, frameRate)
+    Reads MP4/MOV and Matroska headers directly, other formats with OpenCV,
+    never decompressing the file. Files probed before (same size and modification time) are not opened:
+    the metadata comes from the persistent MetadataCache.
+    """
+    info = mediaInfo(filePath)
+    if info is None:
+        return (0.0, 0, 0.0)
+    return (info.duration, info.frameCount, info.fps)
 
 # find duration of the audio file using wave module
 
@@ -0,0 +1,168 @@
+"""
+scrubProxy.py - Low-Resolution All-Intra Proxies for Scrubbing
+
+This module builds, in the background, a small proxy of a video in which
+every frame is a keyframe (MJPEG, 240 lines). Seeking in the proxy decodes
+exactly one small frame, so once it exists hover previews and the timeline
+reel are taken from it instead of the (possibly 4K HEVC) source.
+
+Proxies are registered in the user cache under the source's file key, so a
+proxy built once is reused in later sessions until the source changes.
+
+Key Classes:
+- ProxyBuilder: ffmpeg proxy job with progress and cancellation
+
+Key Functions:
+- proxyPath(): Where the proxy of a media file is kept
+- cachedProxy(): The proxy of a media file, if already built
+
+Dependencies:
+- ffmpeg: Transcoding
+- cv2: Source duration for progress
+- PyQt6: Signals
+"""
+
+import os
+import cv2
+import ffmpeg
+from PyQt6.QtCore import pyqtSignal
+from PyQt6.QtCore import QObject
+from cacheTools import cacheDirectory
+from cacheTools import fileKey
+from cacheTools import touchEntry
+from cacheTools import trimCache
+from capturePool import CapturePool
+import logging
+logger = logging.getLogger(__name__)
+
+
+def proxyPath(fPath):
+    """
+    Returns the registry path of the proxy of a media file.
+    """
+    return os.path.join(cacheDirectory("proxies"), fileKey(fPath) + ".mkv")
+
+
+def cachedProxy(fPath):
+    """
+    Returns the proxy of a local media file if it was built before.
+
+    Args:
+        fPath (str): Path to video file
+
+    Returns:
+        str: Path of the proxy, or None
+    """
+    if not os.path.isfile(fPath):
+        return None
+    path = proxyPath(fPath)
+    if not os.path.exists(path):
+        return None
+    touchEntry(path)
+    return path
+
+
+# ===============================================================================
+# ProxyBuilder- Background ffmpeg job writing a scrubbing proxy
+# ===============================================================================
+class ProxyBuilder(QObject):
+    """
+    Transcodes a video into an all-intra low-resolution proxy; meant to be
+    moved to a QThread.
+
+    The proxy is written to a temporary file and renamed into the registry
+    when complete, so a cancelled or failed job never leaves a half proxy.
+
+    Signals:
+    - progress(str, float): Emitted with the file path and the done fraction
+    - proxyReady(str, str): Emitted with the file path and its proxy path
+    - finished(): Emitted when the job is done, cancelled or failed
+
+    Attributes:
+    - fPath: Path to video file
+    - height: Proxy height in pixels (never upscaled)
+    - quality: MJPEG quantizer, 2 (best) to 31
+    - minSourceHeight: Sources smaller than this decode fast enough as is
+    """
+
+    progress = pyqtSignal(str, float)
+    proxyReady = pyqtSignal(str, str)
+    finished = pyqtSignal()
+
+    height = 240
+    quality = 5
+    minSourceHeight = 720
+
+    def __init__(self, fPath):
+        """
+        Args:
+            fPath (str): Path to video file
+        """
+        super().__init__()
+        self.fPath = fPath
+        self.__cancelled = False
+        self.__process = None
+
+    def cancel(self):
+        """
+        Stops the job; thread-safe. The partial proxy is removed.
+        """
+        self.__cancelled = True
+        process = self.__process
+        if process is not None:
+            process.kill()
+
+    def run(self):
+        """
+        Builds the proxy unless it is registered already, then emits it.
+        """
+        target = proxyPath(self.fPath)
+        if os.path.exists(target):
+            self.proxyReady.emit(self.fPath, target)
+            self.finished.emit()
+            return
+        with CapturePool.shared().borrow(self.fPath) as capture:
+            fps = capture.get(cv2.CAP_PROP_FPS)
+            durationUs = (capture.get(cv2.CAP_PROP_FRAME_COUNT) / fps * 1e6
+                          if fps else 0)
+            fH = capture.get(cv2.CAP_PROP_FRAME_HEIGHT)
+        if self.__cancelled or fH < self.minSourceHeight:
+            self.finished.emit()
+            return
+        partial = target + ".part"
+        try:
+            self.__process = (
+                ffmpeg.input(self.fPath)
+                .output(partial, format="matroska", an=None, sn=None,
+                        vf=f"scale=-2:'min(ih,{self.height})'",
+                        vcodec="mjpeg", **{"q:v": self.quality})
+                .global_args("-progress", "pipe:1", "-nostats",
+                             "-loglevel", "error")
+                .overwrite_output()
+                .run_async(pipe_stdout=True, pipe_stderr=True))
+        except OSError as ex:
+            logger.warning(f"Proxy job failed for {self.fPath}: {ex}")
+            self.finished.emit()
+            return
+        if self.__cancelled:
+            self.__process.kill()
+        # -progress writes key=value lines, out_time_us is the encoded time
+        for line in self.__process.stdout:
+            key, _, value = line.decode(errors="replace").strip().partition("=")
+            if key == "out_time_us" and durationUs and value.isdigit():
+                self.progress.emit(self.fPath, min(int(value) / durationUs, 1.0))
+        _, err = self.__process.communicate()
+        if self.__process.returncode == 0 and not self.__cancelled:
+            os.replace(partial, target)
+            # Least recently used proxies go over the disk budget
+            trimCache("proxies", keep=[target])
+            self.progress.emit(self.fPath, 1.0)
+            self.proxyReady.emit(self.fPath, target)
+        else:
+            if not self.__cancelled:
+                logger.warning(f"Proxy job failed for {self.fPath}: "
+                               f"{err.decode(errors='replace')}")
+            if os.path.exists(partial):
+                os.remove(partial)
+        self.__process = None
+        self.finished.emit()
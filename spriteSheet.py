@@ -0,0 +1,280 @@
+"""
+spriteSheet.py - WebVTT Thumbnail Tracks with Sprite Sheets
+
+This module exports thumbnails as the de-facto standard thumbnail track used
+by web players: JPEG sprite sheets (grids of thumbnails) and a WebVTT file
+whose cues point into them with media fragments:
+
+    WEBVTT
+
+    00:01:40.000 --> 00:01:45.000
+    clip_0.jpg#xywh=284,80,142,80
+
+A track saved next to a media file (clip.mp4 -> clip.vtt) is picked up when
+the file is opened again, on this or any other machine, and serves previews
+without decoding a single frame. Network media get instant previews when the
+server publishes such a track next to the stream.
+
+Key Classes:
+- SpriteTrack: Thumbnails of a WebVTT thumbnail track, loaded on demand
+
+Key Functions:
+- sidecarPath(): Where the thumbnail track of a media file is looked for
+- exportSprites(): Write thumbnails as sprite sheets plus a WebVTT track
+
+Dependencies:
+- PyQt6: QImage for sheets and thumbnails
+- urllib: Tracks and sheets of network media
+"""
+
+import bisect
+import os.path
+import re
+import urllib.parse
+import urllib.request
+from PyQt6.QtCore import QRect
+from PyQt6.QtGui import QImage
+from PyQt6.QtGui import QPainter
+import logging
+logger = logging.getLogger(__name__)
+
+# "00:01:40.000 --> 00:01:45.000", hours optional
+CUE_TIMING = re.compile(
+    r"((?:\d+:)?\d{2}:\d{2}\.\d{3})\s+-->\s+((?:\d+:)?\d{2}:\d{2}\.\d{3})")
+
+
+# ===============================================================================
+# SpriteTrack- Thumbnails of a WebVTT thumbnail track
+# ===============================================================================
+class SpriteTrack(object):
+    """
+    Cues of a WebVTT thumbnail track, each a rectangle of a sprite sheet.
+
+    Sheets are fetched on first use and kept; image() fits
+    MyThumbnailDisplay.setSource as is.
+
+    Attributes:
+    - location: Path or URL of the track
+    - durationMs: End of the last cue
+    - width, height: Size of the first cue's thumbnail
+    """
+    # Seconds to wait for a track or sheet of network media
+    timeout = 5
+
+    def __init__(self, location, cues):
+        """
+        Args:
+            location (str): Path or URL of the track
+            cues (list): (start ms, end ms, sheet reference, QRect or None)
+        """
+        self.location = location
+        cues = sorted(cues, key=lambda cue: cue[0])
+        self.__starts = [cue[0] for cue in cues]
+        self.__cues = cues
+        self.__sheets = {}
+        self.durationMs = cues[-1][1] if cues else 0
+        rect = cues[0][3] if cues else None
+        self.width = rect.width() if rect is not None else 0
+        self.height = rect.height() if rect is not None else 0
+
+    def __len__(self):
+        return len(self.__cues)
+
+    @classmethod
+    def parse(cls, location, text):
+        """
+        Builds a track from the text of a WebVTT file.
+
+        Args:
+            location (str): Path or URL of the track (sheets are relative to it)
+            text (str): Contents of the file
+
+        Returns:
+            SpriteTrack: The track, or None if it has no thumbnail cues
+        """
+        if not text.lstrip("\ufeff").startswith("WEBVTT"):
+            return None
+        cues = []
+        lines = text.splitlines()
+        for i, line in enumerate(lines):
+            timing = CUE_TIMING.search(line)
+            if timing is None or i + 1 >= len(lines) or not lines[i + 1].strip():
+                continue
+            reference, _, fragment = lines[i + 1].strip().partition("#xywh=")
+            rect = None
+            if fragment:
+                x, y, w, h = (int(v) for v in fragment.split(","))
+                rect = QRect(x, y, w, h)
+            cues.append((parseTime(timing.group(1)), parseTime(timing.group(2)),
+                         reference, rect))
+        if not cues:
+            return None
+        return cls(location, cues)
+
+    @classmethod
+    def load(cls, location):
+        """
+        Reads a track from a file or URL.
+
+        Returns:
+            SpriteTrack: The track, or None if missing or unreadable
+        """
+        try:
+            data = readLocation(location, cls.timeout)
+        except (OSError, ValueError) as ex:
+            logger.debug(f"No thumbnail track at {location}: {ex}")
+            return None
+        return cls.parse(location, data.decode("utf-8", errors="replace"))
+
+    @classmethod
+    def forMedia(cls, fPath):
+        """
+        Returns the sidecar thumbnail track of a media file or URL, if any.
+        """
+        location = sidecarPath(fPath)
+        if location is None or ("://" not in location and
+                                not os.path.isfile(location)):
+            return None
+        return cls.load(location)
+
+    def image(self, ms):
+        """
+        Returns the thumbnail of the cue covering a time.
+
+        Args:
+            ms (float): Media time in milliseconds
+
+        Returns:
+            QImage: The thumbnail, or None outside the track or if its sheet
+                    cannot be read
+        """
+        i = bisect.bisect_right(self.__starts, ms) - 1
+        if i < 0 or ms >= self.__cues[i][1]:
+            return None
+        _, _, reference, rect = self.__cues[i]
+        sheet = self.__sheet(reference)
+        if sheet is None:
+            return None
+        return sheet.copy(rect) if rect is not None else sheet
+
+    def __sheet(self, reference):
+        """
+        Returns a sprite sheet, reading it on first use.
+        """
+        if reference not in self.__sheets:
+            sheet = QImage()
+            try:
+                sheet.loadFromData(readLocation(
+                    resolveReference(self.location, reference), self.timeout))
+            except (OSError, ValueError) as ex:
+                logger.warning(f"Unreadable sprite sheet {reference}: {ex}")
+            # A failed sheet is not retried on every hover
+            self.__sheets[reference] = None if sheet.isNull() else sheet
+        return self.__sheets[reference]
+
+
+def parseTime(stamp):
+    """
+    Converts a WebVTT timestamp ([hh:]mm:ss.ttt) to milliseconds.
+    """
+    seconds = 0.0
+    for part in stamp.split(":"):
+        seconds = seconds * 60 + float(part)
+    return round(seconds * 1000)
+
+
+def formatTime(ms):
+    """
+    Converts milliseconds to a WebVTT timestamp (hh:mm:ss.ttt).
+    """
+    ms = int(round(ms))
+    return (f"{ms // 3600000:02d}:{ms // 60000 % 60:02d}:"
+            f"{ms // 1000 % 60:02d}.{ms % 1000:03d}")
+
+
+def readLocation(location, timeout):
+    """
+    Returns the bytes of a local file or a URL.
+    """
+    if "://" in location:
+        with urllib.request.urlopen(location, timeout=timeout) as response:
+            return response.read()
+    with open(location, "rb") as f:
+        return f.read()
+
+
+def resolveReference(location, reference):
+    """
+    Resolves a sheet reference of a cue against the track's location.
+    """
+    if "://" in location or "://" in reference:
+        return urllib.parse.urljoin(location, reference)
+    return os.path.join(os.path.dirname(location), reference)
+
+
+def sidecarPath(fPath):
+    """
+    Returns where the thumbnail track of a media file is looked for.
+
+    Args:
+        fPath (str): Path or URL of the media
+
+    Returns:
+        str: The media path (or URL path) with a .vtt extension
+    """
+    if "://" in fPath:
+        parts = urllib.parse.urlsplit(fPath)
+        path = os.path.splitext(parts.path)[0] + ".vtt"
+        return urllib.parse.urlunsplit(parts._replace(path=path, query=""))
+    return os.path.splitext(fPath)[0] + ".vtt"
+
+
+def exportSprites(vttPath, thumbnails, durationMs, columns=10, rows=10,
+                  quality=85):
+    """
+    Writes thumbnails as JPEG sprite sheets and a WebVTT thumbnail track.
+
+    Args:
+        vttPath (str): Path of the track; sheets are written next to it as
+                       <name>_<n>.jpg
+        thumbnails (iterable): (ms, QImage) pairs, any order
+        durationMs (float): Media duration, end of the last cue
+        columns, rows (int): Grid of thumbnails per sheet
+        quality (int): JPEG quality
+
+    Returns:
+        int: Number of cues written
+
+    Each thumbnail's cue lasts until the next thumbnail's time.
+    """
+    items = sorted({int(ms): qImg for ms, qImg in thumbnails}.items())
+    if not items:
+        return 0
+    width = max(qImg.width() for _, qImg in items)
+    height = max(qImg.height() for _, qImg in items)
+    base = os.path.splitext(vttPath)[0]
+    perSheet = columns * rows
+    lines = ["WEBVTT", ""]
+    for first in range(0, len(items), perSheet):
+        chunk = items[first:first + perSheet]
+        name = f"{os.path.basename(base)}_{first // perSheet}.jpg"
+        sheetRows = (len(chunk) + columns - 1) // columns
+        sheet = QImage(columns * width if sheetRows > 1 else len(chunk) * width,
+                       sheetRows * height, QImage.Format.Format_RGB32)
+        sheet.fill(0)
+        painter = QPainter(sheet)
+        for i, (ms, qImg) in enumerate(chunk):
+            rect = QRect((i % columns) * width, (i // columns) * height,
+                         width, height)
+            painter.drawImage(rect, qImg)
+            n = first + i
+            end = items[n + 1][0] if n + 1 < len(items) else max(durationMs, ms + 1)
+            lines += [f"{formatTime(ms)} --> {formatTime(end)}",
+                      f"{name}#xywh={rect.x()},{rect.y()},{width},{height}", ""]
+        painter.end()
+        if not sheet.save(os.path.join(os.path.dirname(vttPath), name),
+                          "JPG", quality):
+            raise OSError(f"Could not write sprite sheet {name}")
+    with open(vttPath, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines))
+    return len(items)
@@ -0,0 +1,125 @@
+"""
+bench_startup.py - Time to first video frame, eager vs lazy preview setup
+
+Selecting a playlist item used to start, next to playback, everything hover
+previews need: the PreviewPosition extractor (capture open and property
+reads), the coarse ReelExtractor pass and the KeyframeIndex build. They are
+now started on the first hover over the seek slider instead.
+
+This benchmark opens a playback decoder (a fresh cv2 capture, standing in
+for the media player backend) and times its first frame, and its first
+--frames frames, with and without that preview work running alongside.
+Every round starts from an empty cache (no index, thumbnails or proxy),
+as the first time a file is selected.
+
+Usage:
+    python bench_startup.py [--rounds N] [--seconds S] [--frames F] [files...]
+
+Requires ffmpeg in PATH to generate the test clip.
+"""
+
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+# Caches go to a throw-away folder, emptied before every round
+CACHE = tempfile.mkdtemp(prefix="bench_startup_")
+os.environ["XDG_CACHE_HOME"] = CACHE
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import cv2
+from capturePool import CapturePool
+from mediaIndex import IndexBuilder
+from processTools import PreviewPosition
+from processTools import ReelExtractor
+
+
+def makeClip(folder, width, height, seconds):
+    """
+    Encodes an H.264 test clip.
+    """
+    path = os.path.join(folder, f"bench_{height}p.mp4")
+    subprocess.run(["ffmpeg", "-v", "error", "-y", "-f", "lavfi", "-i",
+                    f"testsrc2=size={width}x{height}:rate=25:duration={seconds}",
+                    "-c:v", "libx264", "-preset", "ultrafast", "-g", "50",
+                    "-pix_fmt", "yuv420p", path], check=True)
+    return path
+
+
+def startPreviews(path):
+    """
+    Starts what selecting a file used to start for previews, each on its own
+    thread like the QThreads of the player; returns the reel and the threads.
+    """
+    reel = ReelExtractor(path, keyframesOnly=True)
+    jobs = [lambda: PreviewPosition(path).close(), reel.run,
+            IndexBuilder(path).run]
+    threads = [threading.Thread(target=job) for job in jobs]
+    for thread in threads:
+        thread.start()
+    return reel, threads
+
+
+def playback(path, frames):
+    """
+    Returns the seconds to the first frame and to the first frames frames.
+    """
+    start = time.perf_counter()
+    capture = cv2.VideoCapture(path)
+    capture.read()
+    first = time.perf_counter() - start
+    for _ in range(frames - 1):
+        capture.read()
+    run = time.perf_counter() - start
+    capture.release()
+    return first, run
+
+
+def timeRound(path, frames, eager):
+    """
+    Times playback startup of a file from an empty cache.
+    """
+    CapturePool.shared().clear()
+    shutil.rmtree(os.path.join(CACHE, "MyVideoPlayer"), ignore_errors=True)
+    reel, threads = startPreviews(path) if eager else (None, [])
+    result = playback(path, frames)
+    if reel is not None:
+        reel.stop()
+    for thread in threads:
+        thread.join()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("files", nargs="*")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--seconds", type=int, default=60)
+    parser.add_argument("--frames", type=int, default=25)
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as folder:
+        files = args.files or [makeClip(folder, 1920, 1080, args.seconds)]
+        # The reel process pool is started once per session, not per file
+        ReelExtractor.pool(os.cpu_count() or 1).submit(int).result()
+        print(f"{'file':>20} {'setup':>6} {'first frame':>12} "
+              f"{f'{args.frames} frames':>12}")
+        for path in files:
+            for eager in (True, False):
+                times = [timeRound(path, args.frames, eager)
+                         for _ in range(args.rounds)]
+                # medians
+                first, run = (sorted(t)[len(t) // 2] for t in zip(*times))
+                print(f"{os.path.basename(path)[-20:]:>20} "
+                      f"{'eager' if eager else 'lazy':>6} "
+                      f"{first*1000:10.1f}ms {run*1000:10.1f}ms")
+    ReelExtractor.dropPool()
+    shutil.rmtree(CACHE, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
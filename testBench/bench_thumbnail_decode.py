@@ -0,0 +1,110 @@
+"""
+bench_thumbnail_decode.py - Full-frame decode vs scaled decode of thumbnails
+
+Compares, per thumbnail, the current path (cv2 seek + full-size read + QImage
++ QImage.scaled) with processTools.decodeThumbnail (ffmpeg seeks, decodes and
+scales to 80px in one process) on generated 1080p and 4K H.264 clips, or on
+files given on the command line.
+
+Two target sets are timed: random frames, and keyframes (multiples of --gop),
+which is what PreviewPosition decodes once a KeyframeIndex is available.
+
+Usage:
+    python bench_thumbnail_decode.py [--samples N] [--seconds S] [--gop G] [files...]
+
+Requires ffmpeg in PATH.
+"""
+
+import argparse
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import cv2
+from PyQt6.QtGui import QImage
+from processTools import decodeThumbnail
+
+
+def makeClip(folder, width, height, seconds, gop):
+    """
+    Encodes a long-GOP H.264 test clip.
+    """
+    path = os.path.join(folder, f"bench_{height}p.mp4")
+    subprocess.run(["ffmpeg", "-v", "error", "-y", "-f", "lavfi", "-i",
+                    f"testsrc2=size={width}x{height}:rate=25:duration={seconds}",
+                    "-c:v", "libx264", "-preset", "ultrafast", "-g", str(gop),
+                    "-pix_fmt", "yuv420p", path], check=True)
+    return path
+
+
+def fullFrameThumbnail(capture, frame, r):
+    """
+    The current path of PreviewPosition.extract.
+    """
+    capture.set(cv2.CAP_PROP_POS_FRAMES, frame)
+    success, image = capture.read()
+    height, width, channel = image.shape
+    qImg = QImage(image.data, width, height, 3 * width,
+                  QImage.Format.Format_BGR888)
+    return qImg.scaled(int(r * 80), 80)
+
+
+def timeBoth(path, capture, frames, fps, fW, fH):
+    """
+    Times both paths on the same frames, returns seconds per thumbnail.
+    """
+    r = fW / fH
+    start = time.perf_counter()
+    for frame in frames:
+        fullFrameThumbnail(capture, frame, r)
+    full = (time.perf_counter() - start) / len(frames)
+
+    start = time.perf_counter()
+    for frame in frames:
+        decodeThumbnail(path, frame / fps, int(r * 80), 80, fH)
+    scaled = (time.perf_counter() - start) / len(frames)
+    return full, scaled
+
+
+def bench(path, samples, gop):
+    """
+    Times both paths on random frames and on keyframes of a file.
+    """
+    capture = cv2.VideoCapture(path)
+    frameCount = int(capture.get(cv2.CAP_PROP_FRAME_COUNT))
+    fps = capture.get(cv2.CAP_PROP_FPS)
+    fW = int(capture.get(cv2.CAP_PROP_FRAME_WIDTH))
+    fH = int(capture.get(cv2.CAP_PROP_FRAME_HEIGHT))
+    rng = random.Random(1)
+    randomFrames = rng.sample(range(frameCount), samples)
+    keyframes = [rng.randrange(0, frameCount, gop) for _ in range(samples)]
+    return (fW, fH, timeBoth(path, capture, randomFrames, fps, fW, fH),
+            timeBoth(path, capture, keyframes, fps, fW, fH))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("files", nargs="*")
+    parser.add_argument("--samples", type=int, default=10)
+    parser.add_argument("--seconds", type=int, default=20)
+    parser.add_argument("--gop", type=int, default=250)
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as folder:
+        files = args.files or [
+            makeClip(folder, 1920, 1080, args.seconds, args.gop),
+            makeClip(folder, 3840, 2160, args.seconds, args.gop)]
+        print(f"{'source':>10} {'targets':>9} {'full decode':>12} "
+              f"{'scaled':>10} {'speedup':>8}")
+        for path in files:
+            fW, fH, *results = bench(path, args.samples, args.gop)
+            for targets, (full, scaled) in zip(("random", "keyframe"), results):
+                print(f"{fW}x{fH:<5} {targets:>9} {full*1000:10.1f}ms "
+                      f"{scaled*1000:8.1f}ms {full/scaled:7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+import unittest
+from unittest.mock import patch
+import sys
+import os
+import tempfile
+from PyQt6.QtWidgets import QApplication
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+# Caches written by the code under test go to a scratch folder
+CACHE = tempfile.TemporaryDirectory()
+os.environ["MYVIDEOPLAYER_CACHE"] = CACHE.name
+import processTools
+from metadataCache import MediaInfo, MetadataCache
+from MyPlaylist import MyPlaylist
+
+app = QApplication.instance() or QApplication(sys.argv)
+
+
+class TestBatchProber(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = MetadataCache(os.path.join(self.tmp.name, "media.sqlite3"))
+        self.files = []
+        for i in range(20):
+            path = os.path.join(self.tmp.name, f"clip{i}.mp4")
+            with open(path, "wb") as f:
+                f.write(b"x")
+            self.files.append(path)
+        patcher = patch('processTools.MetadataCache.shared',
+                        return_value=self.cache)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.cache.close()
+        self.tmp.cleanup()
+
+    def probe(self, fPath):
+        if fPath.endswith("clip13.mp4"):
+            return None
+        return MediaInfo(float(self.files.index(fPath)), 25, 25.0, 64, 32, "avc1")
+
+    def test_every_file_probed_once(self):
+        self.cache.put(self.files[0], MediaInfo(99.0, 25, 25.0, 64, 32, "avc1"))
+        prober = processTools.BatchProber(self.files + self.files[:1])
+        results = []
+        prober.probed.connect(lambda fPath, info: results.append((fPath, info)))
+        with patch('processTools.probeMedia', side_effect=self.probe) as probe:
+            prober.run()
+        self.assertEqual(probe.call_count, 19)
+        # The cached file is reported first, without probing
+        self.assertEqual(results[0], (self.files[0], self.cache.get(self.files[0])))
+        self.assertEqual(sorted(f for f, _ in results), sorted(self.files))
+        self.assertIsNone(dict(results)[self.files[13]])
+        # New probes were stored for the next session
+        self.assertEqual(len(self.cache.getMany(self.files)), 19)
+
+    def test_results_shown_in_playlist(self):
+        playlist = MyPlaylist()
+        playlist.addPLItem(self.files[2])
+        playlist.setItemInfo(self.files[2], MediaInfo(125.0, 25, 25.0, 64, 32, "avc1"))
+        self.assertEqual(playlist.mainWidget.item(0).text(), "clip2.mp4  (2:05)")
+
+
+if __name__ == '__main__':
+    unittest.main()
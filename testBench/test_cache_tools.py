@@ -0,0 +1,53 @@
+import unittest
+from unittest.mock import patch
+import sys
+import os
+import tempfile
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import cacheTools
+from cacheTools import cacheDirectory, touchEntry, trimCache
+
+
+class TestCacheTools(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        patcher = patch.dict(os.environ, {"MYVIDEOPLAYER_CACHE": self.tmp.name})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def entry(self, name, age):
+        path = os.path.join(cacheDirectory("index"), name)
+        with open(path, "wb") as f:
+            f.write(os.urandom(64 * 1024))
+        stamp = 1_000_000 - age
+        os.utime(path, (stamp, stamp))
+        return path
+
+    def test_directory_follows_environment(self):
+        self.assertEqual(cacheDirectory("index"), os.path.join(self.tmp.name, "index"))
+        self.assertTrue(os.path.isdir(cacheDirectory("index")))
+
+    def test_least_recently_used_evicted(self):
+        old, kept, used, new = (self.entry(f"{i}.npz", 100 - i) for i in range(4))
+        partial = self.entry("4.npz.part", 200)
+        touchEntry(used)
+        with patch.dict(cacheTools.cacheBudgets, {"index": 2 * 64 * 1024}):
+            self.assertEqual(trimCache("index", keep=[kept]), 2)
+        # Oldest first, except the entry kept; files being written stay
+        self.assertEqual([os.path.exists(p) for p in (old, kept, used, new, partial)],
+                         [False, True, True, False, True])
+
+    def test_within_budget_untouched(self):
+        paths = [self.entry(f"{i}.npz", i) for i in range(3)]
+        self.assertEqual(trimCache("index"), 0)
+        self.assertEqual(trimCache("metadata"), 0)
+        self.assertTrue(all(os.path.exists(p) for p in paths))
+
+
+if __name__ == '__main__':
+    unittest.main()
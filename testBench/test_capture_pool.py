@@ -0,0 +1,69 @@
+import unittest
+from unittest.mock import MagicMock, patch
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from capturePool import CapturePool
+
+
+def openCapture(path):
+    capture = MagicMock()
+    capture.path = path
+    capture.isOpened.return_value = True
+    return capture
+
+
+class TestCapturePool(unittest.TestCase):
+    @patch('cv2.VideoCapture', side_effect=openCapture)
+    def test_switching_back_reuses_handle(self, mock_capture):
+        pool = CapturePool(maxIdle=2)
+        a = pool.acquire("a.mp4")
+        pool.release("a.mp4", a)
+        b = pool.acquire("b.mp4")
+        pool.release("b.mp4", b)
+        self.assertIs(pool.acquire("a.mp4"), a)
+        self.assertEqual(mock_capture.call_count, 2)
+        self.assertEqual((pool.hits, pool.misses), (1, 2))
+
+    @patch('cv2.VideoCapture', side_effect=openCapture)
+    def test_lent_handles_are_exclusive(self, mock_capture):
+        pool = CapturePool()
+        first = pool.acquire("a.mp4")
+        second = pool.acquire("a.mp4")
+        self.assertIsNot(first, second)
+        pool.release("a.mp4", first)
+        pool.release("a.mp4", second)
+        self.assertEqual(len(pool), 2)
+
+    @patch('cv2.VideoCapture', side_effect=openCapture)
+    def test_eviction_releases_least_recent(self, mock_capture):
+        pool = CapturePool(maxIdle=2)
+        captures = {}
+        for name in ("a.mp4", "b.mp4", "c.mp4"):
+            captures[name] = pool.acquire(name)
+            pool.release(name, captures[name])
+        captures["a.mp4"].release.assert_called_once()
+        captures["c.mp4"].release.assert_not_called()
+        self.assertEqual(pool.evictions, 1)
+        with pool.borrow("b.mp4") as capture:
+            self.assertIs(capture, captures["b.mp4"])
+            self.assertEqual(len(pool), 1)
+        pool.drop("b.mp4")
+        captures["b.mp4"].release.assert_called_once()
+        pool.clear()
+        self.assertEqual(len(pool), 0)
+        captures["c.mp4"].release.assert_called_once()
+
+    @patch('cv2.VideoCapture', side_effect=openCapture)
+    def test_unopened_capture_not_pooled(self, mock_capture):
+        pool = CapturePool()
+        capture = pool.acquire("missing.mp4")
+        capture.isOpened.return_value = False
+        pool.release("missing.mp4", capture)
+        self.assertEqual(len(pool), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,129 @@
+import unittest
+from unittest.mock import patch
+import sys
+import os
+import tempfile
+import cv2
+import numpy as np
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+# Caches written by the code under test go to a scratch folder
+CACHE = tempfile.TemporaryDirectory()
+os.environ["MYVIDEOPLAYER_CACHE"] = CACHE.name
+import processTools
+from containerHeaders import readHeaders, transportStreamDuration
+
+
+def makeClip(path, fourcc, frames=37, size=(64, 32)):
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*fourcc), 25, size)
+    for i in range(frames):
+        writer.write(np.full((size[1], size[0], 3), i * 4, np.uint8))
+    writer.release()
+
+
+def tsPacket(pid, pts=None, pcr=None, prefix=b""):
+    """
+    Builds a 188 byte transport packet with a PCR and/or a video PES PTS.
+    """
+    header = bytes([0x47, 0x40 | (pid >> 8) if pts is not None else pid >> 8,
+                    pid & 0xFF, 0x30 if pcr is not None else 0x10])
+    body = b""
+    if pcr is not None:
+        body += bytes([7, 0x10]) + bytes([(pcr >> 25) & 0xFF, (pcr >> 17) & 0xFF,
+                                          (pcr >> 9) & 0xFF, (pcr >> 1) & 0xFF,
+                                          (pcr & 1) << 7, 0])
+    if pts is not None:
+        body += b"\0\0\1\xe0\0\0\x80\x80\x05" + bytes([
+            0x21 | ((pts >> 29) & 0x0E), (pts >> 22) & 0xFF,
+            ((pts >> 14) & 0xFE) | 1, (pts >> 7) & 0xFF, ((pts << 1) & 0xFE) | 1])
+    return prefix + (header + body).ljust(188, b"\xff")
+
+
+def writeStream(path, frames, startPts, step=3600, prefix=b""):
+    """
+    Writes a stream of frames (one video PES each) with PCRs every frame.
+    """
+    with open(path, "wb") as f:
+        for i in range(frames):
+            t = (startPts + i * step) % (1 << 33)
+            f.write(tsPacket(0x100, pts=t, prefix=prefix))
+            f.write(tsPacket(0x1000, pcr=t, prefix=prefix))
+            f.write(tsPacket(0x101, prefix=prefix) * 20)
+
+
+class TestContainerHeaders(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.TemporaryDirectory()
+        cls.clips = {}
+        for name, fourcc in (("clip.mp4", "mp4v"), ("clip.mkv", "MJPG"),
+                             ("clip.avi", "MJPG")):
+            cls.clips[name] = os.path.join(cls.tmp.name, name)
+            makeClip(cls.clips[name], fourcc)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp.cleanup()
+
+    def test_mp4_moov(self):
+        info = readHeaders(self.clips["clip.mp4"])
+        self.assertEqual((info.frameCount, info.width, info.height, info.codec),
+                         (37, 64, 32, "mp4v"))
+        self.assertAlmostEqual(info.duration, 37 / 25)
+        self.assertAlmostEqual(info.fps, 25)
+
+    def test_mp4_movie_duration(self):
+        path = os.path.join(self.tmp.name, "nodur.mp4")
+        with open(self.clips["clip.mp4"], "rb") as f:
+            data = bytearray(f.read())
+        # Version 0 mdhd: duration after version, times and timescale
+        at = data.index(b"mdhd") + 4
+        self.assertEqual(data[at], 0)
+        data[at + 16:at + 20] = bytes(4)
+        with open(path, "wb") as f:
+            f.write(data)
+        info = readHeaders(path)
+        self.assertEqual(info.frameCount, 37)
+        self.assertAlmostEqual(info.duration, 37 / 25, places=2)
+
+    def test_matroska_segment(self):
+        info = readHeaders(self.clips["clip.mkv"])
+        self.assertEqual((info.frameCount, info.width, info.height, info.codec),
+                         (37, 64, 32, "V_MJPEG"))
+        self.assertAlmostEqual(info.duration, 37 / 25)
+        self.assertEqual(info.timescale, 1000)
+
+    def test_other_formats_fall_back(self):
+        self.assertIsNone(readHeaders(self.clips["clip.avi"]))
+        truncated = os.path.join(self.tmp.name, "truncated.mp4")
+        with open(self.clips["clip.mp4"], "rb") as src, open(truncated, "wb") as f:
+            f.write(src.read(40))
+        self.assertIsNone(readHeaders(truncated))
+
+    @patch('processTools.CapturePool.shared')
+    def test_probe_without_decoder(self, mock_pool):
+        info = processTools.probeMedia(self.clips["clip.mkv"])
+        self.assertEqual((info.frameCount, info.fps), (37, 25))
+        mock_pool.assert_not_called()
+
+    def test_probe_falls_back_to_capture(self):
+        self.assertEqual(processTools.probeMedia(self.clips["clip.avi"]).frameCount,
+                         37)
+
+    def test_transport_stream_head_and_tail(self):
+        path = os.path.join(self.tmp.name, "clip.ts")
+        # 25 fps for 100 s: ~10 MB, 64 kB sampled at both ends
+        writeStream(path, 2500, 900000)
+        self.assertEqual(transportStreamDuration(path, 64 * 1024), 100000)
+        self.assertIsNone(transportStreamDuration(self.clips["clip.mp4"]))
+
+    def test_transport_stream_wraparound(self):
+        path = os.path.join(self.tmp.name, "clip.m2ts")
+        # 192 byte packets, the 33-bit clock wraps after 2 of the 40 seconds
+        writeStream(path, 1000, (1 << 33) - 2 * 90000, prefix=b"\0" * 4)
+        self.assertEqual(transportStreamDuration(path, 64 * 1024), 40000)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+import unittest
+from unittest.mock import patch
+import sys
+import os
+import shutil
+import tempfile
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+# Caches written by the code under test go to a scratch folder
+CACHE = tempfile.TemporaryDirectory()
+os.environ["MYVIDEOPLAYER_CACHE"] = CACHE.name
+import fileIdentity
+from fileIdentity import FileIdentity, fingerprint, BLOCK_SIZE, SAMPLES
+from cacheTools import fileKey
+from mediaIndex import KeyframeIndex
+
+
+class TestFileIdentity(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "clip.mp4")
+        # Larger than the samples: only sampled blocks are hashed
+        self.size = BLOCK_SIZE * SAMPLES * 4
+        with open(self.path, "wb") as f:
+            f.write(os.urandom(self.size))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def patch(self, offset):
+        # Flip the byte: writing a fixed one may leave random data unchanged
+        with open(self.path, "r+b") as f:
+            f.seek(offset)
+            byte = f.read(1)[0]
+            f.seek(offset)
+            f.write(bytes([byte ^ 0xFF]))
+
+    def test_sampled_blocks_only(self):
+        digest = fingerprint(self.path)
+        # Between the head and the second sample: not read
+        self.patch(BLOCK_SIZE * 2)
+        self.assertEqual(fingerprint(self.path), digest)
+        for offset in (0, self.size - 1):
+            self.patch(offset)
+            self.assertNotEqual(fingerprint(self.path), digest)
+            digest = fingerprint(self.path)
+        # Appending changes the size
+        with open(self.path, "ab") as f:
+            f.write(b"more")
+        self.assertNotEqual(fingerprint(self.path), digest)
+
+    def test_small_files_hashed_whole(self):
+        small = os.path.join(self.tmp.name, "small.ts")
+        with open(small, "wb") as f:
+            f.write(b"a" * 1000)
+        digest = fingerprint(small)
+        with open(small, "r+b") as f:
+            f.seek(500)
+            f.write(b"b")
+        self.assertNotEqual(fingerprint(small), digest)
+
+    def test_memoized_across_renames(self):
+        identity = FileIdentity()
+        digest = identity.fingerprint(self.path)
+        moved = os.path.join(self.tmp.name, "sub", "renamed.mp4")
+        os.makedirs(os.path.dirname(moved))
+        os.rename(self.path, moved)
+        with patch('fileIdentity.fingerprint') as read:
+            self.assertEqual(identity.fingerprint(moved), digest)
+            read.assert_not_called()
+        self.assertEqual((identity.hits, identity.misses), (1, 1))
+        # A copy is another inode: read again, same content, same key
+        copy = os.path.join(self.tmp.name, "copy.mp4")
+        shutil.copyfile(moved, copy)
+        self.assertEqual(identity.fingerprint(copy), digest)
+        self.assertEqual(identity.misses, 2)
+
+    def test_artifacts_found_after_move(self):
+        cachePath = KeyframeIndex.cachePath(self.path)
+        moved = os.path.join(self.tmp.name, "moved.mp4")
+        shutil.copy2(self.path, moved)
+        os.remove(self.path)
+        self.assertEqual(KeyframeIndex.cachePath(moved), cachePath)
+        # Network URLs are keyed by the URL
+        self.assertEqual(fileKey("http://host/a.mp4"), fileKey("http://host/a.mp4"))
+        self.assertNotEqual(fileKey("http://host/a.mp4"), fileKey(moved))
+
+    def test_blake2b_without_xxhash(self):
+        with patch.object(fileIdentity, 'xxhash', None):
+            self.assertEqual(len(fingerprint(self.path)), 32)
+
+
+if __name__ == '__main__':
+    unittest.main()
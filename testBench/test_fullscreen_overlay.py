@@ -1,11 +1,15 @@
 
 import sys
 import os
+import tempfile
 import unittest
 from PyQt6.QtWidgets import QApplication
 from PyQt6.QtCore import Qt
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+# Caches written by the code under test go to a scratch folder
+CACHE = tempfile.TemporaryDirectory()
+os.environ["MYVIDEOPLAYER_CACHE"] = CACHE.name
 from Main import MyVideoPlayer
 
 app = QApplication(sys.argv)
@@ -1,5 +1,7 @@
 
 import sys
+import os
+import tempfile
 import unittest
 from unittest.mock import MagicMock, patch
 from PyQt6.QtWidgets import QApplication
@@ -8,6 +10,9 @@ from PyQt6.QtCore import Qt, QEvent
 
 # Add project root to path
 sys.path.append("..") 
+# Caches written by the code under test go to a scratch folder
+CACHE = tempfile.TemporaryDirectory()
+os.environ["MYVIDEOPLAYER_CACHE"] = CACHE.name
 # We need to ensure we can import Main
 # Since Main.py is in parent, we might need to modify sys.path
 # already done above.
@@ -0,0 +1,186 @@
+import unittest
+import numpy as np
+from unittest.mock import patch
+import sys
+import os
+import shutil
+import subprocess
+import tempfile
+import cv2
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+# Caches written by the code under test go to a scratch folder
+CACHE = tempfile.TemporaryDirectory()
+os.environ["MYVIDEOPLAYER_CACHE"] = CACHE.name
+import processTools
+from capturePool import CapturePool
+from mediaIndex import KeyframeIndex
+
+
+def makeIndex():
+    # 10 fps stream with a keyframe every 50 frames, given in decode order
+    pts = [i / 10 for i in range(200)]
+    pos = [1000 * i for i in range(200)]
+    key = [i % 50 == 0 for i in range(200)]
+    order = list(range(199, -1, -1))
+    return KeyframeIndex([pts[i] for i in order], [pos[i] for i in order],
+                         [key[i] for i in order])
+
+
+class TestKeyframeIndex(unittest.TestCase):
+    def test_lookups(self):
+        index = makeIndex()
+        self.assertEqual(index.frameCount, 200)
+        self.assertEqual(index.frameAt(2550), 25)
+        self.assertEqual(index.frameAt(10 ** 7), 199)
+        self.assertAlmostEqual(index.timeAt(25), 2500)
+        self.assertEqual(index.keyframeBefore(75), 50)
+        self.assertEqual(index.keyframeAfter(75), 100)
+        self.assertEqual(index.nearestKeyframe(80), 100)
+        self.assertEqual(index.nearestKeyframe(60), 50)
+
+    def test_variable_frame_rate(self):
+        # Slow first second, fast afterwards: fps estimates would be wrong
+        pts = [0.0, 0.5, 1.0, 1.1, 1.2, 1.3]
+        index = KeyframeIndex(pts, [-1] * 6, [True] + [False] * 5)
+        self.assertEqual(index.frameAt(1250), 4)
+
+    @patch('mediaIndex.subprocess.Popen')
+    def test_build_from_probe(self, mock_popen):
+        process = mock_popen.return_value
+        process.__enter__.return_value = process
+        process.returncode = 0
+        # Lines are consumed as they are read, not collected first
+        process.stdout = iter(["0.040000,900,__\n", "0.000000,48,K__\n",
+                               "N/A,1200,__\n", "0.080000,N/A,__\n"])
+        process.stderr.read.return_value = ""
+        index = KeyframeIndex.build("dummy.mp4")
+        self.assertEqual(index.frameCount, 3)
+        self.assertEqual(list(index.pos), [48, 900, -1])
+        self.assertEqual(list(index.keyframes), [0])
+        self.assertIn("csv=p=0", mock_popen.call_args.args[0])
+
+    @patch('mediaIndex.subprocess.Popen')
+    def test_build_fails_with_probe(self, mock_popen):
+        process = mock_popen.return_value
+        process.__enter__.return_value = process
+        process.returncode = 1
+        process.stdout = iter([])
+        process.stderr.read.return_value = "Invalid data found"
+        self.assertIsNone(KeyframeIndex.build("dummy.mp4"))
+
+
+class TestIndexedPreview(unittest.TestCase):
+    def tearDown(self):
+        # Mocked captures must not be lent to the next test
+        CapturePool.shared().clear()
+
+    @patch('processTools.av', None)
+    @patch('cv2.VideoCapture')
+    def test_short_run_and_snapping(self, mock_capture):
+        instance = mock_capture.return_value
+        mock_image = np.zeros((100, 100, 3), np.uint8)
+        instance.retrieve.return_value = (True, mock_image)
+        # 10 fps capture reporting the time of the frame last grabbed
+        clock = {"next": 0, "grabbed": 0}
+
+        def seek(prop, value):
+            clock["next"] = value
+
+        def grab():
+            clock["grabbed"] = clock["next"]
+            clock["next"] += 100
+            return True
+
+        instance.set.side_effect = seek
+        instance.grab.side_effect = grab
+        instance.get.side_effect = lambda prop: (
+            clock["grabbed"] if prop == processTools.cv2.CAP_PROP_POS_MSEC else 10)
+
+        pp = processTools.PreviewPosition("dummy.mp4", index=makeIndex())
+        pp.store = None
+        # Within the run of keyframe 50: seek to the keyframe, skip 5 frames
+        pp.extract(55)
+        instance.set.assert_called_with(processTools.cv2.CAP_PROP_POS_MSEC, 5000)
+        self.assertEqual(instance.grab.call_count, 6)
+        # Forward within the same run: no new seek
+        instance.set.reset_mock()
+        instance.grab.reset_mock()
+        pp.extract(60)
+        instance.set.assert_not_called()
+        self.assertEqual(instance.grab.call_count, 5)
+        # Far from keyframe 50: snap to keyframe 100 and decode it directly
+        instance.grab.reset_mock()
+        pp.extract(90)
+        instance.set.assert_called_with(processTools.cv2.CAP_PROP_POS_MSEC, 10000)
+        self.assertEqual(instance.grab.call_count, 1)
+
+
+@unittest.skipIf(shutil.which("ffmpeg") is None or processTools.av is None,
+                 "ffmpeg or PyAV not installed")
+class TestVariableFrameRatePreview(unittest.TestCase):
+    def setUp(self):
+        # 50 frames at 25 fps, then 50 at 5 fps; frame i is filled with 2 * i
+        self.tmp = tempfile.TemporaryDirectory()
+        source = os.path.join(self.tmp.name, "cfr.avi")
+        writer = cv2.VideoWriter(source, cv2.VideoWriter_fourcc(*"MJPG"), 25, (64, 48))
+        for i in range(100):
+            writer.write(np.full((48, 64, 3), 2 * i, np.uint8))
+        writer.release()
+        self.path = os.path.join(self.tmp.name, "vfr.mkv")
+        subprocess.run(["ffmpeg", "-v", "error", "-y", "-i", source, "-vf",
+                        "settb=1/1000,setpts='if(lt(N,50),N*40,2000+(N-50)*200)'",
+                        "-fps_mode", "passthrough", "-c:v", "mpeg4", "-g", "10",
+                        "-bf", "0", "-q:v", "2", self.path], check=True)
+        with processTools.av.open(self.path) as container:
+            stream = container.streams.video[0]
+            packets = [(float(p.pts * p.time_base), p.pos, p.is_keyframe)
+                       for p in container.demux(stream) if p.pts is not None]
+        self.index = KeyframeIndex(*zip(*packets))
+
+    def tearDown(self):
+        CapturePool.shared().clear()
+        self.tmp.cleanup()
+
+    def test_rows_decoded_by_pts(self):
+        self.assertAlmostEqual(self.index.timeAt(60), 4000)
+        pp = processTools.PreviewPosition(self.path, index=self.index)
+        try:
+            # Seeks, short runs forward, and back again
+            for row in (60, 3, 25, 52, 55, 95, 40):
+                image = pp.frame(row, 0)
+                self.assertAlmostEqual(image.pixelColor(32, 24).red(), 2 * row,
+                                       delta=3, msg=f"frame {row}")
+        finally:
+            pp.close()
+
+    def test_rows_decoded_by_time_without_pyav(self):
+        with patch.object(processTools, "av", None):
+            pp = processTools.PreviewPosition(self.path, index=self.index)
+            try:
+                # OpenCV's own seeks overshoot after the rate change
+                for row in (60, 3, 25, 52, 55, 99, 40, 70, 51):
+                    image = pp.frame(row, 0)
+                    self.assertAlmostEqual(image.pixelColor(32, 24).red(), 2 * row,
+                                           delta=3, msg=f"frame {row}")
+            finally:
+                pp.close()
+
+    def test_previews_scaled_while_decoding(self):
+        pp = processTools.PreviewPosition(self.path, index=self.index)
+        pp.store = None
+        try:
+            with patch('processTools.cv2.resize') as resize:
+                image = pp.extract(60)
+            self.assertEqual((image.width(), image.height()), (int(pp.r * 80), 80))
+            self.assertAlmostEqual(image.pixelColor(10, 40).red(), 120, delta=3)
+            # Converted at thumbnail size, never resized afterwards
+            resize.assert_not_called()
+            processTools.ThumbnailRing.release(image)
+        finally:
+            pp.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
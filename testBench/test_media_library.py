@@ -0,0 +1,156 @@
+import unittest
+from unittest.mock import patch
+import sys
+import os
+import tempfile
+import threading
+import time
+from PyQt6.QtWidgets import QApplication
+from PyQt6.QtCore import Qt
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+# Caches written by the code under test go to a scratch folder
+CACHE = tempfile.TemporaryDirectory()
+os.environ["MYVIDEOPLAYER_CACHE"] = CACHE.name
+from mediaLibrary import Inotify, LibraryWatcher, MediaLibrary
+from metadataCache import MediaInfo, MetadataCache
+from MyLibrary import MyLibrary
+
+app = QApplication.instance() or QApplication(sys.argv)
+
+
+def touch(path, data=b"x"):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(data)
+
+
+class TestMediaLibrary(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = os.path.join(self.tmp.name, "media")
+        for name in ("a/one.mp4", "a/notes.txt", "a/b/two.mkv", "c/three.ts"):
+            touch(os.path.join(self.root, name))
+        self.library = MediaLibrary(os.path.join(self.tmp.name, "lib.sqlite3"))
+
+    def tearDown(self):
+        self.library.close()
+        self.tmp.cleanup()
+
+    def path(self, name):
+        return os.path.join(self.root, name)
+
+    def test_scan_indexes_media_only(self):
+        changed, fresh = self.library.scan(self.root)
+        self.assertEqual(sorted(fresh), [self.path("a/b/two.mkv"),
+                                         self.path("a/one.mp4"),
+                                         self.path("c/three.ts")])
+        self.assertEqual(self.library.roots(), [self.root])
+        folders, files = self.library.children(self.path("a"))
+        self.assertEqual(folders, [self.path("a/b")])
+        self.assertEqual([f[0] for f in files], [self.path("a/one.mp4")])
+        self.assertEqual(self.library.filesUnder(self.path("a")),
+                         [self.path("a/one.mp4"), self.path("a/b/two.mkv")])
+        self.assertEqual(self.library.count(), 3)
+
+    def test_rescan_lists_changed_folders_only(self):
+        self.library.scan(self.root)
+        with patch('mediaLibrary.os.scandir', wraps=os.scandir) as listed:
+            self.assertEqual(self.library.scan(self.root), ([], []))
+            listed.assert_not_called()
+            touch(self.path("a/b/four.mp4"))
+            changed, fresh = self.library.scan(self.root)
+        self.assertEqual(changed, [self.path("a/b")])
+        self.assertEqual(fresh, [self.path("a/b/four.mp4")])
+        self.assertEqual([c[0][0] for c in listed.call_args_list],
+                         [self.path("a/b")])
+
+    def test_removed_folder_is_forgotten(self):
+        self.library.scan(self.root)
+        os.remove(self.path("a/b/two.mkv"))
+        os.rmdir(self.path("a/b"))
+        changed, _ = self.library.scan(self.root)
+        self.assertEqual(changed, [self.path("a")])
+        self.assertEqual(self.library.children(self.path("a"))[0], [])
+        self.assertEqual(self.library.count(), 2)
+        self.library.removeRoot(self.root)
+        self.assertEqual((self.library.roots(), self.library.count()), ([], 0))
+
+    @unittest.skipUnless(Inotify.available(), "inotify not available")
+    def test_watcher_applies_events(self):
+        watcher = LibraryWatcher(self.library, [self.root])
+        watcher.pollInterval = 0.05
+        changed = []
+        watcher.folderChanged.connect(changed.append,
+                                      Qt.ConnectionType.DirectConnection)
+        with patch('mediaLibrary.BatchProber.run'):
+            thread = threading.Thread(target=watcher.run)
+            thread.start()
+            # Wait for the initial scan to finish and the watches to be set
+            deadline = time.time() + 5
+            while self.path("c") not in changed and time.time() < deadline:
+                time.sleep(0.01)
+            time.sleep(0.1)
+            touch(self.path("c/new.mp4"))
+            os.makedirs(self.path("d/e"))
+            touch(self.path("d/e/five.mkv"))
+            os.remove(self.path("a/one.mp4"))
+            deadline = time.time() + 5
+            while (self.library.count() != 4
+                   or self.path("d/e/five.mkv") not in
+                   self.library.filesUnder(self.root)) and time.time() < deadline:
+                time.sleep(0.01)
+            watcher.stop()
+            thread.join(5)
+        self.assertFalse(thread.is_alive())
+        self.assertEqual(self.library.filesUnder(self.root),
+                         [self.path("a/b/two.mkv"), self.path("c/new.mp4"),
+                          self.path("c/three.ts"), self.path("d/e/five.mkv")])
+        self.assertIn(self.path("c"), changed)
+
+
+class TestMyLibrary(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = os.path.join(self.tmp.name, "media")
+        touch(os.path.join(self.root, "sub", "clip.mp4"))
+        touch(os.path.join(self.root, "top.mkv"))
+        self.library = MediaLibrary(os.path.join(self.tmp.name, "lib.sqlite3"))
+        self.library.scan(self.root)
+        self.cache = MetadataCache(os.path.join(self.tmp.name, "media.sqlite3"))
+        self.cache.put(os.path.join(self.root, "top.mkv"),
+                       MediaInfo(125.0, 3125, 25.0, 640, 360, "H264"))
+        patcher = patch('MyLibrary.MetadataCache.shared', return_value=self.cache)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.cache.close()
+        self.library.close()
+        self.tmp.cleanup()
+
+    def test_folders_listed_on_expand(self):
+        browser = MyLibrary()
+        browser.setLibrary(self.library)
+        tree = browser.mainWidget
+        self.assertEqual(tree.topLevelItemCount(), 1)
+        root = tree.topLevelItem(0)
+        self.assertEqual(root.childCount(), 0)
+        root.setExpanded(True)
+        self.assertEqual([(root.child(i).text(0), root.child(i).text(1))
+                          for i in range(root.childCount())],
+                         [("sub", ""), ("top.mkv", "2:05")])
+        # A new file shows up when the watcher reports its folder
+        touch(os.path.join(self.root, "new.mp4"))
+        self.library.scan(self.root)
+        browser.refreshFolder(self.root)
+        self.assertEqual(root.childCount(), 3)
+        played = []
+        browser.playMediaFile.connect(played.append)
+        tree.itemActivated.emit(root.child(2), 0)
+        self.assertEqual(played, [os.path.join(self.root, "top.mkv")])
+
+
+if __name__ == '__main__':
+    unittest.main()
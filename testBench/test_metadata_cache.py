@@ -0,0 +1,66 @@
+import unittest
+from unittest.mock import patch
+import sys
+import os
+import sqlite3
+import tempfile
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+# Caches written by the code under test go to a scratch folder
+CACHE = tempfile.TemporaryDirectory()
+os.environ["MYVIDEOPLAYER_CACHE"] = CACHE.name
+import processTools
+from metadataCache import MediaInfo, MetadataCache
+
+
+class TestMetadataCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = MetadataCache(os.path.join(self.tmp.name, "media.sqlite3"))
+        self.files = []
+        for i in range(3):
+            path = os.path.join(self.tmp.name, f"clip{i}.mp4")
+            with open(path, "wb") as f:
+                f.write(b"x" * (i + 1))
+            self.files.append(path)
+
+    def tearDown(self):
+        self.cache.close()
+        self.tmp.cleanup()
+
+    def test_bulk_lookup(self):
+        info = MediaInfo(10.0, 250, 25.0, 320, 180, "avc1")
+        self.cache.putMany({fPath: info for fPath in self.files[:2]})
+        found = self.cache.getMany(self.files + ["http://host/stream.mp4"])
+        self.assertEqual(set(found), set(self.files[:2]))
+        self.assertEqual(found[self.files[0]], info)
+        self.assertIsNone(self.cache.get(self.files[2]))
+
+    def test_changed_file_is_stale(self):
+        self.cache.put(self.files[0], MediaInfo(1.0, 25, 25.0, 64, 32, "MJPG"))
+        with open(self.files[0], "ab") as f:
+            f.write(b"more")
+        self.assertIsNone(self.cache.get(self.files[0]))
+
+    def test_wal_mode(self):
+        db = sqlite3.connect(self.cache.path)
+        self.assertEqual(db.execute("PRAGMA journal_mode").fetchone()[0], "wal")
+        db.close()
+
+    def test_repeat_open_skips_probing(self):
+        info = MediaInfo(2.0, 50, 25.0, 64, 32, "MJPG")
+        with patch('processTools.MetadataCache.shared', return_value=self.cache), \
+                patch('processTools.probeMedia', return_value=info) as probe:
+            self.assertEqual(processTools.checkDuration(self.files[0]),
+                             (2.0, 50, 25.0))
+            found = processTools.mediaInfoMany(self.files)
+            self.assertEqual(len(found), 3)
+            # Probed once each, the second lookup of clip0 came from the cache
+            self.assertEqual(probe.call_count, 3)
+            processTools.mediaInfoMany(self.files)
+            self.assertEqual(probe.call_count, 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
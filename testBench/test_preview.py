@@ -0,0 +1,35 @@
+import unittest
+import sys
+import os
+from PyQt6.QtWidgets import QApplication
+from PyQt6.QtGui import QImage
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from MyPreview import MyPreview
+
+app = QApplication.instance() or QApplication(sys.argv)
+
+
+class TestMyPreview(unittest.TestCase):
+    def setUp(self):
+        self.preview = MyPreview()
+        self.images = {}
+        # Arrives out of order from the extraction thread
+        for ms in (2000, 0, 1000):
+            self.images[ms] = QImage(10, 8, QImage.Format.Format_BGR888)
+            self.preview.addCoarse(self.images[ms], ms)
+
+    def test_nearest_coarse(self):
+        self.assertIs(self.preview.nearestCoarse(-50), self.images[0])
+        self.assertIs(self.preview.nearestCoarse(400), self.images[0])
+        self.assertIs(self.preview.nearestCoarse(600), self.images[1000])
+        self.assertIs(self.preview.nearestCoarse(99999), self.images[2000])
+
+    def test_clear_coarse(self):
+        self.preview.clearCoarse()
+        self.assertIsNone(self.preview.nearestCoarse(1000))
+
+
+if __name__ == '__main__':
+    unittest.main()
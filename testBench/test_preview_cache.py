@@ -0,0 +1,71 @@
+import unittest
+from unittest.mock import MagicMock
+import sys
+import os
+from PyQt6.QtGui import QImage
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from previewCache import PreviewCache
+
+
+def makeImage():
+    # 100 x 80 BGR888 thumbnail: 24000 bytes
+    return QImage(100, 80, QImage.Format.Format_BGR888)
+
+
+class TestPreviewCache(unittest.TestCase):
+    def test_hit_and_miss_counters(self):
+        cache = PreviewCache(maxBytes=10**6)
+        self.assertIsNone(cache.get(("a", 1)))
+        cache.put(("a", 1), makeImage())
+        self.assertIsNotNone(cache.get(("a", 1)))
+        self.assertEqual(cache.stats()["hits"], 1)
+        self.assertEqual(cache.stats()["misses"], 1)
+
+    def test_byte_budget_evicts_lru(self):
+        size = makeImage().sizeInBytes()
+        cache = PreviewCache(maxBytes=3 * size)
+        for bucket in range(3):
+            cache.put(("a", bucket), makeImage())
+        # Touch bucket 0 so bucket 1 is the least recently used
+        cache.get(("a", 0))
+        cache.put(("a", 3), makeImage())
+        self.assertEqual(cache.evictions, 1)
+        self.assertIsNone(cache.get(("a", 1)))
+        self.assertIsNotNone(cache.get(("a", 0)))
+        self.assertLessEqual(cache.currentBytes, cache.maxBytes)
+
+    def test_replace_keeps_byte_count(self):
+        cache = PreviewCache()
+        cache.put(("a", 1), makeImage())
+        cache.put(("a", 1), makeImage())
+        self.assertEqual(len(cache), 1)
+        self.assertEqual(cache.currentBytes, makeImage().sizeInBytes())
+
+    def test_discard_file(self):
+        cache = PreviewCache()
+        cache.put(("a", 1), makeImage())
+        cache.put(("b", 1), makeImage())
+        cache.discard("a")
+        self.assertIsNone(cache.get(("a", 1)))
+        self.assertIsNotNone(cache.get(("b", 1)))
+        self.assertEqual(cache.currentBytes, makeImage().sizeInBytes())
+
+    def test_leases_follow_entries(self):
+        size = makeImage().sizeInBytes()
+        leases = MagicMock()
+        cache = PreviewCache(maxBytes=2 * size, leases=leases)
+        images = [makeImage() for _ in range(3)]
+        for bucket, qImg in enumerate(images):
+            cache.put(("a", bucket), qImg)
+        # The evicted image's lease is given back, a hit takes one
+        leases.release.assert_called_once_with(images[0])
+        self.assertIs(cache.get(("a", 2)), images[2])
+        leases.retain.assert_called_once_with(images[2])
+        cache.clear()
+        self.assertEqual(leases.release.call_count, 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,169 @@
+import unittest
+import numpy as np
+from unittest.mock import MagicMock, patch
+import sys
+import os
+import tempfile
+from PyQt6.QtWidgets import QApplication
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+# Caches written by the code under test go to a scratch folder
+CACHE = tempfile.TemporaryDirectory()
+os.environ["MYVIDEOPLAYER_CACHE"] = CACHE.name
+import processTools
+from capturePool import CapturePool
+from previewCache import PreviewCache
+from MyThumbnailDisplay import MyThumbnailDisplay
+
+app = QApplication.instance() or QApplication(sys.argv)
+
+
+class TestPreviewWorker(unittest.TestCase):
+    def tearDown(self):
+        # Mocked captures must not be lent to the next test
+        CapturePool.shared().clear()
+
+    @patch('cv2.VideoCapture')
+    def test_latest_request_wins(self, mock_capture):
+        instance = mock_capture.return_value
+        mock_image = np.zeros((100, 100, 3), np.uint8)
+        instance.read.return_value = (True, mock_image)
+        instance.get.return_value = 100
+
+        cache = PreviewCache()
+        worker = processTools.PreviewWorker(cache)
+        ready = MagicMock()
+        worker.previewReady.connect(ready)
+        worker.open("dummy.mp4")
+        app.processEvents()
+
+        # Three hovers arrive before the worker gets to run
+        for ms in (1000, 2000, 3000):
+            worker.request((0, 0, ms))
+        app.processEvents()
+
+        ready.assert_called_once()
+        self.assertEqual(ready.call_args[0][1], (0, 0, 3000))
+        instance.read.assert_called_once()
+        # The decoded preview is now served from the cache
+        self.assertIsNotNone(worker.cached(3000))
+
+    @patch('cv2.VideoCapture')
+    def test_nothing_opened_until_asked(self, mock_capture):
+        instance = mock_capture.return_value
+        instance.read.return_value = (True, np.zeros((100, 100, 3), np.uint8))
+        instance.get.return_value = 100
+        worker = processTools.PreviewWorker(PreviewCache())
+        worker.request((0, 0, 1000))
+        app.processEvents()
+        mock_capture.assert_not_called()
+        self.assertIsNone(worker.current())
+
+        worker.open("dummy.mp4")
+        worker.request((0, 0, 1000))
+        app.processEvents()
+        mock_capture.assert_called_once_with("dummy.mp4")
+        self.assertIsNotNone(worker.cached(1000))
+        # Closed: the previews of the file are no longer served
+        worker.close()
+        self.assertIsNone(worker.cached(1000))
+        app.processEvents()
+        self.assertEqual(worker.storedThumbnails(), [])
+
+    @patch('cv2.VideoCapture')
+    def test_cancel_drops_pending(self, mock_capture):
+        instance = mock_capture.return_value
+        instance.get.return_value = 100
+        worker = processTools.PreviewWorker(PreviewCache())
+        ready = MagicMock()
+        worker.previewReady.connect(ready)
+        worker.open("dummy.mp4")
+        app.processEvents()
+        worker.request((0, 0, 1000))
+        worker.cancel()
+        app.processEvents()
+        ready.assert_not_called()
+        instance.read.assert_not_called()
+
+    @patch('cv2.VideoCapture')
+    def test_scrub_frame_before_preview(self, mock_capture):
+        instance = mock_capture.return_value
+        instance.read.return_value = (True, np.zeros((100, 100, 3), np.uint8))
+        instance.get.return_value = 100
+        worker = processTools.PreviewWorker(PreviewCache())
+        order = []
+        worker.previewReady.connect(lambda qImg, display: order.append("preview"))
+        worker.scrubReady.connect(
+            lambda qImg, ms: order.append(("scrub", ms, qImg.height())))
+        worker.open("dummy.mp4")
+        app.processEvents()
+        worker.request((0, 0, 500))
+        # Only the newest drag position is decoded, scaled to the surface
+        for ms in (100.0, 200.0, 300.0):
+            worker.scrub(ms, 50)
+        app.processEvents()
+        self.assertEqual(order, [("scrub", 300.0, 50), "preview"])
+
+    @patch('cv2.VideoCapture')
+    def test_prefetch_ahead_of_cursor(self, mock_capture):
+        instance = mock_capture.return_value
+        mock_image = np.zeros((100, 100, 3), np.uint8)
+        instance.read.return_value = (True, mock_image)
+        # 100 frames at 100 fps: one second of video, 250 ms buckets
+        instance.get.return_value = 100
+
+        cache = PreviewCache()
+        worker = processTools.PreviewWorker(cache)
+        worker.open("dummy.mp4")
+        app.processEvents()
+        # Scrubbing forward at one second of media per second
+        worker.prefetch(0, 1000)
+        app.processEvents()
+        self.assertEqual(len(cache), 3)
+        self.assertIsNotNone(worker.cached(500))
+        self.assertIsNone(worker.cached(0))
+
+    @patch('cv2.VideoCapture')
+    def test_prefetch_stops_when_cursor_leaves(self, mock_capture):
+        instance = mock_capture.return_value
+        instance.get.return_value = 100
+        cache = PreviewCache()
+        worker = processTools.PreviewWorker(cache)
+        worker.open("dummy.mp4")
+        app.processEvents()
+        worker.prefetch(0, 1000)
+        worker.stopPrefetch()
+        app.processEvents()
+        instance.read.assert_not_called()
+        self.assertEqual(len(cache), 0)
+
+    @patch('cv2.VideoCapture')
+    def test_zoomed_tiles_decoded_on_request(self, mock_capture):
+        instance = mock_capture.return_value
+        instance.read.return_value = (True, np.zeros((100, 100, 3), np.uint8))
+        # 100000 frames at 25 fps: 4000 seconds
+        props = {processTools.cv2.CAP_PROP_FRAME_COUNT: 100000,
+                 processTools.cv2.CAP_PROP_FPS: 25}
+        instance.get.side_effect = lambda prop: props.get(prop, 100)
+        worker = processTools.PreviewWorker(PreviewCache())
+        worker.open("dummy.mp4")
+        app.processEvents()
+        reel = MyThumbnailDisplay()
+        reel.resize(600, 100)
+        reel.setDuration(4000)
+        requested = []
+        reel.tileRequested.connect(requested.append)
+        reel.tileRequested.connect(worker.requestTile)
+        worker.tileReady.connect(lambda qImg, ms, fPath: reel.addThumbnail(qImg, ms))
+        # 15 second tiles: nothing added covers them
+        reel.setZoom(reel.tileSpans().index(15000))
+        self.assertEqual(reel.tileItems(), 0)
+        app.processEvents()
+        # Every tile asked for got a thumbnail
+        self.assertGreater(reel.tileItems(), 0)
+        self.assertTrue(all(reel.atlasSource(ms) for ms in requested))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+import unittest
+from unittest.mock import patch
+import sys
+import os
+import tempfile
+import cv2
+import numpy as np
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+# Caches written by the code under test go to a scratch folder
+CACHE = tempfile.TemporaryDirectory()
+os.environ["MYVIDEOPLAYER_CACHE"] = CACHE.name
+from processTools import ReelExtractor
+from PyQt6.QtGui import QImage, QColor
+from spriteSheet import exportSprites
+
+
+def makeClip(path, frames=60, size=(64, 32)):
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"MJPG"), 25, size)
+    for i in range(frames):
+        writer.write(np.full((size[1], size[0], 3), i * 4, np.uint8))
+    writer.release()
+
+
+class TestReelExtractor(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.TemporaryDirectory()
+        cls.path = os.path.join(cls.tmp.name, "clip.avi")
+        makeClip(cls.path)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp.cleanup()
+
+    def test_reel_from_process_pool(self):
+        extract = ReelExtractor(self.path, count=12, workers=2)
+        images = {}
+        extract.reelImage.connect(lambda qImg, pos: images.update({pos: qImg}))
+        extract.run()
+        self.assertEqual(sorted(images), list(range(12)))
+        self.assertEqual((images[3].width(), images[3].height()), (160, 80))
+        # Every range decoded its own frames: brightness grows with time
+        self.assertLess(images[1].pixelColor(5, 5).red(),
+                        images[10].pixelColor(5, 5).red())
+        self.assertAlmostEqual(extract.positionMs(5), 5 * 5 / 25 * 1000)
+
+    def test_stopped_extraction_finishes(self):
+        extract = ReelExtractor(self.path, count=12, workers=1)
+        finished = []
+        extract.finished.connect(lambda: finished.append(True))
+        extract.stop()
+        extract.run()
+        self.assertEqual(finished, [True])
+
+    def test_reel_from_proxy(self):
+        proxy = os.path.join(self.tmp.name, "proxy.avi")
+        makeClip(proxy, size=(32, 32))
+        extract = ReelExtractor(self.path, count=12, workers=1)
+        images = []
+        extract.reelImage.connect(lambda qImg, pos: images.append(qImg))
+        # Looked up by the extraction itself, not by its creator
+        with patch('processTools.cachedProxy', return_value=proxy) as lookup:
+            extract.run()
+        lookup.assert_called_once_with(self.path)
+        self.assertEqual((extract.source, extract.fPath), (self.path, proxy))
+        self.assertEqual(images[0].width(), 80)
+
+    def test_reel_from_thumbnail_track(self):
+        media = os.path.join(self.tmp.name, "published.mp4")
+        thumbnails = []
+        for i in range(10):
+            qImg = QImage(142, 80, QImage.Format.Format_RGB32)
+            qImg.fill(QColor(i * 20, 0, 0))
+            thumbnails.append((i * 6000, qImg))
+        exportSprites(os.path.join(self.tmp.name, "published.vtt"), thumbnails, 60000)
+        extract = ReelExtractor(media, count=20, workers=1)
+        images = {}
+        extract.reelImage.connect(lambda qImg, pos: images.update({pos: qImg}))
+        # No decoding: the media file does not even exist
+        with patch('processTools.CapturePool.shared') as pool:
+            extract.run()
+        pool.assert_not_called()
+        self.assertEqual(sorted(images), list(range(20)))
+        self.assertAlmostEqual(extract.positionMs(5), 15000)
+        self.assertEqual(images[5].size(), thumbnails[0][1].size())
+        self.assertAlmostEqual(images[5].pixelColor(70, 40).red(), 40, delta=8)
+
+    def test_no_reel_for_network_media(self):
+        extract = ReelExtractor("http://example.invalid/clip.mp4", workers=1)
+        finished = []
+        extract.finished.connect(lambda: finished.append(True))
+        with patch('processTools.SpriteTrack.forMedia', return_value=None), \
+                patch('processTools.CapturePool.shared') as pool:
+            extract.run()
+        pool.assert_not_called()
+        self.assertEqual(finished, [True])
+
+
+if __name__ == '__main__':
+    unittest.main()
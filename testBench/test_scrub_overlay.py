@@ -0,0 +1,51 @@
+import unittest
+import sys
+import os
+from PyQt6.QtWidgets import QApplication, QWidget
+from PyQt6.QtGui import QImage
+from PyQt6.QtCore import Qt
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from MyScrubOverlay import MyScrubOverlay
+
+app = QApplication.instance() or QApplication(sys.argv)
+
+
+class TestScrubOverlay(unittest.TestCase):
+    def test_frame_covers_parent_letterboxed(self):
+        parent = QWidget()
+        parent.resize(200, 200)
+        parent.show()
+        overlay = MyScrubOverlay(parent)
+        self.assertFalse(overlay.isVisible())
+        frame = QImage(160, 80, QImage.Format.Format_RGB32)
+        frame.fill(Qt.GlobalColor.white)
+        overlay.showFrame(frame)
+        self.assertTrue(overlay.isVisible())
+        self.assertEqual(overlay.geometry(), parent.rect())
+        shot = overlay.grab().toImage()
+        # 2:1 frame in a square: black bars above and below
+        self.assertEqual(shot.pixelColor(100, 10).name(), "#000000")
+        self.assertEqual(shot.pixelColor(100, 100).name(), "#ffffff")
+        overlay.clear()
+        self.assertFalse(overlay.isVisible())
+        self.assertIsNone(overlay.frame())
+
+    def test_sibling_covered(self):
+        parent = QWidget()
+        parent.resize(300, 200)
+        video = QWidget(parent)
+        video.setGeometry(10, 20, 200, 100)
+        overlay = MyScrubOverlay(parent)
+        overlay.setCovered(video)
+        parent.show()
+        overlay.showFrame(QImage(160, 80, QImage.Format.Format_RGB32))
+        self.assertEqual(overlay.geometry(), video.geometry())
+        video.setGeometry(0, 0, 250, 150)
+        overlay.cover()
+        self.assertEqual(overlay.geometry(), video.geometry())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+import unittest
+from unittest.mock import patch
+import sys
+import os
+import shutil
+import tempfile
+import cv2
+import numpy as np
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+# Caches written by the code under test go to a scratch folder
+CACHE = tempfile.TemporaryDirectory()
+os.environ["MYVIDEOPLAYER_CACHE"] = CACHE.name
+from scrubProxy import ProxyBuilder, cachedProxy
+
+
+def makeClip(path, frames=50, size=(640, 360)):
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"MJPG"), 25, size)
+    for i in range(frames):
+        writer.write(np.full((size[1], size[0], 3), i * 4, np.uint8))
+    writer.release()
+
+
+@unittest.skipIf(shutil.which("ffmpeg") is None, "ffmpeg not installed")
+class TestProxyBuilder(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "clip.avi")
+        makeClip(self.path)
+        self.target = os.path.join(self.tmp.name, "proxy.mkv")
+        patcher = patch('scrubProxy.proxyPath', return_value=self.target)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_proxy_is_registered(self):
+        builder = ProxyBuilder(self.path)
+        builder.minSourceHeight = 0
+        ready, progress = [], []
+        builder.proxyReady.connect(lambda f, p: ready.append((f, p)))
+        builder.progress.connect(lambda f, done: progress.append(done))
+        builder.run()
+        self.assertEqual(ready, [(self.path, self.target)])
+        self.assertEqual(progress[-1], 1.0)
+        self.assertEqual(cachedProxy(self.path), self.target)
+        self.assertFalse(os.path.exists(self.target + ".part"))
+        # Small, and every frame decodable on its own
+        capture = cv2.VideoCapture(self.target)
+        self.assertEqual(capture.get(cv2.CAP_PROP_FRAME_HEIGHT), 240)
+        capture.set(cv2.CAP_PROP_POS_FRAMES, 37)
+        self.assertTrue(capture.read()[0])
+
+    def test_cancelled_job_leaves_no_proxy(self):
+        builder = ProxyBuilder(self.path)
+        builder.minSourceHeight = 0
+        finished = []
+        builder.finished.connect(lambda: finished.append(True))
+        builder.cancel()
+        builder.run()
+        self.assertEqual(finished, [True])
+        self.assertIsNone(cachedProxy(self.path))
+
+    def test_small_sources_are_skipped(self):
+        builder = ProxyBuilder(self.path)
+        ready = []
+        builder.proxyReady.connect(lambda f, p: ready.append(p))
+        builder.run()
+        self.assertEqual(ready, [])
+        self.assertIsNone(cachedProxy(self.path))
+
+
+if __name__ == '__main__':
+    unittest.main()
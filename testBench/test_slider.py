@@ -1,7 +1,6 @@
 
 import unittest
 from PyQt6.QtWidgets import QApplication
-from PyQt6.QtCore import QPoint
 import sys
 import time
 from unittest.mock import MagicMock
@@ -85,5 +84,59 @@ class TestMySlider(unittest.TestCase):
         expected_time = 50 * 1000 # 50s * 1000ms
         self.assertAlmostEqual(args[2], expected_time, delta=100)
 
+    def test_scrub_motion_velocity(self):
+        motion_mock = MagicMock()
+        self.slider.scrubMotion.connect(motion_mock)
+        self.slider.enterEvent(None)
+
+        from PyQt6.QtGui import QMouseEvent
+        from PyQt6.QtCore import QEvent, Qt, QPointF
+        for x in (10.0, 20.0):
+            event = QMouseEvent(
+                QEvent.Type.MouseMove, QPointF(x, 10.0), QPointF(x, 10.0),
+                Qt.MouseButton.NoButton, Qt.MouseButton.NoButton,
+                Qt.KeyboardModifier.NoModifier)
+            self.slider.mouseMoveEvent(event)
+            time.sleep(0.01)
+
+        self.assertEqual(motion_mock.call_count, 2)
+        ms, velocity = motion_mock.call_args[0]
+        self.assertAlmostEqual(ms, 20 * 1000, delta=100)
+        # Moving right: positive velocity
+        self.assertGreater(velocity, 0)
+
+    def test_interval_follows_latency(self):
+        for _ in range(20):
+            self.slider.reportLatency(0.001)
+        self.assertEqual(self.slider.interval(), MySlider.minInterval)
+        for _ in range(20):
+            self.slider.reportLatency(0.3)
+        self.assertAlmostEqual(self.slider.interval(), 0.3, delta=0.01)
+        self.slider.reportLatency(10)
+        self.assertEqual(self.slider.interval(), MySlider.maxInterval)
+
+    def test_trailing_preview_where_cursor_rests(self):
+        show_mock = MagicMock()
+        self.slider.showPreview.connect(show_mock)
+        self.slider.enterEvent(None)
+
+        from PyQt6.QtGui import QMouseEvent
+        from PyQt6.QtCore import QEvent, Qt, QPointF
+        # Within the throttle interval of entering: held back
+        event = QMouseEvent(
+            QEvent.Type.MouseMove, QPointF(30.0, 10.0), QPointF(30.0, 10.0),
+            Qt.MouseButton.NoButton, Qt.MouseButton.NoButton,
+            Qt.KeyboardModifier.NoModifier)
+        self.slider.mouseMoveEvent(event)
+        show_mock.assert_not_called()
+
+        deadline = time.time() + 1
+        while not show_mock.called and time.time() < deadline:
+            app.processEvents()
+            time.sleep(0.005)
+        show_mock.assert_called_once()
+        self.assertAlmostEqual(show_mock.call_args[0][0][2], 30 * 1000, delta=100)
+
+
 if __name__ == '__main__':
     unittest.main()
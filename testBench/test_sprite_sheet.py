@@ -0,0 +1,73 @@
+import unittest
+import sys
+import os
+import tempfile
+from unittest.mock import patch
+from PyQt6.QtGui import QImage, QColor
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+# Caches written by the code under test go to a scratch folder
+CACHE = tempfile.TemporaryDirectory()
+os.environ["MYVIDEOPLAYER_CACHE"] = CACHE.name
+import processTools
+from spriteSheet import SpriteTrack, exportSprites, sidecarPath
+
+
+def makeImage(gray):
+    img = QImage(142, 80, QImage.Format.Format_BGR888)
+    img.fill(QColor(gray, gray, gray))
+    return img
+
+
+class TestSpriteSheet(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.media = os.path.join(self.tmp.name, "clip.mp4")
+        open(self.media, "wb").close()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_export_and_import(self):
+        thumbnails = [(ms, makeImage(ms // 1000)) for ms in range(0, 250000, 1000)]
+        vtt = sidecarPath(self.media)
+        self.assertEqual(exportSprites(vtt, reversed(thumbnails), 250000,
+                                       columns=10, rows=10), 250)
+        # 250 thumbnails in 100 per sheet
+        self.assertTrue(os.path.exists(os.path.join(self.tmp.name, "clip_2.jpg")))
+
+        track = SpriteTrack.forMedia(self.media)
+        self.assertEqual(len(track), 250)
+        self.assertEqual((track.width, track.height), (142, 80))
+        img = track.image(123400)
+        self.assertEqual((img.width(), img.height()), (142, 80))
+        self.assertAlmostEqual(img.pixelColor(70, 40).red(), 123, delta=6)
+        self.assertIsNone(track.image(250000))
+
+    def test_parse_short_timestamps(self):
+        track = SpriteTrack.parse("http://host/v/track.vtt",
+                                  "WEBVTT\n\n00:01.000 --> 00:02.500\n"
+                                  "s.jpg#xywh=10,0,20,10\n")
+        self.assertEqual(len(track), 1)
+        self.assertEqual(track.durationMs, 2500)
+        self.assertIsNone(SpriteTrack.parse("x.vtt", "not a track"))
+
+    def test_sidecar_of_url(self):
+        self.assertEqual(sidecarPath("http://host:80/media/a.ts?token=1"),
+                         "http://host:80/media/a.vtt")
+
+    @patch('cv2.VideoCapture')
+    def test_preview_from_track_without_decoding(self, mock_capture):
+        exportSprites(sidecarPath(self.media),
+                      [(0, makeImage(10)), (5000, makeImage(200))], 10000)
+        # The capture cannot read the media
+        mock_capture.return_value.get.return_value = 0
+        pp = processTools.PreviewPosition(self.media)
+        qimg = pp.extract(pp.frameAt(7000))
+        self.assertGreater(qimg.pixelColor(5, 5).red(), 150)
+        mock_capture.return_value.read.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,21 +1,40 @@
 
 import unittest
+import time
+import numpy as np
 from unittest.mock import MagicMock, patch
 import sys
 import os
+import tempfile
 
 # Add project root to path
 sys.path.append("..")
+# Caches written by the code under test go to a scratch folder
+CACHE = tempfile.TemporaryDirectory()
+os.environ["MYVIDEOPLAYER_CACHE"] = CACHE.name
 import processTools
+from capturePool import CapturePool
+from PyQt6.QtCore import QObject, Qt, pyqtSignal
+from PyQt6.QtGui import QImage
+from PyQt6.QtWidgets import QApplication
+
+app = QApplication.instance() or QApplication(sys.argv)
+
+
+class RingEmitter(QObject):
+    image = pyqtSignal(QImage, int)
+
 
 class TestThumbnail(unittest.TestCase):
+    def tearDown(self):
+        # Mocked captures must not be lent to the next test
+        CapturePool.shared().clear()
+
     @patch('cv2.VideoCapture')
     def test_preview_position_extract(self, mock_capture):
         # Setup mock
         instance = mock_capture.return_value
-        mock_image = MagicMock()
-        mock_image.shape = (100, 100, 3)
-        mock_image.data = b'0'*100*100*3
+        mock_image = np.zeros((100, 100, 3), np.uint8)
         instance.read.return_value = (True, mock_image) # success, image
         instance.get.return_value = 100 # frame count
         
@@ -28,5 +47,136 @@ class TestThumbnail(unittest.TestCase):
         instance.set.assert_called_with(processTools.cv2.CAP_PROP_POS_FRAMES, 50)
         self.assertIsNotNone(qimg)
 
+    @patch('cv2.VideoCapture')
+    def test_extract_many_single_forward_pass(self, mock_capture):
+        instance = mock_capture.return_value
+        mock_image = np.zeros((100, 100, 3), np.uint8)
+        instance.read.return_value = (True, mock_image)
+        instance.get.return_value = 100
+
+        pp = processTools.PreviewPosition("dummy.mp4")
+        images = pp.extractMany([30, 10, 20])
+        self.assertEqual(sorted(images), [10, 20, 30])
+        # One seek to the first target, the others are reached decoding forward
+        instance.set.assert_called_once_with(processTools.cv2.CAP_PROP_POS_FRAMES, 10)
+        self.assertEqual(instance.grab.call_count, 18)
+
+    @patch('processTools.ffmpegAvailable', return_value=True)
+    @patch('processTools.decodeThumbnail')
+    @patch('cv2.VideoCapture')
+    def test_large_source_hover_uses_capture(self, mock_capture, mock_decode, _):
+        instance = mock_capture.return_value
+        instance.read.return_value = (True, np.zeros((2160, 3840, 3), np.uint8))
+        instance.get.return_value = 2160
+
+        pp = processTools.PreviewPosition("dummy.mp4")
+        self.assertEqual(pp.extract(50).height(), 80)
+        # No ffmpeg process per hover, even for 4K sources
+        mock_decode.assert_not_called()
+        instance.read.assert_called_once_with()
+
+    def test_read_sequential_grabs_between_targets(self):
+        capture = MagicMock()
+        capture.get.return_value = 0
+        capture.grab.return_value = True
+        capture.retrieve.return_value = (True, np.zeros((4, 4, 3), np.uint8))
+        frames = [i for i, _ in processTools.readSequential(capture, [0, 10, 20])]
+        self.assertEqual(frames, [0, 10, 20])
+        # One pass: every frame up to the last target grabbed once, no seek
+        self.assertEqual(capture.grab.call_count, 21)
+        self.assertEqual(capture.retrieve.call_count, 3)
+        capture.set.assert_not_called()
+
+    def test_read_keyframes_with_index(self):
+        capture = MagicMock()
+        capture.read.return_value = (True, np.zeros((4, 4, 3), np.uint8))
+        index = MagicMock()
+        index.nearestKeyframe.side_effect = lambda frame: 250 * round(frame / 250)
+        index.timeAt.side_effect = lambda frame: frame * 40
+        with patch.object(processTools, "av", None):
+            frames = [i for i, _ in processTools.readKeyframes(
+                "dummy.mp4", [0, 30, 200, 260], 25, capture, index)]
+        self.assertEqual(frames, [0, 30, 200, 260])
+        # Only the two keyframes are decoded
+        self.assertEqual([c.args for c in capture.set.call_args_list],
+                         [(processTools.cv2.CAP_PROP_POS_MSEC, 0),
+                          (processTools.cv2.CAP_PROP_POS_MSEC, 10000)])
+        self.assertEqual(capture.read.call_count, 2)
+
+    def test_extract_threads_share_reel(self):
+        workers = [processTools.ExtractImages("dummy.mp4", 3, pos) for pos in range(3)]
+        for sequential in (False, True):
+            parts = []
+            for worker in workers:
+                worker.frameCount, worker.frameInterval = 1000, 10
+                worker.sequential = sequential
+                parts.append(list(worker.targets()))
+            self.assertEqual(sorted(sum(parts, [])), list(range(0, 1000, 10)))
+        # Streaming threads each cover a third of the file, not all of it
+        self.assertEqual([(p[0], p[-1]) for p in parts], [(0, 320), (330, 650), (660, 990)])
+
+    def test_sequential_chosen_by_seek_cost(self):
+        capture = MagicMock()
+        capture.get.return_value = 0
+        capture.grab.side_effect = lambda: time.sleep(0.001) or True
+        capture.set.side_effect = lambda *args: time.sleep(0.05)
+        self.assertTrue(processTools.sequentialReadCheaper(capture, 5))
+        self.assertFalse(processTools.sequentialReadCheaper(capture, 500))
+        # A long GOP makes seeking expensive even if one seek was quick
+        capture.set.side_effect = None
+        self.assertTrue(processTools.sequentialReadCheaper(capture, 5, gop=250))
+        # Put back where it was
+        capture.set.assert_called_with(processTools.cv2.CAP_PROP_POS_FRAMES, 0)
+
+    def test_keyframes_chosen_by_decode_cost(self):
+        capture = MagicMock()
+        capture.get.return_value = 0
+        capture.grab.side_effect = lambda: time.sleep(0.001) or True
+        # Intra-only: a seek costs about one decode
+        self.assertFalse(processTools.keyframesCheaper(capture, 500, gop=1))
+        # Close targets stream cheaply whatever a seek costs
+        capture.set.side_effect = lambda *args: time.sleep(0.05)
+        self.assertFalse(processTools.keyframesCheaper(capture, 5))
+        self.assertTrue(processTools.keyframesCheaper(capture, 500))
+        # A long GOP makes exact frames expensive even if one seek was quick
+        capture.set.side_effect = None
+        self.assertTrue(processTools.keyframesCheaper(capture, 500, gop=250))
+
+    def test_ring_buffers_leased_until_released(self):
+        # Queued signals share a QImage's pixels with the sender: a buffer
+        # is not written again while its image waits in the event queue
+        emitter = RingEmitter()
+        received = []
+        emitter.image.connect(lambda image, i: received.append((image, i)),
+                              Qt.ConnectionType.QueuedConnection)
+        ring = processTools.ThumbnailRing(4, 2, size=2)
+        for i in range(3):
+            emitter.image.emit(ring.resize(np.full((8, 16, 3), 8 * i, np.uint8)), i)
+        app.processEvents()
+        self.assertEqual([(image.pixelColor(0, 0).red(), i) for image, i in received],
+                         [(8 * i, i) for i in range(3)])
+        self.assertEqual(len(ring), 3)
+        # Released buffers are written again instead of new ones
+        buffers = {int(image.constBits()) for image, _ in received}
+        for image, _ in received:
+            processTools.ThumbnailRing.release(image)
+        for i in range(20):
+            image = ring.resize(np.full((8, 16, 3), i, np.uint8))
+            self.assertIn(int(image.constBits()), buffers)
+            processTools.ThumbnailRing.release(image)
+        self.assertEqual(len(ring), 3)
+
+    def test_closed_ring_waits_for_leases(self):
+        closed = []
+        ring = processTools.ThumbnailRing(4, 2, onClosed=lambda: closed.append(True))
+        image = ring.resize(np.zeros((8, 16, 3), np.uint8))
+        processTools.ThumbnailRing.retain(image)
+        ring.close()
+        processTools.ThumbnailRing.release(image)
+        self.assertEqual(closed, [])
+        processTools.ThumbnailRing.release(image)
+        self.assertEqual(closed, [True])
+
+
 if __name__ == '__main__':
     unittest.main()
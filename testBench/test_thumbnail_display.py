@@ -0,0 +1,125 @@
+import unittest
+import sys
+import os
+from unittest.mock import MagicMock, patch
+from PyQt6.QtWidgets import QApplication
+from PyQt6.QtGui import QImage
+from PyQt6.QtCore import QRectF
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from MyThumbnailDisplay import MyThumbnailDisplay, ReelAtlas
+
+app = QApplication.instance() or QApplication(sys.argv)
+
+
+def makeImage():
+    return QImage(142, 80, QImage.Format.Format_BGR888)
+
+
+class TestMyThumbnailDisplay(unittest.TestCase):
+    def setUp(self):
+        self.reel = MyThumbnailDisplay()
+        self.reel.resize(600, 100)
+        # 10 hour recording
+        self.reel.setDuration(10 * 3600)
+
+    def test_only_tiles_near_viewport(self):
+        for pos in range(MyThumbnailDisplay.reelCount):
+            self.reel.addImage(makeImage(), pos)
+        self.assertEqual(self.reel.tileCount(), MyThumbnailDisplay.fitTiles)
+        kept = self.reel.tileItems()
+        self.assertLess(kept, 20)
+        self.reel.horizontalScrollBar().setValue(
+            self.reel.horizontalScrollBar().maximum())
+        # Scrolling swaps tiles instead of accumulating them
+        self.assertEqual(self.reel.tileItems(), kept)
+        # Reel and playhead, thumbnails are packed in one atlas page
+        self.assertEqual(len(self.reel.display.items()), 2)
+        self.assertEqual(self.reel.atlasPages(), 1)
+
+    def test_atlas_recycles_cells(self):
+        from MyThumbnailDisplay import ReelAtlas
+        atlas = ReelAtlas(142, 80)
+        atlas.maxPages = 1
+        capacity = atlas.columns * atlas.rows
+        for key in range(capacity + 1):
+            atlas.insert(key, makeImage())
+        self.assertEqual(len(atlas.pages), 1)
+        self.assertEqual(len(atlas), capacity)
+        # The least recently used thumbnail made room
+        self.assertIsNone(atlas.source(0))
+        page, rect = atlas.source(capacity)
+        self.assertEqual((rect.width(), rect.height()), (142, 80))
+
+    def test_paint_from_atlas(self):
+        from PyQt6.QtGui import QPainter, QColor
+        img = makeImage()
+        img.fill(QColor(200, 10, 10))
+        self.reel.addImage(img, 0)
+        out = QImage(142, 80, QImage.Format.Format_RGB32)
+        out.fill(QColor(0, 0, 0))
+        painter = QPainter(out)
+        self.reel.display.render(painter, QRectF(0, 0, 142, 80),
+                                 QRectF(0, 0, 142, 80))
+        painter.end()
+        self.assertGreater(out.pixelColor(20, 50).red(), 150)
+
+    def test_zoom_to_minutes(self):
+        levels = self.reel.tileSpans()
+        self.reel.setZoom(levels.index(60000))
+        self.assertEqual(self.reel.tileMs(), 60000)
+        self.assertEqual(self.reel.tileCount(), 600)
+        self.assertLess(self.reel.tileItems() + 1, 20)
+
+    def test_tiles_from_source_or_requested(self):
+        requested = MagicMock()
+        self.reel.tileRequested.connect(requested)
+        source = MagicMock(side_effect=lambda ms: makeImage() if ms < 10**6 else None)
+        release = MagicMock()
+        self.reel.setSource(source, release)
+        self.assertTrue(source.called)
+        # Every image drawn from the source is handed back
+        self.assertEqual(release.call_count, len(
+            [c for c in source.call_args_list if c.args[0] < 10**6]))
+        # Tiles the source could not fill are asked for once
+        self.assertTrue(requested.called)
+        count = requested.call_count
+        self.reel.horizontalScrollBar().setValue(1)
+        self.assertEqual(requested.call_count, count)
+        ms = requested.call_args[0][0]
+        self.reel.addThumbnail(makeImage(), ms)
+        self.assertGreater(self.reel.tileItems(), 0)
+
+    def test_thumbnails_blitted_on_arrival(self):
+        from PyQt6.QtGui import QColor
+        img = makeImage()
+        img.fill(QColor(10, 200, 10))
+        # Last tile, far out of view: drawn into the atlas all the same
+        ms = (MyThumbnailDisplay.fitTiles - 0.5) * self.reel.tileMs()
+        self.reel.addThumbnail(img, ms)
+        del img
+        page, rect = self.reel.atlasSource(ms)
+        self.assertGreater(page.toImage().pixelColor(
+            rect.center().toPoint()).green(), 150)
+
+    def test_recycled_thumbnails_come_from_source(self):
+        with patch.object(ReelAtlas, 'maxPages', 1):
+            self.reel.clearDisplay()
+            self.reel.setDuration(10 * 3600)
+            capacity = ReelAtlas(142, 80).columns * ReelAtlas(142, 80).rows
+            span = self.reel.tileMs()
+            self.reel.addThumbnail(makeImage(), span / 2)
+            self.assertGreater(self.reel.tileItems(), 0)
+            # Far out of view: recycles the first cell
+            for i in range(capacity):
+                self.reel.addThumbnail(makeImage(), (50 + i / 10) * span)
+            # Only what the atlas holds is kept
+            self.assertIsNone(self.reel.atlasSource(span / 2))
+            source = MagicMock(return_value=makeImage())
+            self.reel.setSource(source)
+            self.assertIn((span / 2,), [c.args for c in source.call_args_list])
+
+
+if __name__ == '__main__':
+    unittest.main()
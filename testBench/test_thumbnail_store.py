@@ -0,0 +1,97 @@
+import unittest
+import sys
+import os
+import tempfile
+from unittest.mock import patch
+from PyQt6.QtGui import QImage, QColor
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+# Caches written by the code under test go to a scratch folder
+CACHE = tempfile.TemporaryDirectory()
+os.environ["MYVIDEOPLAYER_CACHE"] = CACHE.name
+from thumbnailStore import ThumbnailStore
+
+
+class TestThumbnailStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "clip.thumbs")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_put_and_reopen(self):
+        store = ThumbnailStore(self.path, 142, 80, 60000)
+        bucket = store.bucketOf(30000)
+        self.assertFalse(store.has(bucket))
+        self.assertIsNone(store.image(bucket))
+
+        img = QImage(142, 80, QImage.Format.Format_BGR888)
+        img.fill(QColor(10, 20, 30))
+        store.put(bucket, img)
+        self.assertEqual(store.image(bucket).pixelColor(5, 5), QColor(10, 20, 30))
+
+        # A new session maps the same file and finds the thumbnail
+        reopened = ThumbnailStore(self.path, 142, 80, 60000)
+        self.assertTrue(reopened.has(bucket))
+        self.assertEqual(reopened.image(bucket).pixelColor(141, 79),
+                         QColor(10, 20, 30))
+
+    def test_layout_change_resets(self):
+        store = ThumbnailStore(self.path, 142, 80, 60000)
+        img = QImage(142, 80, QImage.Format.Format_BGR888)
+        store.put(0, img)
+        other = ThumbnailStore(self.path, 106, 80, 60000)
+        self.assertFalse(other.has(0))
+        # The old mapping is not truncated under the store still using it
+        self.assertTrue(store.has(0))
+        self.assertIsNotNone(store.image(0))
+        store.close()
+
+    def test_open_is_bounded(self):
+        media = []
+        for i in range(ThumbnailStore.maxOpened + 2):
+            media.append(os.path.join(self.tmp.name, f"clip{i}.mp4"))
+            with open(media[-1], "wb") as f:
+                f.write(bytes([i]))
+        with patch('thumbnailStore.cacheDirectory', return_value=self.tmp.name), \
+                patch.object(ThumbnailStore, '_opened', type(ThumbnailStore._opened)()):
+            first = ThumbnailStore.open(media[0], 142, 80, 60000)
+            self.assertIs(ThumbnailStore.open(media[0], 142, 80, 60000), first)
+            # A new layout closes the store it replaces
+            with patch.object(ThumbnailStore, 'close') as close:
+                resized = ThumbnailStore.open(media[0], 106, 80, 60000)
+                close.assert_called_once_with()
+            self.assertIsNot(resized, first)
+            for path in media[1:]:
+                ThumbnailStore.open(path, 142, 80, 60000)
+            self.assertEqual(len(ThumbnailStore._opened), ThumbnailStore.maxOpened)
+            for store in ThumbnailStore._opened.values():
+                store.close()
+
+    def test_reads_after_close(self):
+        store = ThumbnailStore(self.path, 142, 80, 60000)
+        img = QImage(142, 80, QImage.Format.Format_BGR888)
+        for bucket in range(3):
+            store.put(bucket, img)
+        thumbnails = store.thumbnails()
+        self.assertEqual(next(thumbnails)[0], 0)
+        # Closed by the decoding thread while the GUI thread reads
+        store.close()
+        self.assertEqual(list(thumbnails), [])
+        self.assertFalse(store.has(1))
+        self.assertIsNone(store.image(1))
+
+    def test_bucket_bounds(self):
+        store = ThumbnailStore(self.path, 142, 80, 10 ** 8)
+        self.assertLessEqual(store.bucketCount, ThumbnailStore.maxBuckets)
+        self.assertEqual(store.bucketOf(-5), 0)
+        self.assertEqual(store.bucketOf(10 ** 9), store.bucketCount - 1)
+
+    def test_no_store_for_missing_media(self):
+        self.assertIsNone(ThumbnailStore.open("dummy.mp4", 142, 80, 60000))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,251 @@
+"""
+thumbnailStore.py - Persistent Memory-Mapped Preview Thumbnails
+
+This module keeps fixed-size preview thumbnails of a media file in a single
+memory-mapped cache file, one slot per time bucket. Thumbnails decoded while
+scrubbing are written into the mapping and survive across sessions, so
+reopening a file that was already scrubbed gives previews without decoding.
+
+Slots are read and written in place through the mapping, and resident
+memory stays flat no matter how many thumbnails exist since the pages belong
+to the OS page cache. Images returned are copies of a slot: they are handed
+to the GUI thread and must outlive the mapping. The GUI thread also reads
+slots itself while the decoding thread may close the store, so reads and
+close() are serialized.
+
+File layout:
+- Header: magic, width, height, stride, bucket length (ms), bucket count
+- Validity table: one byte per bucket
+- Slots: bucket count * (height * stride) bytes of BGR888 pixels
+
+Key Classes:
+- ThumbnailStore: Memory-mapped thumbnail slots of one media file
+
+Dependencies:
+- mmap, numpy: In-place views of the cache file
+- PyQt6: QImage wrappers
+"""
+
+import math
+import mmap
+import os.path
+import struct
+import threading
+from collections import OrderedDict
+import numpy as np
+from PyQt6.QtGui import QImage
+from cacheTools import cacheDirectory
+from cacheTools import fileKey
+from cacheTools import touchEntry
+from cacheTools import trimCache
+import logging
+logger = logging.getLogger(__name__)
+
+
+# ===============================================================================
+# ThumbnailStore- Memory-mapped thumbnail slots of one media file
+# ===============================================================================
+class ThumbnailStore(object):
+    """
+    Fixed-size thumbnail slots of a media file backed by a memory-mapped file.
+
+    Attributes:
+    - width, height: Thumbnail size in pixels
+    - stride: Bytes per thumbnail scanline (32-bit aligned for QImage)
+    - bucketMs: Length of the time bucket covered by one slot
+    - bucketCount: Number of slots
+    """
+
+    MAGIC = b"MVPTHMB1"
+    HEADER = struct.Struct("<8s5I")
+    # Shortest bucket and largest slot count of a store
+    minBucketMs = 250
+    maxBuckets = 2048
+    # Stores mapped in this process, by cache file path (least recent first)
+    _opened = OrderedDict()
+    maxOpened = 8
+
+    def __init__(self, path, width, height, durationMs):
+        """
+        Maps (creating or resetting if needed) a thumbnail cache file.
+
+        Args:
+            path (str): Cache file path
+            width (int): Thumbnail width in pixels
+            height (int): Thumbnail height in pixels
+            durationMs (float): Media duration in milliseconds
+        """
+        self.path = path
+        self.width = width
+        self.height = height
+        self.stride = (width * 3 + 3) & ~3
+        self.bucketMs = max(self.minBucketMs,
+                            math.ceil(durationMs / self.maxBuckets))
+        self.bucketCount = max(1, math.ceil(durationMs / self.bucketMs))
+        self.__slotSize = self.height * self.stride
+        # Readers on other threads against close()
+        self.__lock = threading.Lock()
+        # Slots start on a page boundary after header and validity table
+        dataOffset = self.HEADER.size + self.bucketCount
+        dataOffset = math.ceil(dataOffset / mmap.PAGESIZE) * mmap.PAGESIZE
+        size = dataOffset + self.bucketCount * self.__slotSize
+        header = self.HEADER.pack(self.MAGIC, self.width, self.height,
+                                  self.stride, self.bucketMs, self.bucketCount)
+        if not self.__matches(path, header, size):
+            # New file or a different layout: start over in a new file, as
+            # other stores may still map the old one (sparse file)
+            part = path + ".part"
+            with open(part, "wb") as f:
+                f.truncate(size)
+                f.write(header)
+            os.replace(part, path)
+        with open(path, "r+b") as f:
+            self.__map = mmap.mmap(f.fileno(), size)
+        self.__valid = np.frombuffer(self.__map, np.uint8, self.bucketCount,
+                                     self.HEADER.size)
+        self.__slots = np.frombuffer(
+            self.__map, np.uint8, self.bucketCount * self.__slotSize,
+            dataOffset).reshape(self.bucketCount, self.height, self.stride)
+
+    @staticmethod
+    def __matches(path, header, size):
+        """
+        Tells whether a cache file exists with the given header and size.
+        """
+        try:
+            with open(path, "rb") as f:
+                return (f.read(len(header)) == header
+                        and os.fstat(f.fileno()).st_size == size)
+        except FileNotFoundError:
+            return False
+
+    def close(self):
+        """
+        Unmaps the cache file; the store is unusable after.
+
+        Views returned by slot() that are still alive keep the mapping
+        until they are collected.
+        """
+        with self.__lock:
+            self.__valid = self.__slots = None
+            try:
+                self.__map.close()
+            except BufferError:
+                pass
+
+    @classmethod
+    def open(cls, fPath, width, height, durationMs):
+        """
+        Returns the thumbnail store of a media file.
+
+        Args:
+            fPath (str): Path (or network URL) of the media
+            width (int): Thumbnail width in pixels
+            height (int): Thumbnail height in pixels
+            durationMs (float): Media duration in milliseconds
+
+        Returns:
+            ThumbnailStore: The store, or None if it cannot be used
+        """
+        # Only real media gets a persistent store
+        if not (os.path.isfile(fPath) or "://" in fPath) or durationMs <= 0:
+            return None
+        try:
+            path = os.path.join(cacheDirectory("thumbnails"),
+                                fileKey(fPath) + ".thumbs")
+            store = cls._opened.pop(path, None)
+            if store is not None and (store.width, store.height) != (width, height):
+                store.close()
+                store = None
+            if store is None:
+                store = cls(path, width, height, durationMs)
+                # Least recently used stores go over the disk budget,
+                # those mapped here stay
+                touchEntry(path)
+                trimCache("thumbnails", keep=[path, *cls._opened])
+            cls._opened[path] = store
+            while len(cls._opened) > cls.maxOpened:
+                cls._opened.popitem(last=False)[1].close()
+            return store
+        except (OSError, ValueError) as ex:
+            logger.warning(f"Thumbnail store unavailable for {fPath}: {ex}")
+            return None
+
+    def bucketOf(self, ms):
+        """
+        Returns the slot covering a time in milliseconds.
+        """
+        return min(max(int(ms // self.bucketMs), 0), self.bucketCount - 1)
+
+    def has(self, bucket):
+        """
+        Tells whether a slot holds a thumbnail.
+        """
+        with self.__lock:
+            return self.__valid is not None and bool(self.__valid[bucket])
+
+    def image(self, bucket):
+        """
+        Returns the thumbnail of a slot.
+
+        Args:
+            bucket (int): Slot number
+
+        Returns:
+            QImage: Copy of the slot's pixels, or None if empty or closed
+        """
+        with self.__lock:
+            if self.__valid is None or not self.__valid[bucket]:
+                return None
+            return QImage(self.__slots[bucket].data, self.width, self.height,
+                          self.stride, QImage.Format.Format_BGR888).copy()
+
+    def thumbnails(self):
+        """
+        Yields (start ms, QImage) of every slot holding a thumbnail, until
+        the store is closed.
+        """
+        with self.__lock:
+            if self.__valid is None:
+                return
+            buckets = np.flatnonzero(self.__valid)
+        for bucket in buckets:
+            qImg = self.image(int(bucket))
+            if qImg is None:
+                return
+            yield int(bucket) * self.bucketMs, qImg
+
+    def slot(self, bucket):
+        """
+        Returns a writable (height, width, 3) view of a slot's pixels.
+
+        Decoders can write a thumbnail straight into the mapping (e.g. as the
+        dst of cv2.resize) and then call commit().
+        """
+        return self.__slots[bucket][:, :self.width * 3].reshape(
+            self.height, self.width, 3)
+
+    def commit(self, bucket):
+        """
+        Marks a slot written through slot() as holding a thumbnail.
+        """
+        self.__valid[bucket] = 1
+
+    def put(self, bucket, qImg):
+        """
+        Stores a thumbnail in a slot.
+
+        Args:
+            bucket (int): Slot number
+            qImg (QImage): Thumbnail, scaled to the store size if needed
+        """
+        if (qImg.width(), qImg.height()) != (self.width, self.height):
+            qImg = qImg.scaled(self.width, self.height)
+        qImg = qImg.convertToFormat(QImage.Format.Format_BGR888)
+        bits = qImg.constBits()
+        bits.setsize(qImg.sizeInBytes())
+        rows = np.frombuffer(bits, np.uint8).reshape(
+            self.height, qImg.bytesPerLine())
+        # Pixels first, then the validity flag
+        self.__slots[bucket][:, :self.width * 3] = rows[:, :self.width * 3]
+        self.__valid[bucket] = 1